@@ -0,0 +1,65 @@
+"""
+Caché en proceso de PalabraClave, indexada por texto normalizado.
+
+`get_or_create_palabra_clave` la consulta antes de ir a la BD, así preparar las
+keywords de una búsqueda ya vista no cuesta queries. Es una LRU acotada
+(`MAX_PALABRAS`) y protegida por lock porque las plataformas corren en threads.
+
+Sólo se cachean filas confirmadas: `recordar` difiere la escritura con
+`transaction.on_commit`, de modo que un rollback nunca deja en la caché una
+palabra que no existe. `PalabraClave.save()`/`delete()` invalidan su entrada.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.db import transaction
+
+MAX_PALABRAS = 2048
+
+_palabras = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def obtener(texto_normalizado):
+    """PalabraClave cacheada para este texto, o None."""
+    with _lock:
+        palabra = _palabras.get(texto_normalizado)
+        if palabra is None:
+            _stats['misses'] += 1
+            return None
+        _palabras.move_to_end(texto_normalizado)
+        _stats['hits'] += 1
+        return palabra
+
+
+def recordar(palabra):
+    """Cachea la palabra cuando (y si) la transacción actual confirma."""
+    def _guardar():
+        with _lock:
+            _palabras[palabra.texto] = palabra
+            _palabras.move_to_end(palabra.texto)
+            while len(_palabras) > MAX_PALABRAS:
+                _palabras.popitem(last=False)
+    transaction.on_commit(_guardar)
+
+
+def invalidar(palabra):
+    """Quita la palabra de la caché, por texto y por id (el texto pudo haber cambiado)."""
+    with _lock:
+        _palabras.pop(palabra.texto, None)
+        if palabra.pk is not None:
+            for texto in [t for t, p in _palabras.items() if p.pk == palabra.pk]:
+                del _palabras[texto]
+
+
+def limpiar():
+    with _lock:
+        _palabras.clear()
+        _stats['hits'] = _stats['misses'] = 0
+
+
+def estadisticas():
+    with _lock:
+        return {'entradas': len(_palabras), 'max': MAX_PALABRAS, **_stats}
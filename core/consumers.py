@@ -242,7 +242,6 @@ class SearchProgressConsumer(WebsocketConsumer):
                             keywords=keywords,
                             max_paginas=1,
                             workers_fase1=1,
-                            workers_fase2=1,
                             busqueda=busqueda_instance,
                             plataforma=plataforma
                         )
@@ -0,0 +1,118 @@
+"""
+Evaluación en lote de grupos de keywords sobre muchas propiedades.
+
+La matriz propiedad x variante se arma con bitmaps (ver core/scraper/bitmaps.py).
+`reevaluar_palabras_clave` la aplica a la tabla Propiedad en lotes de tamaño
+fijo (memoria acotada) y escribe las relaciones PalabraClavePropiedad en bulk.
+`recalcular_desactualizadas` es la pasada de fondo que sólo recalcula los
+veredictos cuyo hash_texto ya no coincide con el de la propiedad.
+"""
+
+from typing import Dict
+
+from django.db import transaction
+
+from core.models import PalabraClave, PalabraClavePropiedad, Propiedad
+from core.scraper.bitmaps import bits, evaluar_en_lote
+
+LOTE_PROPIEDADES = 2000
+
+
+def reevaluar_palabras_clave(palabras_clave, queryset=None, lote: int = LOTE_PROPIEDADES,
+                             sobrescribir: bool = False, progress_callback=None) -> Dict[str, int]:
+    """
+    Evalúa palabras clave sobre muchas propiedades y guarda las relaciones en bulk.
+
+    Args:
+        palabras_clave: Lista de PalabraClave (cada una es un grupo: texto + sinónimos)
+        queryset: Propiedades a evaluar (por defecto todas)
+        lote: Propiedades por lote; acota la memoria y el tamaño de cada bulk
+        sobrescribir: Si True, actualiza también relaciones vigentes; si no, sólo las faltantes y
+            las desactualizadas (hash_texto distinto al de la propiedad)
+        progress_callback: Función opcional que recibe un mensaje por lote
+
+    Returns:
+        Dict con 'propiedades', 'creadas', 'actualizadas' y 'por_palabra' (texto -> cuántas la contienen)
+    """
+    palabras_clave = list(palabras_clave)
+    grupos = [[pc.texto] + pc.sinonimos_list for pc in palabras_clave]
+    queryset = Propiedad.objects.all() if queryset is None else queryset
+    queryset = queryset.only('id', 'titulo', 'descripcion', 'metadata', 'texto_busqueda', 'hash_texto').order_by('id')
+
+    stats = {'propiedades': 0, 'creadas': 0, 'actualizadas': 0, 'por_palabra': {pc.texto: 0 for pc in palabras_clave}}
+    ultimo_id = None
+    while True:
+        # Paginación por id: cada lote es una query acotada aunque la tabla cambie mientras tanto
+        lote_qs = queryset if ultimo_id is None else queryset.filter(id__gt=ultimo_id)
+        propiedades = list(lote_qs[:lote])
+        if not propiedades:
+            break
+        ultimo_id = propiedades[-1].id
+        ids = [p.id for p in propiedades]
+        matriz = evaluar_en_lote([p.texto_busqueda or p.calcular_texto_busqueda() for p in propiedades], grupos)
+
+        hashes = {p.id: p.hash_texto for p in propiedades}
+        existentes = {
+            (prop_id, pc_id): hash_texto
+            for prop_id, pc_id, hash_texto in PalabraClavePropiedad.objects.filter(
+                propiedad_id__in=ids, palabra_clave__in=palabras_clave
+            ).values_list('propiedad_id', 'palabra_clave_id', 'hash_texto')
+        }
+        relaciones = []
+        creadas = actualizadas = 0
+        for palabra_clave, bitmap in zip(palabras_clave, matriz['grupos']):
+            stats['por_palabra'][palabra_clave.texto] += bin(bitmap).count('1')
+            for prop_id, encontrada in zip(ids, bits(bitmap, len(ids))):
+                hash_existente = existentes.get((prop_id, palabra_clave.id))
+                if hash_existente is None:
+                    creadas += 1
+                elif sobrescribir or hash_existente != hashes[prop_id]:
+                    actualizadas += 1
+                else:
+                    continue
+                relaciones.append(PalabraClavePropiedad(
+                    palabra_clave=palabra_clave, propiedad_id=prop_id, encontrada=encontrada,
+                    hash_texto=hashes[prop_id]
+                ))
+
+        if relaciones:
+            with transaction.atomic():
+                PalabraClavePropiedad.objects.bulk_create(
+                    relaciones, batch_size=500, update_conflicts=True,
+                    unique_fields=['palabra_clave', 'propiedad'],
+                    update_fields=['encontrada', 'hash_texto', 'updated_at']
+                )
+
+        stats['propiedades'] += len(propiedades)
+        stats['creadas'] += creadas
+        stats['actualizadas'] += actualizadas
+        if progress_callback:
+            progress_callback(f"Reevaluadas {stats['propiedades']} propiedades")
+    return stats
+
+
+def recalcular_desactualizadas(lote: int = LOTE_PROPIEDADES, progress_callback=None) -> Dict[str, int]:
+    """
+    Recalcula sólo los veredictos desactualizados (la propiedad cambió de texto desde que se evaluaron).
+
+    Por cada palabra clave con relaciones desactualizadas reevalúa, en lotes, únicamente esas
+    propiedades; las relaciones vigentes no se tocan.
+
+    Returns:
+        Dict con 'palabras' (palabras clave afectadas) y 'actualizadas' (veredictos recalculados)
+    """
+    desactualizadas = PalabraClavePropiedad.desactualizadas()
+    palabras_clave = PalabraClave.objects.filter(
+        id__in=desactualizadas.values('palabra_clave_id').distinct()
+    ).order_by('id')
+    stats = {'palabras': 0, 'actualizadas': 0}
+    for palabra_clave in palabras_clave:
+        propiedades = Propiedad.objects.filter(
+            id__in=desactualizadas.filter(palabra_clave=palabra_clave).values('propiedad_id')
+        )
+        resultado = reevaluar_palabras_clave([palabra_clave], propiedades, lote=lote)
+        stats['palabras'] += 1
+        stats['actualizadas'] += resultado['actualizadas']
+        if progress_callback:
+            progress_callback(f"{palabra_clave.texto}: {resultado['actualizadas']} veredictos recalculados")
+    return stats
@@ -5,6 +5,8 @@ from datetime import datetime
 from django.db import connection
 from django.apps import apps
 
+from core.indice_texto import TABLA_FTS_SQLITE
+
 
 def _ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
@@ -68,6 +70,11 @@ def export_core_models(base_dir: str):
             _write_csv(os.path.join(out_dir, f'{name}.csv'), fields, serialize_rows())
 
 
+def _table_names():
+    """Tablas de la base sin el índice FTS5 ni sus tablas internas (propiedad_fts_data, _idx, ...): se reconstruyen desde `propiedad`."""
+    return [t for t in connection.introspection.table_names() if not t.startswith(TABLA_FTS_SQLITE)]
+
+
 def export_all_tables(base_dir: str):
     """Exportar todas las tablas visibles via introspección, incluyendo tablas de Django."""
     stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -77,7 +84,7 @@ def export_all_tables(base_dir: str):
         _ensure_dir(out_dir)
 
     with connection.cursor() as cur:
-        tables = connection.introspection.table_names()
+        tables = _table_names()
         for table in tables:
             # Get headers once
             cur.execute(f"SELECT * FROM {table} LIMIT 0")
@@ -235,7 +242,7 @@ def audit_exports(base_dir: str) -> dict:
     table_db_counts: dict[str, int] = {}
     try:
         with connection.cursor() as cur:
-            tables = connection.introspection.table_names()
+            tables = _table_names()
             for t in tables:
                 try:
                     pk_col = connection.introspection.get_primary_key_column(cur, t)
@@ -0,0 +1,188 @@
+"""
+Historial de precios por propiedad.
+
+Antes cada chequeo de precio pisaba `metadata['precio_valor']` con un
+`save()` completo y sólo quedaba el último valor. Ahora cada propiedad tiene
+una serie en `ObservacionPrecio` a la que sólo se agrega una fila cuando el
+precio (o la moneda) cambia:
+
+- `EscritorPrecios` junta los precios observados y los vuelca en lote: una
+  query para el último precio conocido de cada propiedad, un `bulk_create`
+  de las observaciones nuevas y un `bulk_update` de las propiedades cuyo
+  precio cambió. Si una propiedad todavía no tiene serie, su precio actual se
+  registra como primera observación (a su `created_at`).
+- `registrar_precio` hace lo mismo para una propiedad cuya metadata se va a
+  reemplazar entera (si no, el precio anterior se perdería sin quedar en la serie).
+- `bajas_de_precio` responde "qué bajó de precio en los últimos N días" para
+  las propiedades de una búsqueda con dos queries.
+"""
+
+from datetime import timedelta
+from typing import Dict, List
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from core.models import COLUMNAS_METADATA, ObservacionPrecio, Propiedad, ResultadoBusqueda
+
+MAX_PENDIENTES = 500
+
+_normalizar_moneda = COLUMNAS_METADATA['precio_moneda']
+
+
+def _ultima_observacion(**filtros):
+    return ObservacionPrecio.objects.filter(propiedad=OuterRef('pk'), **filtros).order_by('-observado_at', '-id')
+
+
+class EscritorPrecios:
+    """Buffer de precios observados; sólo escribe los que cambiaron."""
+
+    def __init__(self, max_pendientes: int = MAX_PENDIENTES):
+        self.max_pendientes = max_pendientes
+        # propiedad_id -> (valor, moneda, observado_at); la última observación del lote manda
+        self._pendientes = {}
+        self.cambios = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.volcar()
+
+    def __len__(self):
+        return len(self._pendientes)
+
+    def agregar(self, propiedad, valor, moneda: str = '', observado_at=None):
+        """Registra un precio observado. Valores vacíos o no positivos se ignoran."""
+        valor = COLUMNAS_METADATA['precio_valor'](valor)
+        if not valor or valor <= 0:
+            return
+        propiedad_id = getattr(propiedad, 'pk', propiedad)
+        self._pendientes[propiedad_id] = (valor, _normalizar_moneda(moneda), observado_at or timezone.now())
+        if len(self._pendientes) >= self.max_pendientes:
+            self.volcar()
+
+    def volcar(self) -> List[Dict]:
+        """
+        Escribe las observaciones que cambian la serie.
+
+        Returns:
+            Lista de cambios del volcado: {'propiedad_id', 'precio_anterior', 'precio_nuevo', 'moneda'}
+        """
+        pendientes, self._pendientes = self._pendientes, {}
+        if not pendientes:
+            return []
+
+        propiedades = Propiedad.objects.filter(id__in=list(pendientes)).only(
+            'id', 'metadata', 'precio_valor', 'precio_moneda', 'created_at'
+        ).annotate(
+            ultimo_valor=Subquery(_ultima_observacion().values('valor')[:1]),
+            ultima_moneda=Subquery(_ultima_observacion().values('moneda')[:1]),
+        )
+        observaciones, cambiadas, cambios = [], [], []
+        for propiedad in propiedades:
+            valor, moneda, observado_at = pendientes[propiedad.id]
+            if propiedad.ultimo_valor is not None:
+                anterior = (propiedad.ultimo_valor, propiedad.ultima_moneda)
+            elif propiedad.precio_valor:
+                # Sin serie todavía: el precio guardado es la primera observación
+                anterior = (propiedad.precio_valor, propiedad.precio_moneda)
+                observaciones.append(ObservacionPrecio(
+                    propiedad_id=propiedad.id, observado_at=propiedad.created_at,
+                    valor=propiedad.precio_valor, moneda=propiedad.precio_moneda
+                ))
+            else:
+                anterior = None
+            if anterior == (valor, moneda):
+                continue
+            observaciones.append(ObservacionPrecio(
+                propiedad_id=propiedad.id, observado_at=observado_at, valor=valor, moneda=moneda
+            ))
+            # El precio vigente queda en las columnas y en la metadata (de donde las recalcula save())
+            propiedad.metadata = {
+                **(propiedad.metadata or {}), 'precio_valor': valor, 'precio_moneda': moneda,
+                'ultima_actualizacion_precio': observado_at.isoformat()
+            }
+            propiedad.precio_valor, propiedad.precio_moneda = valor, moneda
+            # bulk_update no aplica auto_now
+            propiedad.updated_at = timezone.now()
+            cambiadas.append(propiedad)
+            if anterior is not None:
+                cambios.append({
+                    'propiedad_id': propiedad.id, 'precio_anterior': anterior[0], 'precio_nuevo': valor,
+                    'moneda': moneda
+                })
+
+        if observaciones:
+            with transaction.atomic():
+                ObservacionPrecio.objects.bulk_create(observaciones, batch_size=500)
+                if cambiadas:
+                    Propiedad.objects.bulk_update(
+                        cambiadas, ['metadata', 'precio_valor', 'precio_moneda', 'updated_at'], batch_size=500
+                    )
+        self.cambios.extend(cambios)
+        return cambios
+
+
+def registrar_precio(propiedad, metadata) -> List[Dict]:
+    """
+    Para los caminos que reemplazan la metadata completa de una propiedad existente: agrega a la
+    serie el precio de `metadata` (si cambió) antes de que `save()` pise el anterior.
+    """
+    if not propiedad.pk or not isinstance(metadata, dict):
+        return []
+    precios = EscritorPrecios()
+    precios.agregar(propiedad, metadata.get('precio_valor'), metadata.get('precio_moneda', ''))
+    return precios.volcar()
+
+
+def bajas_de_precio(busqueda, dias: int = 7) -> List[Dict]:
+    """
+    Propiedades de una búsqueda cuyo precio bajó en los últimos `dias` días.
+
+    Compara la última observación contra el precio vigente al inicio de la ventana
+    (o la primera observación dentro de ella), en la misma moneda.
+
+    Returns:
+        Lista de dicts (propiedad_id, url, titulo, moneda, precio_anterior, precio_actual,
+        variacion_pct, observado_at), de la baja más grande a la más chica
+    """
+    busqueda_id = getattr(busqueda, 'pk', busqueda)
+    desde = timezone.now() - timedelta(days=dias)
+    en_busqueda = ResultadoBusqueda.objects.filter(busqueda_id=busqueda_id).values('propiedad_id')
+
+    series = {}
+    for propiedad_id, observado_at, moneda, valor in ObservacionPrecio.objects.filter(
+        propiedad_id__in=en_busqueda, observado_at__gte=desde
+    ).order_by('propiedad_id', 'observado_at', 'id').values_list('propiedad_id', 'observado_at', 'moneda', 'valor'):
+        series.setdefault(propiedad_id, []).append((observado_at, moneda, valor))
+    if not series:
+        return []
+
+    propiedades = Propiedad.objects.filter(id__in=list(series)).annotate(
+        valor_previo=Subquery(_ultima_observacion(observado_at__lt=desde).values('valor')[:1]),
+        moneda_previa=Subquery(_ultima_observacion(observado_at__lt=desde).values('moneda')[:1]),
+    ).values('id', 'url', 'titulo', 'valor_previo', 'moneda_previa')
+
+    bajas = []
+    for propiedad in propiedades:
+        serie = series[propiedad['id']]
+        if propiedad['valor_previo'] is not None:
+            inicial = (propiedad['moneda_previa'], propiedad['valor_previo'])
+        else:
+            inicial = serie[0][1:]
+        observado_at, moneda, actual = serie[-1]
+        if moneda != inicial[0] or actual >= inicial[1]:
+            continue
+        bajas.append({
+            'propiedad_id': propiedad['id'],
+            'url': propiedad['url'],
+            'titulo': propiedad['titulo'],
+            'moneda': moneda,
+            'precio_anterior': inicial[1],
+            'precio_actual': actual,
+            'variacion_pct': round((actual - inicial[1]) / inicial[1] * 100, 2),
+            'observado_at': observado_at,
+        })
+    return sorted(bajas, key=lambda b: b['variacion_pct'])
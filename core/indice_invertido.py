@@ -0,0 +1,365 @@
+"""
+Índice invertido en memoria del inventario de propiedades.
+
+Mapea cada token de `Propiedad.texto_busqueda` (ya normalizado) a la lista
+ordenada de ids de propiedades que lo contienen (`array('I')`, 4 bytes por id).
+Responde la semántica de `build_keyword_groups` sin recorrer textos:
+
+- cada variante se reduce a su raíz más corta (`raiz_keyword`: variante, stem o
+  `v[:-2]`), que es lo que el matcher busca como substring;
+- una raíz de una palabra aparece en el texto sii algún token la contiene, así
+  que se resuelve escaneando el vocabulario (mucho más chico que el corpus) y
+  uniendo los postings de esos tokens: resultado exacto;
+- una raíz de varias palabras se resuelve intersectando (fin del primer token,
+  tokens intermedios, inicio del último) y da candidatos; si se pasan los
+  textos, se confirman con un `in`.
+
+Persistencia: `guardar`/`cargar` usan un archivo compacto (cabecera JSON con el
+vocabulario + postings uint32 contiguos). Al cargar se reconcilia con la BD:
+se reindexan las propiedades con `updated_at` posterior a la marca del archivo
+y se quitan las que ya no existen.
+
+Actualización incremental: `Propiedad.save()`/`delete()` llaman a
+`registrar_cambio` con el texto anterior y el nuevo; el cambio se aplica al
+confirmar la transacción y sólo si el índice ya está cargado en el proceso.
+
+Matching difuso (MATCH_DIFUSO == 'trigramas'): en vez de la raíz `v[:-2]`, cada
+palabra de la variante se busca entre los tokens del vocabulario con similitud
+de trigramas >= umbral (`IndiceTrigramas`, construido la primera vez que se
+necesita y mantenido junto con el vocabulario). Misma semántica que el matcher.
+
+Se activa con INDICE_INVERTIDO=true (por defecto apagado: ocupa memoria y el
+primer uso construye el índice recorriendo toda la tabla).
+"""
+
+import json
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+from django.db import transaction
+
+from core.scraper.constants import MATCH_DIFUSO, UMBRAL_TRIGRAMAS
+from core.scraper.trigramas import IndiceTrigramas
+from core.scraper.utils import normalizar_texto, raiz_keyword
+
+INDICE_INVERTIDO_ACTIVO = os.getenv('INDICE_INVERTIDO', 'false').lower() in ('1', 'true', 'yes')
+INDICE_INVERTIDO_RUTA = os.getenv(
+    'INDICE_INVERTIDO_RUTA',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'user_data', 'indice_invertido.bin')
+)
+
+_MAGIA = b'IINV1\n'
+
+
+def tokens_de(texto_normalizado) -> set:
+    return set((texto_normalizado or '').split())
+
+
+class IndiceInvertido:
+    """Token -> ids de propiedades (array ordenado). No es thread-safe: usar con `_lock`."""
+
+    def __init__(self):
+        self._postings = {}
+        self.ids = set()
+        self.marca = None  # updated_at ISO de la última propiedad reflejada
+        self._tokens_por_raiz = {}
+        self._trigramas = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    # --- escritura ---
+
+    def _agregar_token(self, token, prop_id):
+        posting = self._postings.get(token)
+        if posting is None:
+            self._postings[token] = array('I', [prop_id])
+            self._tokens_por_raiz.clear()  # vocabulario nuevo
+            if self._trigramas is not None:
+                self._trigramas.agregar(token)
+            return
+        i = bisect_left(posting, prop_id)
+        if i == len(posting) or posting[i] != prop_id:
+            posting.insert(i, prop_id)
+
+    def _quitar_token(self, token, prop_id):
+        posting = self._postings.get(token)
+        if posting is None:
+            return
+        i = bisect_left(posting, prop_id)
+        if i < len(posting) and posting[i] == prop_id:
+            del posting[i]
+            if not posting:
+                self._olvidar_token(token)
+
+    def actualizar(self, prop_id, texto_anterior, texto_nuevo):
+        """Aplica el cambio de texto de una propiedad tocando sólo los tokens que difieren."""
+        anteriores = tokens_de(texto_anterior) if prop_id in self.ids else set()
+        nuevos = tokens_de(texto_nuevo)
+        for token in anteriores - nuevos:
+            self._quitar_token(token, prop_id)
+        for token in nuevos - anteriores:
+            self._agregar_token(token, prop_id)
+        self.ids.add(prop_id)
+
+    def quitar(self, prop_id, texto):
+        for token in tokens_de(texto):
+            self._quitar_token(token, prop_id)
+        self.ids.discard(prop_id)
+
+    def quitar_ids(self, ids):
+        """Quita varias propiedades sin conocer su texto: una pasada por los postings."""
+        ids = set(ids)
+        if not ids:
+            return
+        for token, posting in list(self._postings.items()):
+            if ids.isdisjoint(posting):
+                continue
+            filtrado = array('I', (i for i in posting if i not in ids))
+            if filtrado:
+                self._postings[token] = filtrado
+            else:
+                self._olvidar_token(token)
+        self.ids -= ids
+
+    def _olvidar_token(self, token):
+        del self._postings[token]
+        self._tokens_por_raiz.clear()
+        if self._trigramas is not None:
+            self._trigramas.quitar(token)
+
+    # --- consulta ---
+
+    def _tokens_con(self, fragmento, modo):
+        clave = (fragmento, modo)
+        tokens = self._tokens_por_raiz.get(clave)
+        if tokens is None:
+            if modo == 'contiene':
+                tokens = [t for t in self._postings if fragmento in t]
+            elif modo == 'empieza':
+                tokens = [t for t in self._postings if t.startswith(fragmento)]
+            elif modo == 'termina':
+                tokens = [t for t in self._postings if t.endswith(fragmento)]
+            else:
+                tokens = [fragmento] if fragmento in self._postings else []
+            self._tokens_por_raiz[clave] = tokens
+        return tokens
+
+    def _ids_de_tokens(self, tokens) -> set:
+        ids = set()
+        for token in tokens:
+            ids.update(self._postings[token])
+        return ids
+
+    def ids_con_raiz(self, raiz, textos=None) -> set:
+        """Ids cuyo texto contiene `raiz` como substring (multi-palabra: confirmado con `textos` si se pasan)."""
+        palabras = raiz.split()
+        if not palabras:
+            return set()
+        if len(palabras) == 1:
+            return self._ids_de_tokens(self._tokens_con(palabras[0], 'contiene'))
+
+        ids = self._ids_de_tokens(self._tokens_con(palabras[0], 'termina'))
+        for palabra in palabras[1:-1]:
+            ids &= self._ids_de_tokens(self._tokens_con(palabra, 'exacto'))
+        ids &= self._ids_de_tokens(self._tokens_con(palabras[-1], 'empieza'))
+        if textos is not None:
+            ids = {i for i in ids if i in textos and raiz in textos[i]}
+        return ids
+
+    def ids_similares(self, variante_normalizada, umbral) -> set:
+        """Ids donde cada palabra de la variante tiene un token con similitud de trigramas >= umbral."""
+        if self._trigramas is None:
+            self._trigramas = IndiceTrigramas(self._postings)
+        ids = None
+        for palabra in variante_normalizada.split():
+            ids_palabra = self._ids_de_tokens(self._trigramas.similares(palabra, umbral))
+            ids = ids_palabra if ids is None else ids & ids_palabra
+            if not ids:
+                break
+        return ids or set()
+
+    def ids_por_grupo(self, keyword_groups, textos=None, stemming=True, truncar=True, umbrales=None) -> list:
+        """Por grupo, el conjunto de ids donde aparece alguna de sus variantes (misma semántica que el matcher)."""
+        difuso = truncar and MATCH_DIFUSO == 'trigramas'
+        resultado = []
+        for i, grupo in enumerate(keyword_groups or []):
+            ids = set()
+            for raiz in dict.fromkeys(raiz_keyword(v, stemming, truncar and not difuso) for v in grupo):
+                if raiz:
+                    ids |= self.ids_con_raiz(raiz, textos)
+            if difuso:
+                umbral = umbrales[i] if umbrales is not None else UMBRAL_TRIGRAMAS
+                for variante in dict.fromkeys(normalizar_texto(str(v)) for v in grupo):
+                    if variante:
+                        ids |= self.ids_similares(variante, umbral)
+            resultado.append(ids)
+        return resultado
+
+    def ids_que_coinciden(self, keyword_groups, textos=None) -> set:
+        """AND entre grupos, OR dentro de cada grupo. Sin grupos: todas las propiedades indexadas."""
+        ids = set(self.ids)
+        for ids_grupo in self.ids_por_grupo(keyword_groups, textos):
+            ids &= ids_grupo
+            if not ids:
+                break
+        return ids
+
+    # --- persistencia ---
+
+    def guardar(self, ruta):
+        tokens = list(self._postings)
+        cabecera = json.dumps({
+            'marca': self.marca,
+            'tokens': tokens,
+            'largos': [len(self._postings[t]) for t in tokens],
+            'ids': len(self.ids),
+        }).encode('utf-8')
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f'{ruta}.tmp'
+        with open(temporal, 'wb') as f:
+            f.write(_MAGIA)
+            f.write(struct.pack('<I', len(cabecera)))
+            f.write(cabecera)
+            array('I', sorted(self.ids)).tofile(f)
+            for token in tokens:
+                self._postings[token].tofile(f)
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        indice = cls()
+        with open(ruta, 'rb') as f:
+            if f.read(len(_MAGIA)) != _MAGIA:
+                raise ValueError(f'Formato de índice desconocido: {ruta}')
+            (largo,) = struct.unpack('<I', f.read(4))
+            cabecera = json.loads(f.read(largo).decode('utf-8'))
+            ids = array('I')
+            ids.fromfile(f, cabecera['ids'])
+            indice.ids = set(ids)
+            for token, n in zip(cabecera['tokens'], cabecera['largos']):
+                posting = array('I')
+                posting.fromfile(f, n)
+                indice._postings[token] = posting
+        indice.marca = cabecera.get('marca')
+        return indice
+
+    @classmethod
+    def construir(cls, lote=2000):
+        """Índice completo desde la tabla Propiedad."""
+        from core.models import Propiedad
+        indice = cls()
+        indice._indexar(Propiedad.objects.order_by('id'), lote)
+        return indice
+
+    def _indexar(self, queryset, lote=2000):
+        campos = ('id', 'titulo', 'descripcion', 'metadata', 'texto_busqueda', 'updated_at')
+        for prop in queryset.only(*campos).iterator(chunk_size=lote):
+            for token in tokens_de(prop.texto_busqueda or prop.calcular_texto_busqueda()):
+                self._agregar_token(token, prop.id)
+            self.ids.add(prop.id)
+            marca = prop.updated_at.isoformat() if prop.updated_at else None
+            if marca and (self.marca is None or marca > self.marca):
+                self.marca = marca
+
+    def reconciliar(self, lote=2000):
+        """Pone al día un índice cargado de disco con los cambios hechos mientras no estaba en memoria."""
+        from core.models import Propiedad
+        marca = datetime.fromisoformat(self.marca) if self.marca else None
+        existentes = set()
+        pendientes = []
+        for prop_id, updated_at in Propiedad.objects.values_list('id', 'updated_at').iterator(chunk_size=lote):
+            existentes.add(prop_id)
+            if prop_id not in self.ids or (marca and updated_at and updated_at > marca):
+                pendientes.append(prop_id)
+        self.quitar_ids((self.ids - existentes) | (set(pendientes) & self.ids))
+        for i in range(0, len(pendientes), lote):
+            self._indexar(Propiedad.objects.filter(id__in=pendientes[i:i + lote]), lote)
+        return len(pendientes)
+
+
+_indice = None
+_lock = threading.RLock()
+
+
+def obtener_indice():
+    """Índice del proceso: cargado de disco y reconciliado, o construido desde la BD. None si está apagado."""
+    global _indice
+    if not INDICE_INVERTIDO_ACTIVO:
+        return None
+    with _lock:
+        if _indice is None:
+            try:
+                _indice = IndiceInvertido.cargar(INDICE_INVERTIDO_RUTA)
+                _indice.reconciliar()
+            except (OSError, ValueError, KeyError):
+                _indice = IndiceInvertido.construir()
+            _indice.guardar(INDICE_INVERTIDO_RUTA)
+            print(f"📇 [ÍNDICE] Índice invertido listo: {len(_indice)} propiedades, {len(_indice._postings)} tokens")
+        return _indice
+
+
+def consultar(keyword_groups, ids, textos):
+    """
+    Evalúa los grupos sobre un subconjunto de propiedades usando el índice.
+
+    Args:
+        keyword_groups: Grupos de variantes (OR dentro, AND entre grupos)
+        ids: Ids de las propiedades a evaluar
+        textos: Dict id -> texto_busqueda, para confirmar raíces de varias palabras
+
+    Returns:
+        (cubiertos, por_grupo): ids que el índice puede responder (indexados y con texto) y,
+        por grupo, cuáles de ellos lo cumplen. None si el índice está apagado.
+    """
+    indice = obtener_indice()
+    if indice is None:
+        return None
+    with _lock:
+        cubiertos = {i for i in ids if i in indice.ids and i in textos}
+        por_grupo = [ids_grupo & cubiertos for ids_grupo in indice.ids_por_grupo(keyword_groups, textos)]
+    return cubiertos, por_grupo
+
+
+def registrar_cambio(prop_id, texto_anterior, texto_nuevo):
+    """Refleja en el índice (si está cargado) el alta/modificación de una propiedad al confirmar.
+
+    No mueve la marca de reconciliación: lo que otros procesos escriban mientras tanto
+    se recoge en la próxima carga.
+    """
+    if _indice is None:
+        return
+
+    def _aplicar():
+        with _lock:
+            if _indice is not None:
+                _indice.actualizar(prop_id, texto_anterior, texto_nuevo)
+    transaction.on_commit(_aplicar)
+
+
+def registrar_borrado(prop_id, texto):
+    if _indice is None:
+        return
+
+    def _aplicar():
+        with _lock:
+            if _indice is not None:
+                _indice.quitar(prop_id, texto)
+    transaction.on_commit(_aplicar)
+
+
+def guardar():
+    """Persiste el índice del proceso (si está cargado)."""
+    with _lock:
+        if _indice is not None:
+            _indice.guardar(INDICE_INVERTIDO_RUTA)
+
+
+def descartar():
+    global _indice
+    with _lock:
+        _indice = None
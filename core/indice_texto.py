@@ -0,0 +1,183 @@
+"""
+Índice full-text opcional sobre `Propiedad.texto_busqueda`.
+
+La migración 0007 lo crea según el motor:
+- PostgreSQL: columna generada `texto_busqueda_tsv` (tsvector, config 'simple'
+  porque el texto ya está normalizado) con índice GIN.
+- SQLite: tabla virtual FTS5 `propiedad_fts` (external content sobre `propiedad`)
+  mantenida por triggers de insert/update/delete.
+
+`propiedades_que_coinciden` traduce grupos de keywords (OR dentro del grupo, AND
+entre grupos) a UNA consulta contra el índice. Cada variante se busca como
+prefijo de palabra usando su raíz más corta (la misma que usa el matcher:
+stemming básico o `v[:-2]`), así "garaje" encuentra "garajes" y "cochera",
+"cocheras". A diferencia del matcher no encuentra la raíz en mitad de una
+palabra; para ese caso (o si el motor no tiene índice) se usa `LIKE` sobre
+`texto_busqueda`, que es la semántica exacta pero recorre la tabla.
+
+`propiedades_similares` es la versión difusa (trigramas, como el matcher con
+MATCH_DIFUSO == 'trigramas'): en PostgreSQL usa `pg_trgm` con el índice GIN de
+la migración 0008 (`strict_word_similarity` por palabra de la variante, umbral
+por grupo); en otros motores cae en `propiedades_que_coinciden`.
+"""
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from core.models import Propiedad
+from core.scraper.constants import UMBRAL_TRIGRAMAS
+from core.scraper.utils import normalizar_texto, raiz_keyword
+
+TABLA_FTS_SQLITE = 'propiedad_fts'
+COLUMNA_TSV_POSTGRES = 'texto_busqueda_tsv'
+INDICE_TRGM_POSTGRES = 'propiedad_texto_busqueda_trgm'
+
+_disponible = {}
+_trgm_disponible = {}
+
+
+def raiz_variante(variante) -> str:
+    """Prefijo más corto con el que el matcher considera presente a la variante."""
+    return raiz_keyword(variante)
+
+
+def grupos_a_raices(keyword_groups) -> list:
+    """Grupos de keywords -> grupos de raíces normalizadas, sin vacías ni repetidas."""
+    grupos = []
+    for grupo in keyword_groups or []:
+        raices = list(dict.fromkeys(r for r in (raiz_variante(v) for v in grupo) if r))
+        if raices:
+            grupos.append(raices)
+    return grupos
+
+
+def indice_disponible(using='default') -> bool:
+    """True si la BD tiene el índice full-text (se consulta una vez por alias)."""
+    if using not in _disponible:
+        connection = connections[using]
+        if connection.vendor == 'sqlite':
+            _disponible[using] = TABLA_FTS_SQLITE in connection.introspection.table_names()
+        elif connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                columnas = connection.introspection.get_table_description(cursor, Propiedad._meta.db_table)
+            _disponible[using] = any(c.name == COLUMNA_TSV_POSTGRES for c in columnas)
+        else:
+            _disponible[using] = False
+    return _disponible[using]
+
+
+def _consulta_fts5(grupos) -> str:
+    # "aire acondicion" * -> frase cuyo último token es prefijo
+    return ' AND '.join(
+        '(' + ' OR '.join(f'"{raiz}" *' for raiz in raices) + ')'
+        for raices in grupos
+    )
+
+
+def _consulta_tsquery(grupos) -> str:
+    # aire <-> acondicion:* -> tokens consecutivos, el último como prefijo
+    return ' & '.join(
+        '(' + ' | '.join(' <-> '.join(raiz.split()) + ':*' for raiz in raices) + ')'
+        for raices in grupos
+    )
+
+
+def propiedades_que_coinciden(keyword_groups, queryset=None):
+    """
+    Queryset de propiedades cuyo texto contiene todas las keywords (alguna variante por grupo).
+
+    Args:
+        keyword_groups: Lista de grupos de variantes (como `build_keyword_groups`)
+        queryset: Queryset base de Propiedad (por defecto todas)
+
+    Returns:
+        Queryset filtrado, sin evaluar: se puede seguir filtrando/ordenando/paginando
+    """
+    queryset = Propiedad.objects.all() if queryset is None else queryset
+    grupos = grupos_a_raices(keyword_groups)
+    if not grupos:
+        return queryset
+
+    using = queryset.db
+    if indice_disponible(using):
+        vendor = connections[using].vendor
+        if vendor == 'sqlite':
+            ids = RawSQL(f'SELECT rowid FROM {TABLA_FTS_SQLITE} WHERE {TABLA_FTS_SQLITE} MATCH %s',
+                         [_consulta_fts5(grupos)])
+        else:
+            ids = RawSQL(f'SELECT id FROM {Propiedad._meta.db_table} '
+                         f"WHERE {COLUMNA_TSV_POSTGRES} @@ to_tsquery('simple', %s)",
+                         [_consulta_tsquery(grupos)])
+        return queryset.filter(id__in=ids)
+
+    filtro = Q()
+    for raices in grupos:
+        grupo_q = Q()
+        for raiz in raices:
+            grupo_q |= Q(texto_busqueda__contains=raiz)
+        filtro &= grupo_q
+    return queryset.filter(filtro)
+
+
+def trigramas_disponibles(using='default') -> bool:
+    """True si la BD es PostgreSQL con el índice pg_trgm de la migración 0008."""
+    if using not in _trgm_disponible:
+        connection = connections[using]
+        disponible = False
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                restricciones = connection.introspection.get_constraints(cursor, Propiedad._meta.db_table)
+            disponible = INDICE_TRGM_POSTGRES in restricciones
+        _trgm_disponible[using] = disponible
+    return _trgm_disponible[using]
+
+
+def propiedades_similares(keyword_groups, umbrales=None, queryset=None):
+    """
+    Como `propiedades_que_coinciden` pero con matching difuso por trigramas.
+
+    Una variante coincide si su raíz (sin truncar) aparece en el texto o si cada una de
+    sus palabras tiene una palabra del texto con similitud >= umbral del grupo.
+
+    Args:
+        keyword_groups: Lista de grupos de variantes (como `build_keyword_groups`)
+        umbrales: Umbral de similitud por grupo (por defecto UMBRAL_TRIGRAMAS para todos)
+        queryset: Queryset base de Propiedad (por defecto todas)
+
+    Returns:
+        Queryset filtrado, sin evaluar
+    """
+    queryset = Propiedad.objects.all() if queryset is None else queryset
+    using = queryset.db
+    if not keyword_groups or not trigramas_disponibles(using):
+        return propiedades_que_coinciden(keyword_groups, queryset)
+
+    umbrales = list(umbrales) if umbrales is not None else [UMBRAL_TRIGRAMAS] * len(keyword_groups)
+    condiciones, params = [], []
+    for grupo, umbral in zip(keyword_groups, umbrales):
+        alternativas = []
+        for variante in dict.fromkeys(normalizar_texto(str(v)) for v in grupo):
+            if not variante:
+                continue
+            alternativas.append("texto_busqueda LIKE %s")
+            params.append(f"%{raiz_keyword(variante, truncar=False)}%")
+            palabras = variante.split()
+            # <<% usa el índice GIN (umbral de la sesión); la función aplica el umbral del grupo
+            alternativas.append('(' + ' AND '.join(
+                "(%s <<%% texto_busqueda AND strict_word_similarity(%s, texto_busqueda) >= %s)"
+                for _ in palabras
+            ) + ')')
+            for palabra in palabras:
+                params.extend([palabra, palabra, umbral])
+        if alternativas:
+            condiciones.append('(' + ' OR '.join(alternativas) + ')')
+    if not condiciones:
+        return queryset
+
+    with connections[using].cursor() as cursor:
+        # El operador filtra con el umbral de la sesión: el menor de los grupos para no perder candidatos
+        cursor.execute("SELECT set_config('pg_trgm.strict_word_similarity_threshold', %s, false)",
+                       [str(min(umbrales))])
+    ids = RawSQL(f"SELECT id FROM {Propiedad._meta.db_table} WHERE " + ' AND '.join(condiciones), params)
+    return queryset.filter(id__in=ids)
@@ -0,0 +1,73 @@
+"""
+Ingesta en lote de propiedades nuevas (FASE 2).
+
+El motor de FASE 2 descarga y parsea en paralelo, pero antes cada detalle se
+persistía con `guardar_propiedad_nueva`: una transacción por URL, un INSERT
+de la propiedad y un upsert por keyword. `IngestaPropiedades` junta los
+detalles que entrega el motor y los escribe con `guardar_propiedades_nuevas`:
+una transacción por lote, un bulk upsert de propiedades (conflicto por URL)
+y otro de relaciones keywords.
+
+Sólo el hilo que consume el motor usa la ingesta; los workers de descarga y
+parseo nunca tocan la BD. El volcado ocurre al juntar `max_pendientes`
+detalles, al pasar `max_segundos` desde el último, o con `volcar()` al final.
+"""
+
+import time
+
+from core.search_manager import guardar_propiedad_nueva, guardar_propiedades_nuevas
+
+MAX_PENDIENTES = 50
+MAX_SEGUNDOS = 2.0
+FILTROS_COMUNES = ('operacion', 'departamento')
+
+
+class IngestaPropiedades:
+    """Buffer de detalles scrapeados que se guardan como propiedades en lote."""
+
+    def __init__(self, plataforma, palabras_clave, max_pendientes: int = MAX_PENDIENTES,
+                 max_segundos: float = MAX_SEGUNDOS, filtros=None):
+        self.plataforma = plataforma
+        self.palabras_clave = palabras_clave
+        # Filtros de la búsqueda que valen para todas sus publicaciones (la plataforma ya los aplicó)
+        self.comunes = {clave: (filtros or {}).get(clave) for clave in FILTROS_COMUNES if (filtros or {}).get(clave)}
+        self.max_pendientes = max_pendientes
+        self.max_segundos = max_segundos
+        self._pendientes = []
+        self._ultimo_volcado = time.monotonic()
+        self.guardadas = 0
+
+    def __len__(self):
+        return len(self._pendientes)
+
+    def agregar(self, url: str, detalles):
+        """
+        Encola un detalle. Si se alcanzó algún umbral vuelca y devuelve las
+        (propiedad, resultados_keywords) guardadas; si no, lista vacía.
+        """
+        if detalles and self.comunes:
+            detalles = {**self.comunes, **detalles}
+        self._pendientes.append((url, detalles))
+        lleno = len(self._pendientes) >= self.max_pendientes
+        vencido = time.monotonic() - self._ultimo_volcado >= self.max_segundos
+        return self.volcar() if lleno or vencido else []
+
+    def volcar(self):
+        """Guarda los pendientes. Devuelve la lista de (propiedad, resultados_keywords)."""
+        pendientes, self._pendientes = self._pendientes, []
+        self._ultimo_volcado = time.monotonic()
+        if not pendientes:
+            return []
+        try:
+            guardadas = guardar_propiedades_nuevas(pendientes, self.plataforma, self.palabras_clave)
+        except Exception as e:
+            # El lote se revirtió entero: se reintenta de a una para no perder las válidas
+            print(f"⚠️ [INGESTA] Falló el lote de {len(pendientes)} propiedades ({e}), guardando de a una")
+            guardadas = []
+            for url, detalles in pendientes:
+                try:
+                    guardadas.append(guardar_propiedad_nueva(url, self.plataforma, self.palabras_clave, detalles))
+                except Exception as exc:
+                    print(f'❌ [EXCEPCIÓN] URL {url[:100]}... generó excepción: {exc}')
+        self.guardadas += len(guardadas)
+        return guardadas
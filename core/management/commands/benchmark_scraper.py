@@ -0,0 +1,140 @@
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from core.scraper import fetcher, metricas, transporte
+from core.scraper.constants import CORPUS_DIR
+
+
+FASES = ('url_build', 'total', 'fase1', 'dedup', 'fase2', 'db')
+
+FILTROS_POR_DEFECTO = {
+    'tipo': 'apartamento',
+    'operacion': 'venta',
+    'departamento': 'Montevideo',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el pipeline de scraping por fase (url_build, total, fase1, dedup, fase2, db) contra un '
+        'corpus grabado, sin red. Con --record graba el corpus desde los sitios reales. '
+        'Las escrituras en BD de cada corrida se revierten.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', type=str, default=CORPUS_DIR,
+                            help='Directorio del corpus (o nombre dentro de user_data/corpus/).')
+        parser.add_argument('--record', action='store_true', help='Grabar el corpus con la red real (1 corrida).')
+        parser.add_argument('--corpus-version', type=str, help='Etiqueta de versión al crear el corpus con --record.')
+        parser.add_argument('--latencia-ms', type=str, default='0',
+                            help="Latencia simulada por request en replay: milisegundos o 'grabada'.")
+        parser.add_argument('--repeticiones', type=int, default=3, help='Corridas a promediar en replay.')
+        parser.add_argument('--plataforma', type=str, default='todas',
+                            choices=['mercadolibre', 'infocasas', 'todas'])
+        parser.add_argument('--filtros', type=str, help='Filtros en JSON (por defecto apartamentos en venta en Montevideo).')
+        parser.add_argument('--keywords', type=str, default='', help='Keywords separadas por coma.')
+        parser.add_argument('--max-paginas', type=int, default=1)
+        parser.add_argument('--salida', type=str, help='Guardar el resultado en este archivo JSON.')
+
+    def _resolver_corpus(self, corpus):
+        if os.path.sep in corpus or os.path.isabs(corpus):
+            return corpus
+        return os.path.join(os.path.dirname(CORPUS_DIR), corpus)
+
+    def handle(self, *args, **options):
+        corpus = self._resolver_corpus(options['corpus'])
+        try:
+            filtros = json.loads(options['filtros']) if options.get('filtros') else dict(FILTROS_POR_DEFECTO)
+        except json.JSONDecodeError as e:
+            raise CommandError(f'--filtros no es JSON válido: {e}')
+        keywords = [k.strip() for k in options['keywords'].split(',') if k.strip()]
+
+        modo = 'record' if options['record'] else 'replay'
+        repeticiones = 1 if options['record'] else max(1, options['repeticiones'])
+        try:
+            transporte.configurar(modo=modo, corpus=corpus, latencia_ms=options['latencia_ms'],
+                                  version=options.get('corpus_version'))
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+
+        corridas = []
+        try:
+            for n in range(repeticiones):
+                self.stdout.write(f'▶️  Corrida {n + 1}/{repeticiones} ({modo})...')
+                corridas.append(self._corrida(filtros, keywords, options))
+        finally:
+            transporte.reiniciar()
+
+        resultado = {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'modo': modo,
+            'corpus': transporte.info_corpus(corpus),
+            'latencia_ms': options['latencia_ms'],
+            'plataforma': options['plataforma'],
+            'filtros': filtros,
+            'keywords': keywords,
+            'corridas': corridas,
+            'mediana': self._medianas(corridas),
+        }
+        self._imprimir(resultado)
+        if options.get('salida'):
+            with open(options['salida'], 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Resultado guardado en {options['salida']}"))
+
+    def _corrida(self, filtros, keywords, options):
+        from core.scraper import run_scraper
+
+        metricas.reiniciar()
+        fetcher.reset_stats()
+        inicio = time.perf_counter()
+        # Sin Redis: los mensajes de progreso no deben pesar en la medición.
+        # Dentro de la transacción, run_scraper corre las plataformas en serie (una sola conexión).
+        with override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}):
+            with transaction.atomic():
+                resultados = run_scraper(filtros, keywords=keywords, max_paginas=options['max_paginas'],
+                                         plataforma=options['plataforma']) or []
+                transaction.set_rollback(True)
+        total = time.perf_counter() - inicio
+
+        red = fetcher.get_stats()
+        return {
+            'segundos_total': round(total, 4),
+            'fases': {f: round(d['segundos'], 4) for f, d in metricas.obtener().items()},
+            'resultados': len(resultados),
+            'requests': sum(s['requests'] for s in red.values()),
+            'errores_red': sum(s['errores'] for s in red.values()),
+            'bytes': sum(s['bytes'] for s in red.values()),
+        }
+
+    def _medianas(self, corridas):
+        medianas = {'segundos_total': round(statistics.median(c['segundos_total'] for c in corridas), 4)}
+        for fase in FASES:
+            valores = [c['fases'][fase] for c in corridas if fase in c['fases']]
+            if valores:
+                medianas[fase] = round(statistics.median(valores), 4)
+        total = medianas['segundos_total']
+        requests = corridas[0]['requests']
+        medianas['requests_por_segundo'] = round(requests / total, 2) if total else 0.0
+        return medianas
+
+    def _imprimir(self, resultado):
+        corpus = resultado['corpus']
+        self.stdout.write('')
+        self.stdout.write(f"Corpus: {corpus['directorio']} (versión {corpus['version']}, {corpus['respuestas']} respuestas)")
+        self.stdout.write(f"Modo: {resultado['modo']} | latencia: {resultado['latencia_ms']} ms | corridas: {len(resultado['corridas'])}")
+        mediana = resultado['mediana']
+        for fase in FASES:
+            if fase in mediana:
+                self.stdout.write(f"  {fase:<10} {mediana[fase]:>9.4f}s")
+        self.stdout.write(f"  {'TOTAL':<10} {mediana['segundos_total']:>9.4f}s | "
+                          f"{mediana['requests_por_segundo']} req/s | "
+                          f"{resultado['corridas'][0]['resultados']} resultados | "
+                          f"{resultado['corridas'][0]['errores_red']} errores de red")
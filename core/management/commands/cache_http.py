@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from core.scraper import cache as http_cache
+from core.scraper.constants import HTTP_CACHE_TTL
+
+
+class Command(BaseCommand):
+    help = 'Inspeccionar y purgar la caché HTTP en disco del scraper (listados y detalles).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stats', action='store_true', help='Mostrar estadísticas (por defecto).')
+        parser.add_argument('--purge', action='store_true', help='Borrar entradas de la caché.')
+        parser.add_argument('--expired', action='store_true', help='Con --purge: sólo entradas vencidas según su TTL.')
+        parser.add_argument('--tipo', type=str, choices=sorted(HTTP_CACHE_TTL.keys()),
+                            help='Limitar a un tipo de página.')
+        parser.add_argument('--evict', action='store_true', help='Aplicar ahora el límite de tamaño (LRU).')
+        parser.add_argument('--url', type=str, help='Mostrar la entrada de una URL concreta.')
+
+    def handle(self, *args, **options):
+        if options.get('url'):
+            entrada = http_cache.obtener(options['url'])
+            if not entrada:
+                self.stdout.write(self.style.WARNING('URL no cacheada.'))
+                return
+            estado = 'fresca' if entrada['fresca'] else 'vencida (se revalida)'
+            self.stdout.write(f"{entrada['url']}")
+            self.stdout.write(f"  tipo: {entrada['tipo']} | {estado} | {len(entrada['contenido']) / 1024:.0f} KB")
+            self.stdout.write(f"  ETag: {entrada['etag'] or '-'} | Last-Modified: {entrada['last_modified'] or '-'}")
+            return
+
+        if options.get('purge'):
+            borradas = http_cache.purgar(tipo=options.get('tipo'), solo_expiradas=options.get('expired'))
+            self.stdout.write(self.style.SUCCESS(f'Entradas borradas: {borradas}'))
+
+        if options.get('evict'):
+            borradas = http_cache.desalojar()
+            self.stdout.write(self.style.SUCCESS(f'Entradas desalojadas (LRU): {borradas}'))
+
+        if options.get('stats') or not (options.get('purge') or options.get('evict')):
+            stats = http_cache.estadisticas()
+            self.stdout.write(f"Directorio: {stats['directorio']}")
+            self.stdout.write(
+                f"Entradas: {stats['entradas']} | En disco: {stats['bytes_en_disco'] / 1048576:.1f} MB "
+                f"de {stats['max_bytes'] / 1048576:.0f} MB"
+            )
+            for tipo, datos in sorted(stats['por_tipo'].items()):
+                if options.get('tipo') and tipo != options['tipo']:
+                    continue
+                self.stdout.write(
+                    f" - {tipo}: {datos['entradas']} entradas ({datos['frescas']} frescas, TTL "
+                    f"{HTTP_CACHE_TTL.get(tipo, 0)}s) | {datos['bytes'] / 1048576:.1f} MB | "
+                    f"más vieja: {datos['edad_max_seg'] // 60} min"
+                )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from core.models import COLUMNAS_METADATA, Propiedad
+
+
+class Command(BaseCommand):
+    help = 'Recalcular en lotes las columnas tipadas de Propiedad a partir de su metadata (precio, dormitorios, ...).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=500, help='Propiedades por lote (default 500).')
+
+    def handle(self, *args, **options):
+        batch = max(1, options['batch'])
+        qs = Propiedad.objects.all()
+        total = qs.count()
+        self.stdout.write(f'Propiedades a procesar: {total}')
+
+        # Recorrido por id con `only` para no cargar más que lo necesario; bulk_update no pasa por save()
+        procesadas = 0
+        ultimo_id = None
+        while True:
+            lote_qs = qs.order_by('id').only('id', 'metadata')
+            if ultimo_id is not None:
+                lote_qs = lote_qs.filter(id__gt=ultimo_id)
+            lote = list(lote_qs[:batch])
+            if not lote:
+                break
+            for prop in lote:
+                prop.sincronizar_columnas()
+            Propiedad.objects.bulk_update(lote, list(COLUMNAS_METADATA))
+            procesadas += len(lote)
+            ultimo_id = lote[-1].id
+            self.stdout.write(f'  {procesadas}/{total}')
+
+        self.stdout.write(self.style.SUCCESS(f'Columnas actualizadas en {procesadas} propiedades.'))
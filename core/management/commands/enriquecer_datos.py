@@ -3,7 +3,6 @@ from django.core.management.base import BaseCommand
 from core.models import Propiedad
 from core.scraper import scrape_detalle_con_requests # Reutilizamos nuestra función de scrapeo de detalles
 import os
-import time
 
 class Command(BaseCommand):
     help = 'Recorre las propiedades existentes en la BD y llena los campos que estén vacíos.'
@@ -44,7 +43,5 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS('  -> ¡Datos enriquecidos y guardados!'))
             else:
                 self.stderr.write(self.style.ERROR('  -> Falló la obtención de detalles.'))
-            
-            time.sleep(1) # Pausa cortés para no saturar la API
 
         self.stdout.write(self.style.SUCCESS('Proceso de enriquecimiento finalizado.'))
\ No newline at end of file
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.evaluacion_lote import LOTE_PROPIEDADES, recalcular_desactualizadas, reevaluar_palabras_clave
+from core.models import Busqueda
+from core.search_manager import get_or_create_palabra_clave, reevaluar_busqueda
+
+
+class Command(BaseCommand):
+    help = 'Reevaluar keywords sobre las propiedades guardadas (en lote, sin scrapear).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--busqueda', type=str, help='ID de búsqueda: reevalúa sus keywords y resultados.')
+        parser.add_argument('--palabra', action='append', default=[],
+                            help='Palabra clave a evaluar sobre TODAS las propiedades (repetible).')
+        parser.add_argument('--sobrescribir', action='store_true',
+                            help='Con --palabra: recalcular también relaciones existentes.')
+        parser.add_argument('--desactualizadas', action='store_true',
+                            help='Recalcular sólo los veredictos de propiedades cuyo texto cambió.')
+        parser.add_argument('--lote', type=int, default=LOTE_PROPIEDADES, help='Propiedades por lote.')
+
+    def handle(self, *args, **options):
+        if not options['busqueda'] and not options['palabra'] and not options['desactualizadas']:
+            raise CommandError('Indicar --busqueda, --desactualizadas o al menos una --palabra.')
+
+        if options['desactualizadas']:
+            stats = recalcular_desactualizadas(lote=max(1, options['lote']), progress_callback=self.stdout.write)
+            self.stdout.write(self.style.SUCCESS(
+                f"{stats['actualizadas']} veredictos recalculados en {stats['palabras']} palabras clave"
+            ))
+
+        if options['busqueda']:
+            try:
+                stats = reevaluar_busqueda(options['busqueda'], progress_callback=self.stdout.write)
+            except Busqueda.DoesNotExist:
+                raise CommandError(f"No existe la búsqueda {options['busqueda']}")
+            self.stdout.write(self.style.SUCCESS(
+                f"Búsqueda reevaluada: {stats['propiedades']} propiedades, {stats['coinciden']} coinciden"
+            ))
+
+        if options['palabra']:
+            palabras = [get_or_create_palabra_clave(texto) for texto in options['palabra']]
+            stats = reevaluar_palabras_clave(
+                palabras, lote=max(1, options['lote']), sobrescribir=options['sobrescribir'],
+                progress_callback=self.stdout.write
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{stats['propiedades']} propiedades: {stats['creadas']} relaciones creadas, "
+                f"{stats['actualizadas']} actualizadas"
+            ))
+            for texto, total in stats['por_palabra'].items():
+                self.stdout.write(f' - {texto}: {total}')
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Propiedad, calcular_hash_texto
+
+
+class Command(BaseCommand):
+    help = 'Recalcular en lotes el texto de búsqueda normalizado (Propiedad.texto_busqueda).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=500, help='Propiedades por lote (default 500).')
+        parser.add_argument('--todas', action='store_true',
+                            help='Recalcular todas, no sólo las que tienen el texto vacío.')
+
+    def handle(self, *args, **options):
+        batch = max(1, options['batch'])
+        qs = Propiedad.objects.all() if options['todas'] else Propiedad.objects.filter(texto_busqueda='')
+        total = qs.count()
+        self.stdout.write(f'Propiedades a procesar: {total}')
+
+        # Recorrido por id con `only` para no cargar más que lo necesario; bulk_update no pasa por save()
+        procesadas = 0
+        ultimo_id = None
+        while True:
+            lote_qs = qs.order_by('id').only('id', 'titulo', 'descripcion', 'metadata', 'texto_busqueda')
+            if ultimo_id is not None:
+                lote_qs = lote_qs.filter(id__gt=ultimo_id)
+            lote = list(lote_qs[:batch])
+            if not lote:
+                break
+            for prop in lote:
+                prop.texto_busqueda = prop.calcular_texto_busqueda()
+                prop.hash_texto = calcular_hash_texto(prop.texto_busqueda)
+            Propiedad.objects.bulk_update(lote, ['texto_busqueda', 'hash_texto'])
+            procesadas += len(lote)
+            ultimo_id = lote[-1].id
+            self.stdout.write(f'  {procesadas}/{total}')
+
+        self.stdout.write(self.style.SUCCESS(f'Texto de búsqueda actualizado en {procesadas} propiedades.'))
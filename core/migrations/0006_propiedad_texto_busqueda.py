@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_add_limits_to_inmobiliaria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propiedad',
+            name='texto_busqueda',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import migrations
+
+from core.migrations._fts_sqlite import BORRAR_TRIGGERS, RECONSTRUIR, TRIGGERS
+
+# Índice full-text sobre propiedad.texto_busqueda (ver core/indice_texto.py).
+# Depende del motor, por eso se crea con SQL crudo según connection.vendor.
+
+SQLITE_CREAR = [
+    "CREATE VIRTUAL TABLE propiedad_fts USING fts5("
+    "texto_busqueda, content='propiedad', content_rowid='id', tokenize='unicode61')",
+    *TRIGGERS,
+    RECONSTRUIR,
+]
+
+SQLITE_BORRAR = BORRAR_TRIGGERS + [
+    "DROP TABLE IF EXISTS propiedad_fts",
+]
+
+POSTGRES_CREAR = [
+    "ALTER TABLE propiedad ADD COLUMN texto_busqueda_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(texto_busqueda, ''))) STORED",
+    "CREATE INDEX propiedad_texto_busqueda_tsv_gin ON propiedad USING GIN (texto_busqueda_tsv)",
+]
+
+POSTGRES_BORRAR = [
+    "DROP INDEX IF EXISTS propiedad_texto_busqueda_tsv_gin",
+    "ALTER TABLE propiedad DROP COLUMN IF EXISTS texto_busqueda_tsv",
+]
+
+
+def _sqlite_tiene_fts5(cursor):
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp._prueba_fts5 USING fts5(x)")
+        cursor.execute("DROP TABLE temp._prueba_fts5")
+        return True
+    except Exception:
+        return False
+
+
+def crear_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            if not _sqlite_tiene_fts5(cursor):
+                print("⚠️ [MIGRACIÓN] SQLite sin FTS5: la búsqueda por texto usa LIKE sobre texto_busqueda")
+                return
+            sentencias = SQLITE_CREAR
+        elif vendor == 'postgresql':
+            sentencias = POSTGRES_CREAR
+        else:
+            return
+        for sql in sentencias:
+            cursor.execute(sql)
+
+
+def borrar_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    sentencias = {'sqlite': SQLITE_BORRAR, 'postgresql': POSTGRES_BORRAR}.get(vendor, [])
+    with schema_editor.connection.cursor() as cursor:
+        for sql in sentencias:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_propiedad_texto_busqueda'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, transaction
+
+# Índice de trigramas (pg_trgm) sobre propiedad.texto_busqueda para el matching
+# difuso en SQL (ver core/indice_texto.py: propiedades_similares). Sólo PostgreSQL;
+# en SQLite el matching difuso se resuelve en memoria (core/scraper/trigramas.py).
+
+POSTGRES_CREAR = [
+    "CREATE INDEX propiedad_texto_busqueda_trgm ON propiedad USING GIN (texto_busqueda gin_trgm_ops)",
+]
+
+POSTGRES_BORRAR = [
+    "DROP INDEX IF EXISTS propiedad_texto_busqueda_trgm",
+]
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            # Savepoint: si el usuario no puede crear extensiones la migración sigue igual
+            with transaction.atomic(using=schema_editor.connection.alias):
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception as e:
+            print(f"⚠️ [MIGRACIÓN] pg_trgm no disponible ({e}): el matching difuso se hace en memoria")
+            return
+        for sql in POSTGRES_CREAR:
+            cursor.execute(sql)
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in POSTGRES_BORRAR:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_indice_texto_busqueda'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:20
+
+import hashlib
+
+from django.db import migrations, models
+
+from core.migrations._fts_sqlite import restaurar_fts
+
+
+def _hash(texto):
+    # Igual que core.models.calcular_hash_texto (copiado: las migraciones no importan código de la app)
+    return hashlib.blake2b((texto or '').encode('utf-8'), digest_size=8).hexdigest()
+
+
+def calcular_hashes(apps, schema_editor):
+    Propiedad = apps.get_model('core', 'Propiedad')
+    ultimo_id = 0
+    while True:
+        lote = list(Propiedad.objects.filter(id__gt=ultimo_id).order_by('id').only('id', 'texto_busqueda')[:1000])
+        if not lote:
+            break
+        for prop in lote:
+            prop.hash_texto = _hash(prop.texto_busqueda)
+        Propiedad.objects.bulk_update(lote, ['hash_texto'])
+        ultimo_id = lote[-1].id
+    # Los veredictos existentes quedan con hash '' (desconocido): se recalculan al usarse
+    # o con `manage.py reevaluar_keywords --desactualizadas`
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_indice_trigramas'),
+    ]
+
+    operations = [
+        # En SQLite los AddField reconstruyen `propiedad` y borran los triggers FTS (ver _fts_sqlite)
+        migrations.RunPython(migrations.RunPython.noop, restaurar_fts),
+        migrations.AddField(
+            model_name='propiedad',
+            name='hash_texto',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='palabraclavepropiedad',
+            name='hash_texto',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.RunPython(calcular_hashes, migrations.RunPython.noop),
+        migrations.RunPython(restaurar_fts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,211 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:05
+
+from django.db import migrations, models
+
+from core.migrations._fts_sqlite import restaurar_fts
+
+# Conversores de core.models.COLUMNAS_METADATA (copiados: las migraciones no importan código de la app)
+
+
+def _numero(valor):
+    if isinstance(valor, bool) or valor in (None, ''):
+        return None
+    try:
+        return float(str(valor).replace(',', '.')) if isinstance(valor, str) else float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cantidad(valor):
+    numero = _numero(valor)
+    return int(numero) if numero is not None and 0 <= numero <= 32767 else None
+
+
+def _booleano(valor):
+    return bool(valor) and str(valor).strip().lower() not in ('false', 'no', '0', 'n/a')
+
+
+def _clave(valor):
+    texto = str(valor or '').strip().lower()
+    return '' if texto == 'n/a' else texto[:50]
+
+
+COLUMNAS = {
+    'precio_valor': _numero,
+    'precio_moneda': lambda v: str(v or '').strip().upper()[:5],
+    'gastos_comunes_valor': _numero,
+    'dormitorios_min': _cantidad,
+    'dormitorios_max': _cantidad,
+    'banos_min': _cantidad,
+    'banos_max': _cantidad,
+    'superficie_total_min': _numero,
+    'superficie_total_max': _numero,
+    'cocheras_min': _cantidad,
+    'cocheras_max': _cantidad,
+    'antiguedad': _cantidad,
+    'es_amoblado': _booleano,
+    'admite_mascotas': _booleano,
+    'tiene_piscina': _booleano,
+    'tiene_terraza': _booleano,
+    'tiene_jardin': _booleano,
+    'tipo_inmueble': _clave,
+    'operacion': _clave,
+    'departamento': _clave,
+}
+
+
+def poblar_columnas(apps, schema_editor):
+    Propiedad = apps.get_model('core', 'Propiedad')
+    ultimo_id = 0
+    while True:
+        lote = list(Propiedad.objects.filter(id__gt=ultimo_id).order_by('id').only('id', 'metadata')[:1000])
+        if not lote:
+            break
+        for prop in lote:
+            metadata = prop.metadata if isinstance(prop.metadata, dict) else {}
+            for campo, convertir in COLUMNAS.items():
+                setattr(prop, campo, convertir(metadata.get(campo)))
+        Propiedad.objects.bulk_update(lote, list(COLUMNAS))
+        ultimo_id = lote[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_hash_texto'),
+    ]
+
+    operations = [
+        # En SQLite los AddField reconstruyen `propiedad` y borran los triggers FTS (ver _fts_sqlite)
+        migrations.RunPython(migrations.RunPython.noop, restaurar_fts),
+        migrations.AddField(
+            model_name='propiedad',
+            name='precio_valor',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='precio_moneda',
+            field=models.CharField(blank=True, default='', max_length=5),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='gastos_comunes_valor',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='dormitorios_min',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='dormitorios_max',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='banos_min',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='banos_max',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='superficie_total_min',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='superficie_total_max',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='cocheras_min',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='cocheras_max',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='antiguedad',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='es_amoblado',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='admite_mascotas',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='tiene_piscina',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='tiene_terraza',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='tiene_jardin',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='tipo_inmueble',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='operacion',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='propiedad',
+            name='departamento',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='propiedad',
+            index=models.Index(fields=['operacion', 'tipo_inmueble', 'departamento', 'precio_valor'], name='propiedad_filtros_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propiedad',
+            index=models.Index(fields=['precio_moneda', 'precio_valor'], name='propiedad_moneda_precio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propiedad',
+            index=models.Index(fields=['dormitorios_max'], name='propiedad_dormitorios_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propiedad',
+            index=models.Index(fields=['banos_max'], name='propiedad_banos_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propiedad',
+            index=models.Index(fields=['superficie_total_max'], name='propiedad_superficie_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propiedad',
+            index=models.Index(fields=['cocheras_max'], name='propiedad_cocheras_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propiedad',
+            index=models.Index(fields=['gastos_comunes_valor'], name='propiedad_gastos_idx'),
+        ),
+        migrations.RunPython(poblar_columnas, migrations.RunPython.noop),
+        migrations.RunPython(restaurar_fts, migrations.RunPython.noop),
+    ]
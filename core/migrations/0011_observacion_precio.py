@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_columnas_propiedad'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObservacionPrecio',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('observado_at', models.DateTimeField()),
+                ('moneda', models.CharField(blank=True, default='', max_length=5)),
+                ('valor', models.FloatField()),
+                ('propiedad', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='precios', to='core.propiedad')),
+            ],
+            options={
+                'verbose_name': 'Observación de Precio',
+                'verbose_name_plural': 'Observaciones de Precio',
+                'db_table': 'observacion_precio',
+                'indexes': [models.Index(fields=['propiedad', 'observado_at'], name='obs_precio_propiedad_idx'), models.Index(fields=['observado_at'], name='obs_precio_fecha_idx')],
+            },
+        ),
+    ]
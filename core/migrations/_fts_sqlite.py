@@ -0,0 +1,40 @@
+"""
+Triggers que mantienen `propiedad_fts` (FTS5, ver 0007) sincronizada con `propiedad` en SQLite.
+
+En SQLite varios cambios de esquema (AddField con default, AlterField, ...) reconstruyen la
+tabla `propiedad` y se pierden sus triggers sin ningún error: el índice queda desactualizado.
+Toda migración que toque `propiedad` termina con `restaurar_fts` (y la arranca con
+`RunPython(noop, restaurar_fts)` para cubrir también la vuelta atrás).
+
+El nombre empieza con '_' para que el loader de migraciones no lo tome como una migración.
+"""
+
+TRIGGERS = [
+    "CREATE TRIGGER propiedad_fts_ai AFTER INSERT ON propiedad BEGIN "
+    "INSERT INTO propiedad_fts(rowid, texto_busqueda) VALUES (new.id, new.texto_busqueda); END",
+    "CREATE TRIGGER propiedad_fts_ad AFTER DELETE ON propiedad BEGIN "
+    "INSERT INTO propiedad_fts(propiedad_fts, rowid, texto_busqueda) VALUES ('delete', old.id, old.texto_busqueda); END",
+    "CREATE TRIGGER propiedad_fts_au AFTER UPDATE OF texto_busqueda ON propiedad BEGIN "
+    "INSERT INTO propiedad_fts(propiedad_fts, rowid, texto_busqueda) VALUES ('delete', old.id, old.texto_busqueda); "
+    "INSERT INTO propiedad_fts(rowid, texto_busqueda) VALUES (new.id, new.texto_busqueda); END",
+]
+
+BORRAR_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS propiedad_fts_ai",
+    "DROP TRIGGER IF EXISTS propiedad_fts_ad",
+    "DROP TRIGGER IF EXISTS propiedad_fts_au",
+]
+
+RECONSTRUIR = "INSERT INTO propiedad_fts(propiedad_fts) VALUES ('rebuild')"
+
+
+def restaurar_fts(apps, schema_editor):
+    """Vuelve a crear los triggers y reconstruye el índice, si existe la tabla FTS5."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'propiedad_fts'")
+        if cursor.fetchone() is None:
+            return
+        for sql in BORRAR_TRIGGERS + TRIGGERS + [RECONSTRUIR]:
+            cursor.execute(sql)
@@ -1,6 +1,79 @@
 from django.db import models
+from functools import lru_cache
+import hashlib
+import json
 import uuid
 
+from core import cache_palabras, indice_invertido
+from core.scraper.utils import normalizar_texto
+
+
+@lru_cache(maxsize=4096)
+def _parsear_sinonimos(sinonimos: str) -> tuple:
+    """JSON de sinónimos -> tupla, parseado una vez por string distinto."""
+    try:
+        return tuple(json.loads(sinonimos)) if sinonimos else ()
+    except (ValueError, TypeError):
+        return ()
+
+
+def calcular_hash_texto(texto: str) -> str:
+    """Hash corto del texto de búsqueda: identifica la versión del texto contra la que se evaluó una keyword."""
+    return hashlib.blake2b((texto or '').encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _numero(valor):
+    """Número de la metadata (int, float o string numérico) o None."""
+    if isinstance(valor, bool) or valor in (None, ''):
+        return None
+    try:
+        return float(str(valor).replace(',', '.')) if isinstance(valor, str) else float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cantidad(valor):
+    """Cantidad (dormitorios, baños, cocheras, años) como entero no negativo o None."""
+    numero = _numero(valor)
+    return int(numero) if numero is not None and 0 <= numero <= 32767 else None
+
+
+def _booleano(valor) -> bool:
+    return bool(valor) and str(valor).strip().lower() not in ('false', 'no', '0', 'n/a')
+
+
+def _clave(valor) -> str:
+    """Texto corto normalizado para filtrar por igualdad ('N/A' y vacíos quedan en '')."""
+    texto = str(valor or '').strip().lower()
+    return '' if texto == 'n/a' else texto[:50]
+
+
+# Atributos de `Propiedad.metadata` que además tienen columna propia (mismo nombre): clave -> conversor.
+# Las columnas permiten filtrar/ordenar el inventario con índices en vez de extraer el JSON fila por fila.
+COLUMNAS_METADATA = {
+    'precio_valor': _numero,
+    'precio_moneda': lambda v: str(v or '').strip().upper()[:5],
+    'gastos_comunes_valor': _numero,
+    'dormitorios_min': _cantidad,
+    'dormitorios_max': _cantidad,
+    'banos_min': _cantidad,
+    'banos_max': _cantidad,
+    'superficie_total_min': _numero,
+    'superficie_total_max': _numero,
+    'cocheras_min': _cantidad,
+    'cocheras_max': _cantidad,
+    'antiguedad': _cantidad,
+    'es_amoblado': _booleano,
+    'admite_mascotas': _booleano,
+    'tiene_piscina': _booleano,
+    'tiene_terraza': _booleano,
+    'tiene_jardin': _booleano,
+    'tipo_inmueble': _clave,
+    'operacion': _clave,
+    'departamento': _clave,
+}
+
+
 class Inmobiliaria(models.Model):
     id = models.AutoField(primary_key=True)
     nombre = models.CharField(max_length=255)
@@ -103,16 +176,19 @@ class PalabraClave(models.Model):
     @property
     def sinonimos_list(self):
         """Convertir string JSON a lista"""
-        import json
-        try:
-            return json.loads(self.sinonimos) if self.sinonimos else []
-        except:
-            return []
+        return list(_parsear_sinonimos(self.sinonimos))
     
     def set_sinonimos(self, lista):
         """Convertir lista a string JSON"""
-        import json
         self.sinonimos = json.dumps(lista)
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache_palabras.invalidar(self)
+    
+    def delete(self, *args, **kwargs):
+        cache_palabras.invalidar(self)
+        return super().delete(*args, **kwargs)
 
 class BusquedaPalabraClave(models.Model):
     busqueda = models.ForeignKey(Busqueda, on_delete=models.CASCADE)
@@ -130,6 +206,31 @@ class Propiedad(models.Model):
     titulo = models.CharField(max_length=500, blank=True, null=True)
     descripcion = models.TextField(blank=True, null=True)
     metadata = models.JSONField(default=dict, blank=True)
+    # Título + descripción + características ya normalizados (ver `calcular_texto_busqueda`)
+    texto_busqueda = models.TextField(blank=True, default='')
+    # Hash de texto_busqueda; los veredictos de PalabraClavePropiedad con otro hash están desactualizados
+    hash_texto = models.CharField(max_length=16, blank=True, default='')
+    # Copia tipada de los atributos más consultados de `metadata` (ver COLUMNAS_METADATA)
+    precio_valor = models.FloatField(null=True, blank=True)
+    precio_moneda = models.CharField(max_length=5, blank=True, default='')
+    gastos_comunes_valor = models.FloatField(null=True, blank=True)
+    dormitorios_min = models.PositiveSmallIntegerField(null=True, blank=True)
+    dormitorios_max = models.PositiveSmallIntegerField(null=True, blank=True)
+    banos_min = models.PositiveSmallIntegerField(null=True, blank=True)
+    banos_max = models.PositiveSmallIntegerField(null=True, blank=True)
+    superficie_total_min = models.FloatField(null=True, blank=True)
+    superficie_total_max = models.FloatField(null=True, blank=True)
+    cocheras_min = models.PositiveSmallIntegerField(null=True, blank=True)
+    cocheras_max = models.PositiveSmallIntegerField(null=True, blank=True)
+    antiguedad = models.PositiveSmallIntegerField(null=True, blank=True)
+    es_amoblado = models.BooleanField(default=False)
+    admite_mascotas = models.BooleanField(default=False)
+    tiene_piscina = models.BooleanField(default=False)
+    tiene_terraza = models.BooleanField(default=False)
+    tiene_jardin = models.BooleanField(default=False)
+    tipo_inmueble = models.CharField(max_length=50, blank=True, default='')
+    operacion = models.CharField(max_length=50, blank=True, default='')
+    departamento = models.CharField(max_length=50, blank=True, default='')
     plataforma = models.ForeignKey(Plataforma, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -142,16 +243,69 @@ class Propiedad(models.Model):
         indexes = [
             models.Index(fields=['plataforma', 'created_at']),
             models.Index(fields=['created_at']),
+            # Combinación habitual de filtros: operación/tipo/departamento y rango de precio
+            models.Index(fields=['operacion', 'tipo_inmueble', 'departamento', 'precio_valor'],
+                         name='propiedad_filtros_idx'),
+            models.Index(fields=['precio_moneda', 'precio_valor'], name='propiedad_moneda_precio_idx'),
+            models.Index(fields=['dormitorios_max'], name='propiedad_dormitorios_idx'),
+            models.Index(fields=['banos_max'], name='propiedad_banos_idx'),
+            models.Index(fields=['superficie_total_max'], name='propiedad_superficie_idx'),
+            models.Index(fields=['cocheras_max'], name='propiedad_cocheras_idx'),
+            models.Index(fields=['gastos_comunes_valor'], name='propiedad_gastos_idx'),
         ]
     
     def __str__(self):
         return self.titulo or self.url
 
+    def sincronizar_columnas(self):
+        """Copia a las columnas tipadas los atributos de `metadata` (ver COLUMNAS_METADATA)."""
+        metadata = self.metadata if isinstance(self.metadata, dict) else {}
+        for campo, convertir in COLUMNAS_METADATA.items():
+            setattr(self, campo, convertir(metadata.get(campo)))
+
+    def calcular_texto_busqueda(self) -> str:
+        """Texto sobre el que se buscan las keywords, normalizado (minúsculas, sin acentos ni puntuación)."""
+        caracteristicas = ''
+        if self.metadata and isinstance(self.metadata, dict):
+            # Formato actual primero, después el dict, por último el legacy
+            if 'caracteristicas_texto' in self.metadata:
+                caracteristicas = self.metadata.get('caracteristicas_texto', '')
+            elif 'caracteristicas_dict' in self.metadata:
+                carac_dict = self.metadata.get('caracteristicas_dict', {}) or {}
+                caracteristicas = ' '.join(f"{k}: {v}" for k, v in carac_dict.items())
+            else:
+                caracteristicas = self.metadata.get('caracteristicas', '')
+            if isinstance(caracteristicas, dict):
+                caracteristicas = ' '.join(str(v) for v in caracteristicas.values())
+        return normalizar_texto(f"{self.titulo or ''} {self.descripcion or ''} {caracteristicas or ''}")
+
+    def save(self, *args, **kwargs):
+        # El texto de búsqueda se mantiene en cada alta/modificación
+        texto_anterior = self.texto_busqueda if self.pk else ''
+        self.texto_busqueda = self.calcular_texto_busqueda()
+        self.hash_texto = calcular_hash_texto(self.texto_busqueda)
+        self.sincronizar_columnas()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'titulo', 'descripcion', 'metadata'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'texto_busqueda', 'hash_texto'}
+        if update_fields is not None and 'metadata' in update_fields:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | set(COLUMNAS_METADATA)
+        super().save(*args, **kwargs)
+        indice_invertido.registrar_cambio(self.pk, texto_anterior, self.texto_busqueda)
+    
+    def delete(self, *args, **kwargs):
+        prop_id, texto = self.pk, self.texto_busqueda
+        resultado = super().delete(*args, **kwargs)
+        indice_invertido.registrar_borrado(prop_id, texto)
+        return resultado
+
 class PalabraClavePropiedad(models.Model):
     id = models.AutoField(primary_key=True)
     palabra_clave = models.ForeignKey(PalabraClave, on_delete=models.CASCADE)
     propiedad = models.ForeignKey(Propiedad, on_delete=models.CASCADE)
     encontrada = models.BooleanField()
+    # Propiedad.hash_texto contra el que se calculó `encontrada` ('' = desconocido)
+    hash_texto = models.CharField(max_length=16, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -168,6 +322,11 @@ class PalabraClavePropiedad(models.Model):
     def __str__(self):
         estado = "✓" if self.encontrada else "✗"
         return f"{self.palabra_clave.texto} {estado} {self.propiedad.titulo or self.propiedad.url}"
+    
+    @classmethod
+    def desactualizadas(cls):
+        """Relaciones cuyo veredicto se calculó contra otra versión del texto de la propiedad."""
+        return cls.objects.exclude(hash_texto=models.F('propiedad__hash_texto'))
 
 class ResultadoBusqueda(models.Model):
     id = models.AutoField(primary_key=True)
@@ -184,3 +343,23 @@ class ResultadoBusqueda(models.Model):
         unique_together = ('busqueda', 'propiedad')
         verbose_name = 'Resultado de Búsqueda'
         verbose_name_plural = 'Resultados de Búsqueda'
+
+class ObservacionPrecio(models.Model):
+    """Serie de precios de una propiedad: sólo se agrega una fila cuando el precio cambia."""
+    id = models.BigAutoField(primary_key=True)
+    propiedad = models.ForeignKey(Propiedad, on_delete=models.CASCADE, related_name='precios')
+    observado_at = models.DateTimeField()
+    moneda = models.CharField(max_length=5, blank=True, default='')
+    valor = models.FloatField()
+    
+    class Meta:
+        db_table = 'observacion_precio'
+        verbose_name = 'Observación de Precio'
+        verbose_name_plural = 'Observaciones de Precio'
+        indexes = [
+            models.Index(fields=['propiedad', 'observado_at'], name='obs_precio_propiedad_idx'),
+            models.Index(fields=['observado_at'], name='obs_precio_fecha_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.propiedad_id} {self.moneda} {self.valor} @ {self.observado_at:%Y-%m-%d}"
@@ -17,9 +17,9 @@ __all__ = [
 	'parse_rango', 'scrape_detalle_con_requests', 'recolectar_urls_de_pagina',
 	'scrape_detalle_infocasas_con_requests', 'recolectar_urls_infocasas_de_pagina',
 	# mercadolibre
-	'extraer_total_resultados_mercadolibre', 'scrape_mercadolibre',
+	'extraer_total_resultados_mercadolibre', 'primera_pagina_mercadolibre', 'scrape_mercadolibre',
 	# infocasas
-	'extraer_total_resultados_infocasas', 'scrape_infocasas',
+	'extraer_total_resultados_infocasas', 'primera_pagina_infocasas', 'scrape_infocasas',
 	# orchestration
 	'run_scraper', 'run_scraper_mercadolibre', 'run_scraper_infocasas',
 	# utils
@@ -91,6 +91,10 @@ def extraer_total_resultados_mercadolibre(*args, **kwargs):
 	from .mercadolibre import extraer_total_resultados_mercadolibre as _impl
 	return _impl(*args, **kwargs)
 
+def primera_pagina_mercadolibre(*args, **kwargs):
+	from .mercadolibre import primera_pagina_mercadolibre as _impl
+	return _impl(*args, **kwargs)
+
 def scrape_mercadolibre(*args, **kwargs):
 	from .mercadolibre import scrape_mercadolibre as _impl
 	return _impl(*args, **kwargs)
@@ -100,6 +104,10 @@ def extraer_total_resultados_infocasas(*args, **kwargs):
 	from .infocasas import extraer_total_resultados_infocasas as _impl
 	return _impl(*args, **kwargs)
 
+def primera_pagina_infocasas(*args, **kwargs):
+	from .infocasas import primera_pagina_infocasas as _impl
+	return _impl(*args, **kwargs)
+
 def scrape_infocasas(*args, **kwargs):
 	from .infocasas import scrape_infocasas as _impl
 	return _impl(*args, **kwargs)
@@ -156,9 +164,11 @@ def __getattr__(name):
 			'recolectar_urls_infocasas_de_pagina': ('core.scraper.extractors', 'recolectar_urls_infocasas_de_pagina'),
 			# mercadolibre
 			'extraer_total_resultados_mercadolibre': ('core.scraper.mercadolibre', 'extraer_total_resultados_mercadolibre'),
+			'primera_pagina_mercadolibre': ('core.scraper.mercadolibre', 'primera_pagina_mercadolibre'),
 			'scrape_mercadolibre': ('core.scraper.mercadolibre', 'scrape_mercadolibre'),
 			# infocasas
 			'extraer_total_resultados_infocasas': ('core.scraper.infocasas', 'extraer_total_resultados_infocasas'),
+			'primera_pagina_infocasas': ('core.scraper.infocasas', 'primera_pagina_infocasas'),
 			'scrape_infocasas': ('core.scraper.infocasas', 'scrape_infocasas'),
 			# orchestration
 			'run_scraper': ('core.scraper.run', 'run_scraper'),
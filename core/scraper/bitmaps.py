@@ -0,0 +1,103 @@
+"""
+Evaluación de grupos de keywords sobre un lote de textos con bitmaps.
+
+Por cada lote de N textos se arma, por variante, un bitmap de N bits (bit i =
+la variante aparece en el texto i). Los bitmaps son enteros de Python: OR
+dentro del grupo y AND entre grupos se resuelven con `|` y `&` sobre enteros
+de N bits, en C, sin recorrer texto por texto. Los bits de cada variante salen
+de buscar su raíz (`raiz_keyword`, la misma que usa el matcher) con `in` sobre
+cada texto: con pocas keywords es mucho más rápido que recorrer los textos
+carácter a carácter, y las raíces repetidas se calculan una vez.
+
+Con matching difuso por trigramas (MATCH_DIFUSO == 'trigramas', como el
+matcher) la raíz no se trunca y a su bitmap se le suma el de los tokens del
+lote similares a cada palabra de la variante: el vocabulario del lote se arma
+una sola vez (token -> bitmap) y se indexa por trigrama.
+
+No depende de Django: `core/evaluacion_lote.py` lo aplica a la tabla Propiedad.
+"""
+
+from typing import Dict, List
+
+from .constants import MATCH_DIFUSO, UMBRAL_TRIGRAMAS
+from .trigramas import IndiceTrigramas
+from .utils import normalizar_texto, raiz_keyword
+
+
+def bits(bitmap: int, n: int) -> List[bool]:
+    """Bitmap -> lista de n booleanos (bit i -> posición i)."""
+    return [c == '1' for c in bin(bitmap)[2:].zfill(n)[::-1]]
+
+
+def bitmap_de_raiz(raiz: str, textos_normalizados: List[str]) -> int:
+    """Bit i encendido si la raíz aparece en el texto i (un `in` en C por texto)."""
+    if not raiz or not textos_normalizados:
+        return 0
+    return int(''.join('1' if raiz in (texto or '') else '0' for texto in reversed(textos_normalizados)), 2)
+
+
+def _vocabulario_de_lote(textos_normalizados: List[str]) -> Dict[str, int]:
+    """Token -> bitmap de los textos del lote que lo contienen."""
+    por_token = {}
+    for i, texto in enumerate(textos_normalizados):
+        bit = 1 << i
+        for token in set((texto or '').split()):
+            por_token[token] = por_token.get(token, 0) | bit
+    return por_token
+
+
+def bitmap_similar(variante_normalizada: str, por_token: Dict[str, int], trigramas: IndiceTrigramas,
+                   umbral: float) -> int:
+    """Textos donde cada palabra de la variante tiene un token con similitud >= umbral."""
+    bitmap = None
+    for palabra in variante_normalizada.split():
+        bitmap_palabra = 0
+        for token in trigramas.similares(palabra, umbral):
+            bitmap_palabra |= por_token[token]
+        bitmap = bitmap_palabra if bitmap is None else bitmap & bitmap_palabra
+        if not bitmap:
+            break
+    return bitmap or 0
+
+
+def evaluar_en_lote(textos_normalizados: List[str], keyword_groups, umbrales=None) -> Dict[str, object]:
+    """
+    Matriz propiedad x variante como bitmaps, reducida por grupo.
+
+    Args:
+        textos_normalizados: Textos ya normalizados (p. ej. `texto_busqueda`), uno por propiedad
+        keyword_groups: Grupos de variantes (OR dentro del grupo, AND entre grupos)
+        umbrales: Umbral de similitud por grupo para el matching difuso (por defecto UMBRAL_TRIGRAMAS)
+
+    Returns:
+        Dict con 'variantes' (por grupo, un bitmap por variante), 'grupos' (un bitmap por
+        grupo) y 'coinciden' (bitmap de las propiedades que cumplen todos los grupos)
+    """
+    difuso = MATCH_DIFUSO == 'trigramas'
+    por_token = trigramas = None
+    por_raiz = {}
+    variantes = []
+    grupos = []
+    coinciden = (1 << len(textos_normalizados)) - 1
+    for i, grupo in enumerate(keyword_groups or []):
+        umbral = umbrales[i] if umbrales is not None else UMBRAL_TRIGRAMAS
+        bitmaps = []
+        for variante in grupo:
+            # Misma semántica que el matcher: la raíz más corta (variante, stem y, sin difuso, v[:-2]) como substring
+            raiz = raiz_keyword(variante, truncar=not difuso)
+            if raiz not in por_raiz:
+                por_raiz[raiz] = bitmap_de_raiz(raiz, textos_normalizados)
+            bitmap = por_raiz[raiz]
+            if difuso:
+                if por_token is None:
+                    por_token = _vocabulario_de_lote(textos_normalizados)
+                    trigramas = IndiceTrigramas(por_token)
+                bitmap |= bitmap_similar(normalizar_texto(str(variante)), por_token, trigramas, umbral)
+            bitmaps.append(bitmap)
+        bitmap_grupo = 0
+        for bitmap in bitmaps:
+            bitmap_grupo |= bitmap
+        variantes.append(bitmaps)
+        grupos.append(bitmap_grupo)
+        coinciden &= bitmap_grupo
+    return {'variantes': variantes, 'grupos': grupos, 'coinciden': coinciden}
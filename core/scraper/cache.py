@@ -0,0 +1,243 @@
+"""Caché HTTP en disco para páginas de listado y de detalle.
+
+- Clave: hash de la URL normalizada (esquema/host en minúsculas, sin fragmento,
+  query ordenada y sin parámetros volátiles como `api_key`).
+- Cuerpos direccionados por contenido: cada cuerpo se guarda una sola vez en
+  `cuerpos/<sha256>` aunque lo referencien varias URLs.
+- Índice en SQLite (`indice.sqlite3`) con ETag, Last-Modified, tipo de página,
+  fecha de guardado y de último uso.
+- TTL por tipo de página (`HTTP_CACHE_TTL`): dentro del TTL la respuesta se
+  sirve sin red; después se revalida con If-None-Match / If-Modified-Since y un
+  304 sólo renueva la entrada.
+- Tamaño acotado (`HTTP_CACHE_MAX_MB`): al superarlo se desalojan las entradas
+  usadas hace más tiempo (LRU) hasta bajar al 90%.
+
+Lo usa `fetcher.fetch(..., cache='listado'|'detalle')`; se inspecciona y purga
+con `manage.py cache_http`.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .constants import (
+    HTTP_CACHE_ACTIVO, HTTP_CACHE_DIR, HTTP_CACHE_MAX_MB, HTTP_CACHE_TTL, HTTP_CACHE_PARAMS_IGNORADOS,
+)
+
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_inicializado = set()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    clave TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    cuerpo_hash TEXT NOT NULL,
+    tamano INTEGER NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    guardado REAL NOT NULL,
+    usado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entradas_usado ON entradas (usado);
+CREATE INDEX IF NOT EXISTS entradas_cuerpo ON entradas (cuerpo_hash);
+"""
+
+
+def normalizar_url(url: str, params: dict = None) -> str:
+    """URL canónica usada como identidad de la página en la caché."""
+    partes = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True)]
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query = sorted((k, v) for k, v in query if k not in HTTP_CACHE_PARAMS_IGNORADOS)
+    ruta = partes.path or '/'
+    return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), ruta, urlencode(query), ''))
+
+
+def clave_de(url: str, params: dict = None) -> str:
+    return hashlib.sha256(normalizar_url(url, params).encode('utf-8')).hexdigest()
+
+
+def _directorio() -> str:
+    return HTTP_CACHE_DIR
+
+
+def _ruta_cuerpo(cuerpo_hash: str) -> str:
+    return os.path.join(_directorio(), 'cuerpos', cuerpo_hash[:2], cuerpo_hash)
+
+
+def _conexion() -> sqlite3.Connection:
+    """Una conexión SQLite por hilo (y por directorio, para los tests)."""
+    directorio = _directorio()
+    conexiones = getattr(_local, 'conexiones', None)
+    if conexiones is None:
+        conexiones = _local.conexiones = {}
+    con = conexiones.get(directorio)
+    if con is None:
+        os.makedirs(os.path.join(directorio, 'cuerpos'), exist_ok=True)
+        con = sqlite3.connect(os.path.join(directorio, 'indice.sqlite3'), timeout=30, isolation_level=None)
+        with _init_lock:
+            if directorio not in _inicializado:
+                con.execute('PRAGMA journal_mode=WAL')
+                con.executescript(_SCHEMA)
+                _inicializado.add(directorio)
+        conexiones[directorio] = con
+    return con
+
+
+def obtener(url: str, params: dict = None):
+    """Devuelve la entrada de la caché como dict (con `contenido` y `fresca`) o None."""
+    if not HTTP_CACHE_ACTIVO:
+        return None
+    con = _conexion()
+    fila = con.execute(
+        'SELECT clave, url, tipo, cuerpo_hash, content_type, etag, last_modified, guardado '
+        'FROM entradas WHERE clave = ?', (clave_de(url, params),)
+    ).fetchone()
+    if not fila:
+        return None
+    clave, url_norm, tipo, cuerpo_hash, content_type, etag, last_modified, guardado = fila
+    try:
+        with open(_ruta_cuerpo(cuerpo_hash), 'rb') as f:
+            contenido = f.read()
+    except OSError:
+        con.execute('DELETE FROM entradas WHERE clave = ?', (clave,))
+        return None
+    ahora = time.time()
+    con.execute('UPDATE entradas SET usado = ? WHERE clave = ?', (ahora, clave))
+    return {
+        'clave': clave,
+        'url': url_norm,
+        'tipo': tipo,
+        'contenido': contenido,
+        'content_type': content_type,
+        'etag': etag,
+        'last_modified': last_modified,
+        'fresca': (ahora - guardado) < HTTP_CACHE_TTL.get(tipo, 0),
+    }
+
+
+def guardar(url: str, params: dict, tipo: str, contenido: bytes, headers=None):
+    """Guarda (o reemplaza) la respuesta 200 de `url` y aplica el límite de tamaño."""
+    if not HTTP_CACHE_ACTIVO:
+        return
+    headers = headers or {}
+    cuerpo_hash = hashlib.sha256(contenido).hexdigest()
+    ruta = _ruta_cuerpo(cuerpo_hash)
+    if not os.path.exists(ruta):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(ruta))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(contenido)
+        os.replace(tmp, ruta)
+    ahora = time.time()
+    con = _conexion()
+    con.execute(
+        'INSERT OR REPLACE INTO entradas '
+        '(clave, url, tipo, cuerpo_hash, tamano, content_type, etag, last_modified, guardado, usado) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (clave_de(url, params), normalizar_url(url, params), tipo, cuerpo_hash, len(contenido),
+         headers.get('Content-Type'), headers.get('ETag'), headers.get('Last-Modified'), ahora, ahora)
+    )
+    desalojar()
+
+
+def renovar(clave: str):
+    """Marca una entrada como recién validada (tras un 304)."""
+    ahora = time.time()
+    _conexion().execute('UPDATE entradas SET guardado = ?, usado = ? WHERE clave = ?', (ahora, ahora, clave))
+
+
+def _borrar_cuerpos_huerfanos(con, hashes):
+    for cuerpo_hash in set(hashes):
+        en_uso = con.execute('SELECT 1 FROM entradas WHERE cuerpo_hash = ? LIMIT 1', (cuerpo_hash,)).fetchone()
+        if not en_uso:
+            try:
+                os.remove(_ruta_cuerpo(cuerpo_hash))
+            except OSError:
+                pass
+
+
+def _tamano_total(con) -> int:
+    fila = con.execute(
+        'SELECT COALESCE(SUM(tamano), 0) FROM (SELECT MAX(tamano) AS tamano FROM entradas GROUP BY cuerpo_hash)'
+    ).fetchone()
+    return int(fila[0])
+
+
+def desalojar(max_bytes: int = None) -> int:
+    """Borra entradas LRU hasta quedar bajo el 90% del límite. Devuelve cuántas borró."""
+    max_bytes = HTTP_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+    con = _conexion()
+    total = _tamano_total(con)
+    if total <= max_bytes:
+        return 0
+    objetivo = int(max_bytes * 0.9)
+    borradas = 0
+    filas = con.execute('SELECT clave, cuerpo_hash, tamano FROM entradas ORDER BY usado').fetchall()
+    for clave, cuerpo_hash, tamano in filas:
+        if total <= objetivo:
+            break
+        con.execute('DELETE FROM entradas WHERE clave = ?', (clave,))
+        borradas += 1
+        en_uso = con.execute('SELECT 1 FROM entradas WHERE cuerpo_hash = ? LIMIT 1', (cuerpo_hash,)).fetchone()
+        if not en_uso:
+            try:
+                os.remove(_ruta_cuerpo(cuerpo_hash))
+            except OSError:
+                pass
+            total -= tamano
+    return borradas
+
+
+def purgar(tipo: str = None, solo_expiradas: bool = False) -> int:
+    """Borra entradas (todas, de un tipo y/o sólo las vencidas). Devuelve cuántas borró."""
+    con = _conexion()
+    condiciones, args = [], []
+    if tipo:
+        condiciones.append('tipo = ?')
+        args.append(tipo)
+    if solo_expiradas:
+        ahora = time.time()
+        vencidas = ' OR '.join('(tipo = ? AND guardado < ?)' for _ in HTTP_CACHE_TTL)
+        condiciones.append(f'({vencidas})')
+        for t, ttl in HTTP_CACHE_TTL.items():
+            args.extend([t, ahora - ttl])
+    where = (' WHERE ' + ' AND '.join(condiciones)) if condiciones else ''
+    filas = con.execute(f'SELECT clave, cuerpo_hash FROM entradas{where}', args).fetchall()
+    con.execute(f'DELETE FROM entradas{where}', args)
+    _borrar_cuerpos_huerfanos(con, [f[1] for f in filas])
+    return len(filas)
+
+
+def estadisticas() -> dict:
+    con = _conexion()
+    ahora = time.time()
+    por_tipo = {}
+    for tipo, cantidad, tamano, mas_vieja in con.execute(
+        'SELECT tipo, COUNT(*), COALESCE(SUM(tamano), 0), MIN(guardado) FROM entradas GROUP BY tipo'
+    ):
+        ttl = HTTP_CACHE_TTL.get(tipo, 0)
+        frescas = con.execute(
+            'SELECT COUNT(*) FROM entradas WHERE tipo = ? AND guardado >= ?', (tipo, ahora - ttl)
+        ).fetchone()[0]
+        por_tipo[tipo] = {
+            'entradas': cantidad,
+            'frescas': frescas,
+            'bytes': tamano,
+            'edad_max_seg': int(ahora - mas_vieja) if mas_vieja else 0,
+        }
+    return {
+        'directorio': _directorio(),
+        'entradas': sum(t['entradas'] for t in por_tipo.values()),
+        'bytes_en_disco': _tamano_total(con),
+        'max_bytes': HTTP_CACHE_MAX_MB * 1024 * 1024,
+        'por_tipo': por_tipo,
+    }
@@ -1,4 +1,75 @@
+import os
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
     "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
 }
+
+# Pools keep-alive del fetcher compartido (core/scraper/fetcher.py)
+FETCH_POOL_CONNECTIONS = int(os.getenv('SCRAPER_POOL_CONNECTIONS', '4'))
+FETCH_POOL_MAXSIZE = int(os.getenv('SCRAPER_POOL_MAXSIZE', '16'))
+
+# Motor asyncio de FASE 2 (core/scraper/fase2.py)
+FASE2_MAX_POR_HOST = int(os.getenv('SCRAPER_FASE2_POR_HOST', '6'))
+FASE2_WORKERS_PARSEO = int(os.getenv('SCRAPER_FASE2_WORKERS_PARSEO', '4'))
+FASE2_PARSEO_EN_PROCESOS = os.getenv('SCRAPER_FASE2_PARSEO_EN_PROCESOS', 'false').lower() in ('1', 'true', 'yes')
+
+# Pipeline en streaming FASE 1 -> dedup -> FASE 2 (core/scraper/pipeline.py)
+PIPELINE_PAGINAS_EN_COLA = int(os.getenv('SCRAPER_PIPELINE_PAGINAS_EN_COLA', '2'))  # páginas descargadas sin consumir
+PIPELINE_LOTE_DEDUP = int(os.getenv('SCRAPER_PIPELINE_LOTE_DEDUP', '24'))           # URLs por consulta de dedup en BD
+
+# Búsquedas "Todas": cada plataforma corre su pipeline en su propio thread (core/scraper/run.py).
+# 'auto': sólo si la BD no es SQLite (un único escritor a la vez: dos threads escribiendo terminan en
+# "database is locked" al vencer el timeout). 'true'/'false' lo fuerzan.
+PLATAFORMAS_EN_PARALELO = os.getenv('SCRAPER_PLATAFORMAS_EN_PARALELO', 'auto').lower()
+
+# Rate limiter por host (core/scraper/rate_limit.py)
+RATE_LIMIT_ACTIVO = os.getenv('SCRAPER_RATE_LIMIT', 'true').lower() in ('1', 'true', 'yes')
+RATE_LIMIT_RPS = float(os.getenv('SCRAPER_RATE_RPS', '5'))            # techo de requests/segundo por host
+RATE_LIMIT_RPS_MIN = float(os.getenv('SCRAPER_RATE_RPS_MIN', '0.2'))   # piso al que puede bajar tras bloqueos
+RATE_LIMIT_RAFAGA = float(os.getenv('SCRAPER_RATE_RAFAGA', '5'))       # tokens acumulables (ráfaga)
+RATE_LIMIT_FACTOR_BAJA = float(os.getenv('SCRAPER_RATE_FACTOR_BAJA', '0.5'))   # multiplicador ante 429/403/captcha
+RATE_LIMIT_INCREMENTO = float(os.getenv('SCRAPER_RATE_INCREMENTO', '0.05'))    # rps que se recuperan por respuesta OK
+# Si se define, las cubetas se comparten entre procesos vía Redis (ej. el mismo valor de REDIS_URL)
+RATE_LIMIT_REDIS_URL = os.getenv('SCRAPER_RATE_REDIS_URL', '')
+
+# Indicadores de bloqueo/captcha (títulos de página en minúsculas)
+CAPTCHA_INDICATORS = [
+    "captcha", "robot", "verificaci", "blocked", "security",
+    "too many requests", "rate limit", "forbidden"
+]
+
+# Caché HTTP en disco (core/scraper/cache.py)
+HTTP_CACHE_ACTIVO = os.getenv('SCRAPER_HTTP_CACHE', 'true').lower() in ('1', 'true', 'yes')
+HTTP_CACHE_DIR = os.getenv(
+    'SCRAPER_HTTP_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'user_data', 'http_cache')
+)
+HTTP_CACHE_MAX_MB = int(os.getenv('SCRAPER_HTTP_CACHE_MAX_MB', '500'))
+# Segundos que una respuesta se sirve sin tocar la red; pasado el TTL se revalida (ETag/Last-Modified)
+HTTP_CACHE_TTL = {
+    'listado': int(os.getenv('SCRAPER_HTTP_CACHE_TTL_LISTADO', '600')),
+    'detalle': int(os.getenv('SCRAPER_HTTP_CACHE_TTL_DETALLE', '21600')),
+}
+# Parámetros que no forman parte de la identidad de la página
+HTTP_CACHE_PARAMS_IGNORADOS = ('api_key', 'tracking_id')
+
+# Transporte HTTP: 'live' (red), 'record' (red + grabar corpus) o 'replay' (sólo corpus)
+TRANSPORTE_MODO = os.getenv('SCRAPER_TRANSPORTE', 'live').lower()
+CORPUS_DIR = os.getenv(
+    'SCRAPER_CORPUS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'user_data', 'corpus', 'actual')
+)
+# Latencia simulada en replay: milisegundos fijos o 'grabada' (la medida al grabar)
+REPLAY_LATENCIA = os.getenv('SCRAPER_REPLAY_LATENCIA_MS', '0')
+
+# Parser de páginas de detalle: 'lxml' (XPath directo, rápido) o 'bs4' (BeautifulSoup, referencia)
+PARSER_DETALLE = os.getenv('SCRAPER_PARSER_DETALLE', 'lxml').lower()
+# MercadoLibre: leer listados y detalles del estado JSON embebido (__PRELOADED_STATE__ / JSON-LD)
+# antes que del DOM; los selectores CSS quedan como respaldo cuando el JSON no está
+ESTADO_EMBEBIDO_ML = os.getenv('SCRAPER_ESTADO_EMBEBIDO_ML', 'true').lower() in ('1', 'true', 'yes')
+
+# Matching difuso de keywords (core/scraper/trigramas.py): 'trigramas' (similitud por palabra >= umbral)
+# o 'truncado' (heurística histórica `v[:-2] in texto`)
+MATCH_DIFUSO = os.getenv('KEYWORDS_MATCH_DIFUSO', 'trigramas').lower()
+UMBRAL_TRIGRAMAS = float(os.getenv('KEYWORDS_UMBRAL_TRIGRAMAS', '0.4'))
@@ -0,0 +1,194 @@
+"""Datos de MercadoLibre desde el estado JSON que la página trae embebido.
+
+Las páginas de MercadoLibre se renderizan del lado del servidor a partir de un
+estado que viaja en el mismo HTML:
+
+    listado -> <script id="__PRELOADED_STATE__" type="application/json">{...}</script>
+    detalle -> window.__PRELOADED_STATE__ = {...};  +  <script type="application/ld+json">
+               con el `Product` de schema.org (nombre, precio, moneda, imagen)
+
+Ese JSON es más estable que las clases CSS y decodificarlo cuesta una fracción
+de construir el árbol del DOM. Cada función decodifica el estado una sola vez
+por página y devuelve None cuando no está (o no trae lo necesario): en ese caso
+el llamador sigue con los selectores CSS de siempre.
+"""
+import json
+import re
+
+from . import extractors
+
+
+_RE_SCRIPT_ESTADO = re.compile(r'<script[^>]*\bid=["\']__PRELOADED_STATE__["\'][^>]*>', re.IGNORECASE)
+_RE_ASIGNACION_ESTADO = re.compile(r'__PRELOADED_STATE__\s*=\s*')
+_RE_LD_JSON = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL
+)
+
+# El detalle de MercadoLibre guarda el símbolo de la moneda, como se ve en la página
+_SIMBOLOS_MONEDA = {'USD': 'U$S', 'UYU': '$'}
+
+_decoder = json.JSONDecoder()
+
+
+def _como_texto(contenido) -> str:
+    if isinstance(contenido, bytes):
+        return contenido.decode('utf-8', errors='replace')
+    return contenido or ''
+
+
+def extraer_estado(contenido) -> dict | None:
+    """Ubica y decodifica `__PRELOADED_STATE__` (como script JSON o como asignación JS)."""
+    texto = _como_texto(contenido)
+    m = _RE_SCRIPT_ESTADO.search(texto)
+    if m:
+        fin = texto.find('</script>', m.end())
+        try:
+            estado = json.loads(texto[m.end():fin if fin != -1 else None])
+            return estado if isinstance(estado, dict) else None
+        except ValueError:
+            return None
+    m = _RE_ASIGNACION_ESTADO.search(texto)
+    if m:
+        try:
+            estado, _ = _decoder.raw_decode(texto, m.end())
+            return estado if isinstance(estado, dict) else None
+        except ValueError:
+            return None
+    return None
+
+
+def _estado_busqueda(estado: dict) -> dict:
+    return ((estado.get('pageState') or {}).get('initialState')
+            or (estado.get('pageStoreState') or {}).get('search')
+            or {})
+
+
+def total_mercadolibre(contenido, estado=None) -> int | None:
+    """Total de publicaciones de la búsqueda según el estado del listado.
+
+    `estado` evita volver a decodificar si el llamador ya lo extrajo.
+    """
+    estado = estado or extraer_estado(contenido)
+    if not estado:
+        return None
+    busqueda = _estado_busqueda(estado)
+    total = ((busqueda.get('melidata_track') or {}).get('event_data') or {}).get('total')
+    if isinstance(total, int):
+        return total
+    # Respaldo: "50 de 57.779 inmuebles en esta área"
+    mensaje = (busqueda.get('map_configuration') or {}).get('results_message') or ''
+    m = re.search(r'de\s+(\d{1,3}(?:[.,]\d{3})+|\d+)', mensaje)
+    return int(m.group(1).replace('.', '').replace(',', '')) if m else None
+
+
+def _componente(polycard: dict, tipo: str) -> dict:
+    for comp in polycard.get('components') or []:
+        if comp.get('type') == tipo:
+            return comp.get(tipo) or {}
+    return {}
+
+
+def items_mercadolibre(contenido, estado=None):
+    """(set(URLs), {URL: título}) de un listado, o None si el estado no trae resultados.
+
+    Sólo se toman las tarjetas `POLYCARD`: son las mismas que el DOM muestra como
+    `li.ui-search-layout__item` (los billboards publicitarios quedan afuera).
+    """
+    estado = estado or extraer_estado(contenido)
+    if not estado:
+        return None
+    busqueda = _estado_busqueda(estado)
+    prefijo = (busqueda.get('polycard_context') or {}).get('url_prefix') or 'https://'
+    urls = set()
+    titulos = {}
+    tarjetas = 0
+    for resultado in busqueda.get('results') or []:
+        polycard = resultado.get('polycard') if isinstance(resultado, dict) else None
+        if not polycard:
+            continue
+        tarjetas += 1
+        url = ((polycard.get('metadata') or {}).get('url') or '').split('#')[0]
+        if not url:
+            continue
+        if not url.startswith('http'):
+            url = prefijo + url
+        urls.add(url)
+        titulo = (_componente(polycard, 'title').get('text') or '').strip()
+        if titulo:
+            titulos.setdefault(url, titulo)
+    return (urls, titulos) if tarjetas else None
+
+
+def _productos_ld(texto: str):
+    for m in _RE_LD_JSON.finditer(texto):
+        try:
+            bloque = json.loads(m.group(1))
+        except ValueError:
+            continue
+        pendientes = bloque if isinstance(bloque, list) else [bloque]
+        for nodo in pendientes:
+            if not isinstance(nodo, dict):
+                continue
+            if isinstance(nodo.get('@graph'), list):
+                pendientes.extend(nodo['@graph'])
+            if nodo.get('@type') == 'Product':
+                yield nodo
+
+
+def _buscar_clave(nodo, clave: str):
+    """Primer valor de `clave` en cualquier nivel del estado (el anidamiento cambia entre versiones)."""
+    pendientes = [nodo]
+    while pendientes:
+        actual = pendientes.pop()
+        if isinstance(actual, dict):
+            if clave in actual:
+                return actual[clave]
+            pendientes.extend(actual.values())
+        elif isinstance(actual, list):
+            pendientes.extend(actual)
+    return None
+
+
+def _caracteristicas_estado(estado: dict) -> dict:
+    """Ficha técnica del detalle como {clave en minúsculas: valor}, igual que la tabla del DOM."""
+    caracteristicas = {}
+    ficha = _buscar_clave(estado, 'technical_specifications') or {}
+    for grupo in (ficha.get('specs') or []) if isinstance(ficha, dict) else []:
+        for atributo in grupo.get('attributes') or []:
+            clave = atributo.get('id') if 'text' in atributo else atributo.get('name')
+            valor = atributo.get('text') if 'text' in atributo else atributo.get('value_name')
+            if clave and valor is not None:
+                caracteristicas[str(clave).replace(':', '').strip().lower()] = str(valor).strip()
+    return caracteristicas
+
+
+def detalle_mercadolibre(contenido, url: str) -> dict | None:
+    """Mismo dict que `parsear_detalle_mercadolibre`, armado desde el JSON embebido.
+
+    Título, precio, moneda, imagen y descripción salen del `Product` JSON-LD y la
+    ficha técnica de `__PRELOADED_STATE__`. Si falta cualquiera de esas partes (la
+    descripción incluida: las keywords se buscan ahí) devuelve None y se parsea el DOM.
+    """
+    texto = _como_texto(contenido)
+    producto = next(_productos_ld(texto), None)
+    if not producto or not producto.get('name'):
+        return None
+    oferta = producto.get('offers') or {}
+    if isinstance(oferta, list):
+        oferta = oferta[0] if oferta else {}
+    if oferta.get('price') in (None, '') or not (producto.get('description') or '').strip():
+        return None
+    estado = extraer_estado(texto)
+    caracteristicas_dict = _caracteristicas_estado(estado) if estado else {}
+    if not caracteristicas_dict:
+        return None
+
+    datos = {'url': url}
+    datos['titulo'] = str(producto['name']).strip()
+    moneda = oferta.get('priceCurrency') or ''
+    datos['precio_moneda'] = _SIMBOLOS_MONEDA.get(moneda, moneda)
+    datos['precio_valor'] = int(float(re.sub(r'[^\d.]', '', str(oferta['price'])) or 0))
+    imagen = producto.get('image') or ''
+    datos['url_imagen'] = (imagen[0] if imagen else '') if isinstance(imagen, list) else imagen
+    datos['descripcion'] = producto['description'].strip()
+    return extractors._completar_datos_mercadolibre(datos, caracteristicas_dict)
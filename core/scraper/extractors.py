@@ -1,8 +1,11 @@
 import re
-import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 from typing import Tuple, Set
-from .constants import HEADERS
+from . import fetcher
+from . import estado_embebido
+from .constants import PARSER_DETALLE, ESTADO_EMBEBIDO_ML
 
 
 def parse_rango(texto: str) -> tuple[int | None, int | None]:
@@ -41,6 +44,11 @@ def _parse_propiedad_html(soup: BeautifulSoup, url: str):
             key = spans[0].text.replace(':', '').strip().lower()
             value = spans[1].text.strip()
             caracteristicas_dict[key] = value
+    return _completar_datos_mercadolibre(datos, caracteristicas_dict)
+
+
+def _completar_datos_mercadolibre(datos: dict, caracteristicas_dict: dict):
+    """Campos derivados de las características (común a los parsers bs4 y lxml)."""
     datos['caracteristicas_texto'] = "\n".join([f"{k.capitalize()}: {v}" for k, v in caracteristicas_dict.items()])
     
     # NUEVO: Guardar el diccionario completo de características para metadata
@@ -70,57 +78,87 @@ def _parse_propiedad_html(soup: BeautifulSoup, url: str):
     return datos
 
 
+def descargar_detalle(url, api_key=None, use_scrapingbee=False) -> bytes:
+    """Descarga el HTML crudo de una página de detalle (lanza excepción si falla)."""
+    if use_scrapingbee and api_key:
+        params = {'api_key': api_key, 'url': url}
+        response = fetcher.fetch('https://app.scrapingbee.com/api/v1/', params=params, timeout=90, cache='detalle')
+    else:
+        response = fetcher.fetch(url, timeout=90, cache='detalle')
+    response.raise_for_status()
+    return response.content
+
+
+def parsear_detalle_mercadolibre(contenido: bytes, url: str):
+    """Parsea el HTML de un detalle de MercadoLibre. Función de módulo para poder usarse en pools de procesos."""
+    if ESTADO_EMBEBIDO_ML:
+        datos = estado_embebido.detalle_mercadolibre(contenido, url)
+        if datos is not None:
+            return datos
+    if PARSER_DETALLE == 'bs4':
+        return _parse_propiedad_html(BeautifulSoup(contenido, 'lxml'), url)
+    return _parse_propiedad_lxml(_arbol_lxml(contenido), url)
+
+
 def scrape_detalle_con_requests(url, api_key=None, use_scrapingbee=False):
     try:
-        if use_scrapingbee and api_key:
-            params = {'api_key': api_key, 'url': url}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, timeout=90)
-        else:
-            response = requests.get(url, headers=HEADERS, timeout=90)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'lxml')
-        return _parse_propiedad_html(soup, url)
+        contenido = descargar_detalle(url, api_key, use_scrapingbee)
+        return parsear_detalle_mercadolibre(contenido, url)
     except Exception:
         return None
 
 
+def parsear_listado_mercadolibre(html: str, url_target: str, estado=None):
+    """(set(URLs), {URL: título}) de una página de listado ya descargada.
+
+    `estado` permite pasar el `__PRELOADED_STATE__` ya decodificado (la primera
+    página lo usa también para el total).
+    """
+    if ESTADO_EMBEBIDO_ML:
+        desde_estado = estado_embebido.items_mercadolibre(html, estado=estado)
+        if desde_estado is not None:
+            print(f"  [Recolector] ÉXITO (estado JSON): Se encontraron {len(desde_estado[0])} URLs en {url_target}")
+            return desde_estado
+    soup = BeautifulSoup(html, 'lxml')
+    items = soup.find_all('li', class_='ui-search-layout__item')
+    if not items:
+        print(f"  [Recolector] ADVERTENCIA: No se encontraron items en {url_target}")
+        return set(), {}
+    urls_de_pagina = set()
+    titulos_por_url = {}
+    for item in items:
+        # Buscar el enlace del título de la publicación
+        link = item.find('a', class_='poly-component__title') or item.find('a', class_='ui-search-link')
+        if not link or not link.has_attr('href'):
+            continue
+        href = link['href'].split('#')[0]
+        titulo = (link.get_text(strip=True) or '').strip()
+        # Algunos layouts ponen el texto en el h2 contenedor
+        if not titulo:
+            h2 = item.find('h2', class_='poly-component__title-wrapper')
+            if h2:
+                titulo = h2.get_text(strip=True)
+        urls_de_pagina.add(href)
+        if titulo:
+            # Conservar el primer título visto para una URL
+            titulos_por_url.setdefault(href, titulo)
+    print(f"  [Recolector] ÉXITO: Se encontraron {len(urls_de_pagina)} URLs en {url_target}")
+    # Devolvemos (set(URLs), dict(URL->Título))
+    return urls_de_pagina, titulos_por_url
+
+
 def recolectar_urls_de_pagina(url_target, api_key=None, ubicacion=None, use_scrapingbee=False):
     print(f"  [Recolector] Iniciando recolección para: {url_target} (ScrapingBee: {'Sí' if use_scrapingbee else 'No'})")
     try:
         if use_scrapingbee and api_key:
             params = {'api_key': api_key, 'url': url_target}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, headers=HEADERS, timeout=60)
+            response = fetcher.fetch('https://app.scrapingbee.com/api/v1/', params=params, timeout=60, cache='listado')
         else:
-            response = requests.get(url_target, headers=HEADERS, timeout=60)
+            response = fetcher.fetch(url_target, timeout=60, cache='listado')
         if response.status_code >= 400:
             print(f"  [Recolector] ERROR: Status {response.status_code} para {url_target}")
             return set(), {}
-        soup = BeautifulSoup(response.text, 'lxml')
-        items = soup.find_all('li', class_='ui-search-layout__item')
-        if not items:
-            print(f"  [Recolector] ADVERTENCIA: No se encontraron items en {url_target}")
-            return set(), {}
-        urls_de_pagina = set()
-        titulos_por_url = {}
-        for item in items:
-            # Buscar el enlace del título de la publicación
-            link = item.find('a', class_='poly-component__title') or item.find('a', class_='ui-search-link')
-            if not link or not link.has_attr('href'):
-                continue
-            href = link['href'].split('#')[0]
-            titulo = (link.get_text(strip=True) or '').strip()
-            # Algunos layouts ponen el texto en el h2 contenedor
-            if not titulo:
-                h2 = item.find('h2', class_='poly-component__title-wrapper')
-                if h2:
-                    titulo = h2.get_text(strip=True)
-            urls_de_pagina.add(href)
-            if titulo:
-                # Conservar el primer título visto para una URL
-                titulos_por_url.setdefault(href, titulo)
-        print(f"  [Recolector] ÉXITO: Se encontraron {len(urls_de_pagina)} URLs en {url_target}")
-        # Devolvemos (set(URLs), dict(URL->Título))
-        return urls_de_pagina, titulos_por_url
+        return parsear_listado_mercadolibre(response.text, url_target)
     except Exception as e:
         print(f"  [Recolector] EXCEPCIÓN: Ocurrió un error procesando {url_target}: {e}")
         return set(), {}
@@ -143,36 +181,7 @@ def _parse_propiedad_infocasas_html(soup: BeautifulSoup, url: str):
     
     # Precio
     precio_elem = soup.select_one('p.main-price')
-    if precio_elem:
-        precio_texto = precio_elem.get_text(strip=True)
-        datos['precio_texto'] = precio_texto
-        
-        # Extraer moneda y valor
-        if 'U$S' in precio_texto:
-            datos['precio_moneda'] = 'USD'
-            match = re.search(r'U\$S\s*([\d,\.]+)', precio_texto)
-            if match:
-                try:
-                    valor_str = match.group(1).replace(',', '').replace('.', '')
-                    datos['precio_valor'] = int(valor_str)
-                except ValueError:
-                    datos['precio_valor'] = 0
-        elif '$' in precio_texto:
-            datos['precio_moneda'] = 'UYU'
-            match = re.search(r'\$\s*([\d,\.]+)', precio_texto)
-            if match:
-                try:
-                    valor_str = match.group(1).replace(',', '').replace('.', '')
-                    datos['precio_valor'] = int(valor_str)
-                except ValueError:
-                    datos['precio_valor'] = 0
-        else:
-            datos['precio_moneda'] = ""
-            datos['precio_valor'] = 0
-    else:
-        datos['precio_moneda'] = ""
-        datos['precio_valor'] = 0
-        datos['precio_texto'] = ""
+    _completar_precio_infocasas(datos, precio_elem.get_text(strip=True) if precio_elem else None)
     
     # Gastos comunes
     gc_elem = soup.select_one('span.commonExpenses')
@@ -218,6 +227,44 @@ def _parse_propiedad_infocasas_html(soup: BeautifulSoup, url: str):
         if texto and texto not in comodidades:
             comodidades.append(texto)
     
+    return _completar_datos_infocasas(datos, caracteristicas_dict, comodidades)
+
+
+def _completar_precio_infocasas(datos: dict, precio_texto):
+    """Moneda y valor a partir del texto de `p.main-price` (None si no está)."""
+    if precio_texto is not None:
+        datos['precio_texto'] = precio_texto
+        
+        # Extraer moneda y valor
+        if 'U$S' in precio_texto:
+            datos['precio_moneda'] = 'USD'
+            match = re.search(r'U\$S\s*([\d,\.]+)', precio_texto)
+            if match:
+                try:
+                    valor_str = match.group(1).replace(',', '').replace('.', '')
+                    datos['precio_valor'] = int(valor_str)
+                except ValueError:
+                    datos['precio_valor'] = 0
+        elif '$' in precio_texto:
+            datos['precio_moneda'] = 'UYU'
+            match = re.search(r'\$\s*([\d,\.]+)', precio_texto)
+            if match:
+                try:
+                    valor_str = match.group(1).replace(',', '').replace('.', '')
+                    datos['precio_valor'] = int(valor_str)
+                except ValueError:
+                    datos['precio_valor'] = 0
+        else:
+            datos['precio_moneda'] = ""
+            datos['precio_valor'] = 0
+    else:
+        datos['precio_moneda'] = ""
+        datos['precio_valor'] = 0
+        datos['precio_texto'] = ""
+
+
+def _completar_datos_infocasas(datos: dict, caracteristicas_dict: dict, comodidades: list):
+    """Campos derivados de la ficha técnica y comodidades (común a los parsers bs4 y lxml)."""
     if comodidades:
         caracteristicas_dict['comodidades'] = ', '.join(comodidades)
     
@@ -267,26 +314,227 @@ def _parse_propiedad_infocasas_html(soup: BeautifulSoup, url: str):
     return datos
 
 
+# ===== PARSER RÁPIDO (lxml + XPath) =====
+# Mismo resultado que los parsers BeautifulSoup de arriba (ver tests/unit/test_parser_lxml.py),
+# sin construir el árbol de BeautifulSoup: se parsea con lxml y se consultan sólo los nodos usados.
+# Las expresiones replican la semántica de bs4/soupsieve: clases por token y, en los selectores
+# CSS descendientes, ancestros en cualquier nivel del documento.
+
+def _clase(nombre: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {nombre} ')"
+
+
+# Texto como `Tag.text` de bs4: sin script/style/template/rt/rp
+_XP_TEXTO = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style or ancestor::template or ancestor::rt or ancestor::rp)]"
+)
+_PARSER_UTF8 = lxml_html.HTMLParser(encoding='utf-8')
+
+_XP_ML = {
+    'contenedor': etree.XPath(f"//div[{_clase('ui-pdp-container')}]"),
+    'titulo': etree.XPath(f"//h1[{_clase('ui-pdp-title')}]"),
+    'precio': etree.XPath(f"//div[{_clase('ui-pdp-price__main-container')}]"),
+    'moneda': etree.XPath(f".//span[{_clase('andes-money-amount__currency-symbol')}]"),
+    'fraccion': etree.XPath(f".//span[{_clase('andes-money-amount__fraction')}]"),
+    'figura': etree.XPath(f"//figure[{_clase('ui-pdp-gallery__figure')}]"),
+    'img': etree.XPath(".//img"),
+    'descripcion': etree.XPath(f"//p[{_clase('ui-pdp-description__content')}]"),
+    'filas': etree.XPath(f"//tr[{_clase('andes-table__row')}]"),
+    'th': etree.XPath(".//th"),
+    'td': etree.XPath(".//td"),
+    'specs': etree.XPath(f"//div[{_clase('ui-vpp-highlighted-specs__key-value')}]"),
+    'spans': etree.XPath(".//span"),
+}
+
+_XP_IC = {
+    'titulo': etree.XPath(f"//h1[{_clase('property-title')}]"),
+    'titulo_alt': etree.XPath(f"//h2[{_clase('lc-title')}]"),
+    'precio': etree.XPath(f"//p[{_clase('main-price')}]"),
+    'gastos_comunes': etree.XPath(f"//span[{_clase('commonExpenses')}]"),
+    'descripcion': etree.XPath(f"//div[{_clase('property-description')}]"),
+    'ubicacion': etree.XPath(f"//p[ancestor::span[{_clase('property-location-tag')}]]"),
+    'imagen': etree.XPath(f"//img[ancestor::div[{_clase('property-image')}]]"),
+    'imagen_alt': etree.XPath("//img[contains(@src, 'infocasas')]"),
+    'filas': etree.XPath(f"//div[{_clase('ant-row')}][ancestor::div[{_clase('technical-sheet')}]]"),
+    'clave': etree.XPath(f".//span[{_clase('ant-typography')}][ancestor::div[not(preceding-sibling::*)]]"),
+    'valor': etree.XPath(".//strong[ancestor::div[not(following-sibling::*)]]"),
+    'comodidades': etree.XPath(f"//span[{_clase('ant-typography')}][ancestor::div[{_clase('property-facilities')}]]"),
+}
+
+
+def _arbol_lxml(contenido):
+    if not contenido or not contenido.strip():
+        return lxml_html.document_fromstring('<html><body></body></html>')
+    if isinstance(contenido, bytes):
+        try:
+            contenido.decode('utf-8')
+            return lxml_html.document_fromstring(contenido, parser=_PARSER_UTF8)
+        except UnicodeDecodeError:
+            pass
+    return lxml_html.document_fromstring(contenido)
+
+
+def _primero(xpath, nodo):
+    encontrados = xpath(nodo)
+    return encontrados[0] if encontrados else None
+
+
+def _texto(nodo) -> str:
+    """Equivalente a `tag.text`."""
+    return ''.join(_XP_TEXTO(nodo))
+
+
+def _texto_strip(nodo) -> str:
+    """Equivalente a `tag.get_text(strip=True)`."""
+    return ''.join(t.strip() for t in _XP_TEXTO(nodo) if t.strip())
+
+
+def _parse_propiedad_lxml(raiz, url: str):
+    """Versión lxml de `_parse_propiedad_html`."""
+    if not _XP_ML['contenedor'](raiz):
+        return None
+    datos = {'url': url}
+    t = _primero(_XP_ML['titulo'], raiz)
+    datos['titulo'] = _texto(t).strip() if t is not None else "N/A"
+    pc = _primero(_XP_ML['precio'], raiz)
+    if pc is not None:
+        m = _primero(_XP_ML['moneda'], pc)
+        datos['precio_moneda'] = _texto(m).strip() if m is not None else ""
+        v = _primero(_XP_ML['fraccion'], pc)
+        valor_str = _texto(v).strip().replace('.', '') if v is not None else "0"
+        datos['precio_valor'] = int(re.sub(r'\D', '', valor_str))
+    fig = _primero(_XP_ML['figura'], raiz)
+    img_tag = _primero(_XP_ML['img'], fig) if fig is not None else None
+    datos['url_imagen'] = img_tag.get('src') if img_tag is not None and 'src' in img_tag.attrib else ""
+    d = _primero(_XP_ML['descripcion'], raiz)
+    datos['descripcion'] = _texto(d).strip() if d is not None else ""
+    caracteristicas_dict = {}
+    for row in _XP_ML['filas'](raiz):
+        th = _primero(_XP_ML['th'], row)
+        td = _primero(_XP_ML['td'], row)
+        if th is not None and td is not None:
+            caracteristicas_dict[_texto(th).strip().lower()] = _texto(td).strip()
+    for spec in _XP_ML['specs'](raiz):
+        spans = _XP_ML['spans'](spec)
+        if len(spans) == 2:
+            key = _texto(spans[0]).replace(':', '').strip().lower()
+            caracteristicas_dict[key] = _texto(spans[1]).strip()
+    return _completar_datos_mercadolibre(datos, caracteristicas_dict)
+
+
+def _parse_propiedad_infocasas_lxml(raiz, url: str):
+    """Versión lxml de `_parse_propiedad_infocasas_html`."""
+    datos = {'url': url, 'plataforma': 'InfoCasas'}
+    titulo_elem = _primero(_XP_IC['titulo'], raiz)
+    if titulo_elem is None:
+        titulo_elem = _primero(_XP_IC['titulo_alt'], raiz)
+    datos['titulo'] = _texto_strip(titulo_elem) if titulo_elem is not None else "N/A"
+
+    precio_elem = _primero(_XP_IC['precio'], raiz)
+    _completar_precio_infocasas(datos, _texto_strip(precio_elem) if precio_elem is not None else None)
+
+    gc_elem = _primero(_XP_IC['gastos_comunes'], raiz)
+    if gc_elem is not None:
+        datos['gastos_comunes'] = _texto_strip(gc_elem)
+
+    desc_elem = _primero(_XP_IC['descripcion'], raiz)
+    datos['descripcion'] = _texto_strip(desc_elem) if desc_elem is not None else ""
+
+    ubicacion_elem = _primero(_XP_IC['ubicacion'], raiz)
+    if ubicacion_elem is not None:
+        datos['ubicacion'] = _texto_strip(ubicacion_elem)
+
+    img_elem = _primero(_XP_IC['imagen'], raiz)
+    if img_elem is None:
+        img_elem = _primero(_XP_IC['imagen_alt'], raiz)
+    datos['url_imagen'] = img_elem.get('src') if img_elem is not None and img_elem.get('src') else ""
+
+    caracteristicas_dict = {}
+    for fila in _XP_IC['filas'](raiz):
+        clave_elem = _primero(_XP_IC['clave'], fila)
+        valor_elem = _primero(_XP_IC['valor'], fila)
+        if clave_elem is not None and valor_elem is not None:
+            clave = _texto_strip(clave_elem).replace('•', '').strip().lower()
+            caracteristicas_dict[clave] = _texto_strip(valor_elem)
+
+    comodidades = []
+    for elem in _XP_IC['comodidades'](raiz):
+        texto = _texto_strip(elem).replace('•', '').strip()
+        if texto and texto not in comodidades:
+            comodidades.append(texto)
+
+    return _completar_datos_infocasas(datos, caracteristicas_dict, comodidades)
+
+
+def parsear_detalle_infocasas(contenido: bytes, url: str):
+    """Parsea el HTML de un detalle de InfoCasas (equivalente a `parsear_detalle_mercadolibre`)."""
+    if PARSER_DETALLE == 'bs4':
+        return _parse_propiedad_infocasas_html(BeautifulSoup(contenido, 'lxml'), url)
+    return _parse_propiedad_infocasas_lxml(_arbol_lxml(contenido), url)
+
+
 def scrape_detalle_infocasas_con_requests(url, api_key=None, use_scrapingbee=False):
     """
     Extrae detalles de una propiedad de InfoCasas usando requests.
     """
     try:
-        if use_scrapingbee and api_key:
-            params = {'api_key': api_key, 'url': url}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, timeout=90)
-        else:
-            response = requests.get(url, headers=HEADERS, timeout=90)
-        
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'lxml')
-        return _parse_propiedad_infocasas_html(soup, url)
+        contenido = descargar_detalle(url, api_key, use_scrapingbee)
+        return parsear_detalle_infocasas(contenido, url)
     
     except Exception as e:
         print(f"❌ [EXTRACTOR IC] Error al extraer {url}: {e}")
         return None
 
 
+def parsear_listado_infocasas(html: str, url_target: str):
+    """(set(URLs), {URL: título}) de una página de listado de InfoCasas ya descargada."""
+    soup = BeautifulSoup(html, 'lxml')
+
+    # Selector específico de InfoCasas para contenedores de propiedades
+    contenedores = soup.select('div.lc-dataWrapper')
+
+    if not contenedores:
+        print(f"  [Recolector IC] ADVERTENCIA: No se encontraron contenedores en {url_target}")
+        return set(), {}
+
+    urls_de_pagina = set()
+    titulos_por_url = {}
+
+    for contenedor in contenedores:
+        # Buscar el enlace principal de la propiedad
+        enlace = contenedor.select_one('a.lc-data')
+        if not enlace or not enlace.get('href'):
+            continue
+
+        href = enlace.get('href')
+
+        # Construir URL completa
+        if href.startswith('/'):
+            url_completa = f"https://www.infocasas.com.uy{href}"
+        else:
+            url_completa = href
+
+        # Extraer título - Actualizado para usar la clase lc-title
+        titulo_elem = enlace.select_one('h2.lc-title')
+        if titulo_elem:
+            titulo = titulo_elem.get_text(strip=True)
+        else:
+            # Fallback: intentar h2 sin clase específica
+            titulo_elem = enlace.select_one('h2')
+            if titulo_elem:
+                titulo = titulo_elem.get_text(strip=True)
+            else:
+                # Fallback final: usar el texto del enlace principal
+                titulo = enlace.get_text(strip=True)[:100] if enlace.get_text(strip=True) else ""
+
+        urls_de_pagina.add(url_completa)
+        if titulo:
+            titulos_por_url.setdefault(url_completa, titulo)
+
+    print(f"  [Recolector IC] ÉXITO: Se encontraron {len(urls_de_pagina)} URLs en {url_target}")
+    return urls_de_pagina, titulos_por_url
+
+
 def recolectar_urls_infocasas_de_pagina(url_target, api_key=None, use_scrapingbee=False):
     """
     Recolecta URLs de propiedades de una página de listado de InfoCasas.
@@ -296,60 +544,16 @@ def recolectar_urls_infocasas_de_pagina(url_target, api_key=None, use_scrapingbe
     try:
         if use_scrapingbee and api_key:
             params = {'api_key': api_key, 'url': url_target}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, headers=HEADERS, timeout=60)
+            response = fetcher.fetch('https://app.scrapingbee.com/api/v1/', params=params, timeout=60, cache='listado')
         else:
-            response = requests.get(url_target, headers=HEADERS, timeout=60)
+            response = fetcher.fetch(url_target, timeout=60, cache='listado')
         
         if response.status_code >= 400:
             print(f"  [Recolector IC] ERROR: Status {response.status_code} para {url_target}")
             return set(), {}
         
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        # Selector específico de InfoCasas para contenedores de propiedades
-        contenedores = soup.select('div.lc-dataWrapper')
-        
-        if not contenedores:
-            print(f"  [Recolector IC] ADVERTENCIA: No se encontraron contenedores en {url_target}")
-            return set(), {}
-        
-        urls_de_pagina = set()
-        titulos_por_url = {}
-        
-        for contenedor in contenedores:
-            # Buscar el enlace principal de la propiedad
-            enlace = contenedor.select_one('a.lc-data')
-            if not enlace or not enlace.get('href'):
-                continue
-                
-            href = enlace.get('href')
-            
-            # Construir URL completa
-            if href.startswith('/'):
-                url_completa = f"https://www.infocasas.com.uy{href}"
-            else:
-                url_completa = href
-            
-            # Extraer título - Actualizado para usar la clase lc-title
-            titulo_elem = enlace.select_one('h2.lc-title')
-            if titulo_elem:
-                titulo = titulo_elem.get_text(strip=True)
-            else:
-                # Fallback: intentar h2 sin clase específica
-                titulo_elem = enlace.select_one('h2')
-                if titulo_elem:
-                    titulo = titulo_elem.get_text(strip=True)
-                else:
-                    # Fallback final: usar el texto del enlace principal
-                    titulo = enlace.get_text(strip=True)[:100] if enlace.get_text(strip=True) else ""
-            
-            urls_de_pagina.add(url_completa)
-            if titulo:
-                titulos_por_url.setdefault(url_completa, titulo)
-        
-        print(f"  [Recolector IC] ÉXITO: Se encontraron {len(urls_de_pagina)} URLs en {url_target}")
-        return urls_de_pagina, titulos_por_url
-    
+        return parsear_listado_infocasas(response.text, url_target)
+
     except Exception as e:
         print(f"  [Recolector IC] EXCEPCIÓN: Error procesando {url_target}: {e}")
         return set(), {}
@@ -0,0 +1,147 @@
+"""Motor asyncio de FASE 2: descarga y parseo concurrente de páginas de detalle.
+
+Flujo:
+    URLs -> [event loop] descarga (límite de requests en vuelo por host)
+         -> [pool de workers] parseo HTML -> cola de salida
+         -> hilo que llamó al motor (único escritor en BD)
+
+Las descargas siguen usando `requests` a través de `fetcher` (modo "requests
+directo" o ScrapingBee), ejecutadas en un pool de hilos desde el event loop.
+El motor nunca toca la base de datos: quien consume `resultados()` es el
+único que persiste, lo que evita pelear por el lock de escritura de SQLite.
+
+Uso típico:
+    motor = MotorFase2(max_por_host=6)
+    for url, datos in motor.ejecutar(urls):
+        ...  # datos es el dict del parser o None si falló
+
+Con `salida=<queue.Queue>` los resultados (y el marcador `FIN` al cerrar) van a
+una cola externa, para que el llamador la comparta con otros productores
+(ver `pipeline.PipelineStreaming`).
+"""
+import asyncio
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urlparse
+
+from .constants import FASE2_MAX_POR_HOST, FASE2_WORKERS_PARSEO, FASE2_PARSEO_EN_PROCESOS
+from .extractors import descargar_detalle, parsear_detalle_mercadolibre
+
+
+# Marcador que el motor pone en la cola de salida cuando termina
+FIN = object()
+_HOST_SCRAPINGBEE = 'app.scrapingbee.com'
+
+
+class MotorFase2:
+    def __init__(self, max_por_host=None, workers_parseo=None, parser=None,
+                 api_key=None, use_scrapingbee=False, parseo_en_procesos=None, salida=None):
+        self.max_por_host = max(1, int(max_por_host or FASE2_MAX_POR_HOST))
+        self.workers_parseo = max(1, int(workers_parseo or FASE2_WORKERS_PARSEO))
+        self.parser = parser or parsear_detalle_mercadolibre
+        self.api_key = api_key
+        self.use_scrapingbee = bool(use_scrapingbee and api_key)
+        self.parseo_en_procesos = FASE2_PARSEO_EN_PROCESOS if parseo_en_procesos is None else parseo_en_procesos
+
+        self._salida = salida if salida is not None else queue.Queue()
+        self._loop = None
+        self._entrada = None
+        self._hilo = None
+        self._listo = threading.Event()
+        self.enviadas = 0
+        self.completadas = 0
+        self.fallidas = 0
+        self.segundos = 0.0
+
+    # ---- API para el hilo llamador ----
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=lambda: asyncio.run(self._principal()), name='fase2-motor', daemon=True)
+        self._hilo.start()
+        self._listo.wait()
+        return self
+
+    def enviar(self, url):
+        """Encola una URL para descargar (thread-safe)."""
+        self.enviadas += 1
+        self._loop.call_soon_threadsafe(self._entrada.put_nowait, url)
+
+    def cerrar(self):
+        """Indica que no llegarán más URLs; el motor termina al vaciar lo pendiente."""
+        self._loop.call_soon_threadsafe(self._entrada.put_nowait, FIN)
+
+    def resultados(self):
+        """Generador de (url, datos) en orden de finalización."""
+        while True:
+            item = self._salida.get()
+            if item is FIN:
+                break
+            yield item
+        self.esperar()
+
+    def esperar(self):
+        """Espera a que el event loop termine (después de que salió `FIN`)."""
+        if self._hilo:
+            self._hilo.join()
+
+    def ejecutar(self, urls):
+        self.iniciar()
+        for url in urls:
+            self.enviar(url)
+        self.cerrar()
+        return self.resultados()
+
+    # ---- Event loop ----
+
+    def _clave_host(self, url):
+        if self.use_scrapingbee:
+            return _HOST_SCRAPINGBEE
+        return (urlparse(url).netloc or '').lower()
+
+    async def _principal(self):
+        self._loop = asyncio.get_running_loop()
+        self._entrada = asyncio.Queue()
+        # Un hilo por request en vuelo; el límite real lo imponen los semáforos por host
+        pool_red = ThreadPoolExecutor(max_workers=min(64, self.max_por_host * 4), thread_name_prefix='fase2-red')
+        if self.parseo_en_procesos:
+            pool_parseo = ProcessPoolExecutor(max_workers=self.workers_parseo)
+        else:
+            pool_parseo = ThreadPoolExecutor(max_workers=self.workers_parseo, thread_name_prefix='fase2-parseo')
+        semaforos = defaultdict(lambda: asyncio.Semaphore(self.max_por_host))
+        tareas = set()
+        inicio = time.perf_counter()
+        self._listo.set()
+        try:
+            while True:
+                url = await self._entrada.get()
+                if url is FIN:
+                    break
+                tarea = asyncio.create_task(self._procesar(url, semaforos[self._clave_host(url)], pool_red, pool_parseo))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        finally:
+            pool_red.shutdown(wait=False)
+            pool_parseo.shutdown(wait=False)
+            self.segundos = time.perf_counter() - inicio
+            print(f"⚡ [FASE2] {self.completadas} detalles en {self.segundos:.1f}s "
+                  f"({self.fallidas} fallidos, máx {self.max_por_host} en vuelo por host)")
+            self._salida.put(FIN)
+
+    async def _procesar(self, url, semaforo, pool_red, pool_parseo):
+        datos = None
+        try:
+            async with semaforo:
+                contenido = await self._loop.run_in_executor(pool_red, descargar_detalle, url, self.api_key, self.use_scrapingbee)
+            datos = await self._loop.run_in_executor(pool_parseo, self.parser, contenido, url)
+        except Exception as e:
+            print(f"⚠️ [FASE2] Error descargando/parseando {url}: {e}")
+        if datos:
+            self.completadas += 1
+        else:
+            self.fallidas += 1
+        self._salida.put((url, datos))
@@ -0,0 +1,207 @@
+"""Cliente HTTP compartido por todos los extractores.
+
+Mantiene una `requests.Session` por host con su propio pool de conexiones
+keep-alive, de modo que las cientos de descargas de detalle de una corrida
+reutilizan la conexión TCP/TLS en lugar de negociarla en cada request.
+Las sesiones se comparten entre hilos: el pool de urllib3 es thread-safe y la
+creación de sesiones está protegida por un lock.
+
+Además registra tiempo y bytes por request, acumulados por host, para poder
+medir cuánto pesa la red en cada fase (ver `get_stats` / `resumen_stats`).
+
+Cada request pasa por el rate limiter por host (`rate_limit.py`), que se frena
+solo ante 429/403/captcha y vuelve a acelerar cuando el sitio responde bien.
+
+Con `cache='listado'|'detalle'` la respuesta se sirve/guarda en la caché HTTP en
+disco (`cache.py`): dentro del TTL no se toca la red y después se revalida con
+ETag/Last-Modified, de modo que una página sin cambios cuesta un 304.
+
+La request en sí la hace `transporte.get`, que según `SCRAPER_TRANSPORTE` va a
+la red, graba un corpus o lo reproduce sin red (benchmarks offline). En
+record/replay no se usa la caché HTTP, y en replay tampoco el rate limiter.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from . import cache as http_cache
+from . import rate_limit
+from . import transporte
+from .constants import HEADERS, FETCH_POOL_CONNECTIONS, FETCH_POOL_MAXSIZE
+
+
+_sesiones = {}
+_sesiones_lock = threading.Lock()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _host_de(url: str) -> str:
+    try:
+        return (urlparse(url).netloc or '').lower()
+    except Exception:
+        return ''
+
+
+def get_session(host: str) -> requests.Session:
+    """Devuelve (creándola si hace falta) la sesión keep-alive de un host."""
+    sesion = _sesiones.get(host)
+    if sesion is not None:
+        return sesion
+    with _sesiones_lock:
+        sesion = _sesiones.get(host)
+        if sesion is None:
+            sesion = requests.Session()
+            sesion.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=FETCH_POOL_CONNECTIONS, pool_maxsize=FETCH_POOL_MAXSIZE)
+            sesion.mount('https://', adapter)
+            sesion.mount('http://', adapter)
+            _sesiones[host] = sesion
+    return sesion
+
+
+def _registrar(host: str, segundos: float, num_bytes: int, error: bool = False):
+    with _stats_lock:
+        s = _nuevas_stats(host)
+        s['requests'] += 1
+        s['bytes'] += num_bytes
+        s['segundos'] += segundos
+        if error:
+            s['errores'] += 1
+
+
+def _nuevas_stats(host: str) -> dict:
+    return _stats.setdefault(host, {
+        'requests': 0, 'bytes': 0, 'segundos': 0.0, 'errores': 0, 'cache_hits': 0, 'revalidadas': 0,
+    })
+
+
+def _registrar_cache(host: str, evento: str):
+    with _stats_lock:
+        _nuevas_stats(host)[evento] += 1
+
+
+def _respuesta_desde_cache(url: str, entrada: dict, status_original: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = entrada['contenido']
+    response.headers = CaseInsensitiveDict()
+    if entrada.get('content_type'):
+        response.headers['Content-Type'] = entrada['content_type']
+    response.fetch_segundos = 0.0
+    response.fetch_bytes = 0
+    response.desde_cache = True
+    response.status_original = status_original
+    return response
+
+
+def fetch(url, params=None, headers=None, timeout=60, allow_redirects=True, cache=None):
+    """GET a través del pool del host de `url`.
+
+    Los `headers` recibidos se combinan con `HEADERS` de `constants.py`.
+    La respuesta se devuelve tal cual (no se llama a `raise_for_status`) con
+    dos atributos extra: `fetch_segundos` y `fetch_bytes`.
+    Las excepciones de red se propagan igual que con `requests.get`.
+
+    `cache`: None (sin caché), 'listado' o 'detalle' (define el TTL). Las
+    respuestas servidas desde la caché traen `desde_cache = True`.
+    """
+    host = _host_de(url)
+    modo_transporte = transporte.modo()
+    if modo_transporte != 'live':
+        cache = None
+    entrada = None
+    if cache:
+        try:
+            entrada = http_cache.obtener(url, params)
+        except Exception as e:
+            print(f"⚠️ [CACHE] No se pudo leer la caché: {e}")
+        if entrada and entrada['fresca']:
+            _registrar_cache(host, 'cache_hits')
+            return _respuesta_desde_cache(url, entrada)
+        if entrada and (entrada['etag'] or entrada['last_modified']):
+            headers = dict(headers or {})
+            if entrada['etag']:
+                headers['If-None-Match'] = entrada['etag']
+            if entrada['last_modified']:
+                headers['If-Modified-Since'] = entrada['last_modified']
+
+    sesion = get_session(host)
+    if modo_transporte != 'replay':
+        rate_limit.esperar_turno(host)
+    inicio = time.perf_counter()
+    try:
+        response = transporte.get(sesion, url, params=params, headers=headers, timeout=timeout, allow_redirects=allow_redirects)
+    except Exception:
+        _registrar(host, time.perf_counter() - inicio, 0, error=True)
+        raise
+    # Acceder a .content fuerza la lectura completa del cuerpo (y libera la conexión al pool)
+    num_bytes = len(response.content or b'')
+    segundos = time.perf_counter() - inicio
+    _registrar(host, segundos, num_bytes, error=response.status_code >= 400)
+    if modo_transporte != 'replay':
+        rate_limit.registrar_respuesta(host, response.status_code, response.content,
+                                       retry_after=response.headers.get('Retry-After'))
+
+    if cache:
+        try:
+            if response.status_code == 304 and entrada:
+                http_cache.renovar(entrada['clave'])
+                _registrar_cache(host, 'revalidadas')
+                revalidada = _respuesta_desde_cache(url, entrada, status_original=304)
+                revalidada.fetch_segundos = segundos
+                return revalidada
+            if response.status_code == 200 and response.content and not rate_limit.es_bloqueo(200, response.content):
+                http_cache.guardar(url, params, cache, response.content, response.headers)
+        except Exception as e:
+            print(f"⚠️ [CACHE] No se pudo actualizar la caché: {e}")
+
+    response.fetch_segundos = segundos
+    response.fetch_bytes = num_bytes
+    return response
+
+
+def get_stats() -> dict:
+    """Copia de las métricas acumuladas por host."""
+    with _stats_lock:
+        return {host: dict(s) for host, s in _stats.items()}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def resumen_stats() -> str:
+    """Texto de una línea por host, pensado para los logs del scraper."""
+    lineas = []
+    tasas = rate_limit.estado()
+    for host, s in sorted(get_stats().items()):
+        promedio = (s['segundos'] / s['requests']) if s['requests'] else 0.0
+        linea = (
+            f"{host}: {s['requests']} req | {s['bytes'] / 1024:.0f} KB | "
+            f"{s['segundos']:.1f}s total | {promedio:.2f}s/req | {s['errores']} errores"
+        )
+        if s.get('cache_hits') or s.get('revalidadas'):
+            linea += f" | caché: {s['cache_hits']} hits, {s['revalidadas']} 304"
+        if host in tasas:
+            linea += f" | {tasas[host]['rps']:.2f} req/s ({tasas[host]['bloqueos']} bloqueos)"
+        lineas.append(linea)
+    return '\n'.join(lineas)
+
+
+def cerrar_sesiones():
+    """Cierra todas las sesiones abiertas (útil en tests o al apagar el proceso)."""
+    with _sesiones_lock:
+        for sesion in _sesiones.values():
+            try:
+                sesion.close()
+            except Exception:
+                pass
+        _sesiones.clear()
@@ -1,14 +1,83 @@
 import time
 import re
-import requests
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from typing import List, Dict, Any
 from .browser import iniciar_driver, cargar_cookies
 from .progress import tomar_captura_debug, send_progress_update
 from .url_builder import build_infocasas_url
-from .utils import extraer_variantes_keywords, build_keyword_groups, stemming_basico
-from .constants import HEADERS
+from .utils import extraer_variantes_keywords, build_keyword_groups
+from .matcher import matcher_para_grupos
+from . import fetcher
+from .extractors import parsear_listado_infocasas
+
+
+def _total_desde_texto_infocasas(total_text):
+    """Número de "Mostrando 1 - 21 de 54 resultados" (int) o "más de N" (str); None si no aparece."""
+    # Ejemplo: "Mostrando 1 - 21 de 54 resultados" -> 54
+    # Ejemplo: "Mostrando1 - 21demás de 400resultados" -> "más de 400" (sin espacios)
+    # Manejar tanto con espacios como sin espacios
+    match = re.search(r'de\s*(más\s*de\s*\d+|\d+(?:\.\d+)*)\s*resultado', total_text)
+    if match:
+        numero_str = match.group(1)
+        if 'más' in numero_str and 'de' in numero_str:
+            # Extraer el número base cuando dice "más de X"
+            numero_match = re.search(r'más\s*de\s*(\d+)', numero_str)
+            if numero_match:
+                return f"más de {numero_match.group(1)}"
+        else:
+            # Limpiar puntos de separación de miles
+            numero_limpio = numero_str.replace('.', '')
+            try:
+                return int(numero_limpio)
+            except ValueError:
+                pass
+    return None
+
+
+def _total_desde_html_infocasas(soup):
+    # Selector específico de InfoCasas para cantidad de resultados
+    selector = 'div.search-result-display'
+    el = soup.select_one(selector)
+    if not el:
+        print(f"❌ [TOTAL IC] No se encontró el selector '{selector}'")
+        return None
+    total_text = el.get_text(strip=True)
+    print(f"✅ [TOTAL IC] Texto encontrado: '{total_text}'")
+    total = _total_desde_texto_infocasas(total_text)
+    if total is None:
+        print(f"❌ [TOTAL IC] No se pudo extraer número de: '{total_text}'")
+    return total
+
+
+def _descargar_listado_infocasas(url_base_con_filtros, api_key=None, use_scrapingbee=False):
+    print(f"📡 [TOTAL IC] Solicitando: {url_base_con_filtros}")
+    if use_scrapingbee and api_key:
+        params = {'api_key': api_key, 'url': url_base_con_filtros}
+        return fetcher.fetch('https://app.scrapingbee.com/api/v1/', params=params, timeout=60, cache='listado')
+    return fetcher.fetch(url_base_con_filtros, timeout=60, cache='listado')
+
+
+def primera_pagina_infocasas(url_base_con_filtros, api_key=None, use_scrapingbee=False):
+    """Descarga UNA vez la primera página y devuelve (total, set(URLs), {URL: título}).
+
+    Igual que `primera_pagina_mercadolibre`: el total y la página 1 de FASE 1 salen
+    del mismo HTML. Sin conexión devuelve (None, set(), {}); con un status de error
+    se intenta el total con Selenium.
+    """
+    print(f"🔍 [PRIMERA PÁGINA IC] {url_base_con_filtros}")
+    try:
+        response = _descargar_listado_infocasas(url_base_con_filtros, api_key, use_scrapingbee)
+    except Exception as e:
+        print(f"❌ [CONECTIVIDAD] No se puede acceder a InfoCasas: {e}")
+        return None, set(), {}
+    if response.status_code != 200:
+        print(f"❌ [REQUESTS] Status: {response.status_code}")
+        return _total_infocasas_selenium(url_base_con_filtros), set(), {}
+    soup = BeautifulSoup(response.text, 'lxml')
+    total = _total_desde_html_infocasas(soup)
+    urls, titulos = parsear_listado_infocasas(response.text, url_base_con_filtros)
+    return total, urls, titulos
 
 
 def extraer_total_resultados_infocasas(url_base_con_filtros, api_key=None, use_scrapingbee=False):
@@ -16,69 +85,20 @@ def extraer_total_resultados_infocasas(url_base_con_filtros, api_key=None, use_s
     Extrae el total de resultados de InfoCasas desde la página de búsqueda.
     """
     print(f"🔍 [TOTAL IC] Iniciando extracción para URL: {url_base_con_filtros}")
-    
     try:
-        print("🌐 [CONECTIVIDAD] Probando acceso básico a InfoCasas...")
-        test_response = requests.get("https://www.infocasas.com.uy/", headers=HEADERS, timeout=10)
-        print(f"✅ [CONECTIVIDAD] InfoCasas accesible - Status: {test_response.status_code}")
+        print(f"🌐 [TOTAL IC] Intentando con {'ScrapingBee' if (use_scrapingbee and api_key) else 'requests'} primero...")
+        response = _descargar_listado_infocasas(url_base_con_filtros, api_key, use_scrapingbee)
     except Exception as e:
+        # Sin red no tiene sentido levantar Chrome
         print(f"❌ [CONECTIVIDAD] No se puede acceder a InfoCasas: {e}")
         return None
-    
-    try:
-        print(f"🌐 [TOTAL IC] Intentando con {'ScrapingBee' if (use_scrapingbee and api_key) else 'requests'} primero...")
-        print(f"📡 [TOTAL IC] Solicitando: {url_base_con_filtros}")
-        
-        if use_scrapingbee and api_key:
-            params = {'api_key': api_key, 'url': url_base_con_filtros}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, headers=HEADERS, timeout=60)
-        else:
-            response = requests.get(url_base_con_filtros, headers=HEADERS, timeout=60)
-        
-        if response.status_code != 200:
-            print(f"❌ [REQUESTS] Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            html_content = response.text
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Selector específico de InfoCasas para cantidad de resultados
-            selector = 'div.search-result-display'
-            el = soup.select_one(selector)
-            
-            if el:
-                total_text = el.get_text(strip=True)
-                print(f"✅ [TOTAL IC] Texto encontrado: '{total_text}'")
-                
-                # Extraer número del texto
-                # Ejemplo: "Mostrando 1 - 21 de 54 resultados" -> 54
-                # Ejemplo: "Mostrando1 - 21demás de 400resultados" -> "más de 400" (sin espacios)
-                # Manejar tanto con espacios como sin espacios
-                match = re.search(r'de\s*(más\s*de\s*\d+|\d+(?:\.\d+)*)\s*resultado', total_text)
-                if match:
-                    numero_str = match.group(1)
-                    if 'más' in numero_str and 'de' in numero_str:
-                        # Extraer el número base cuando dice "más de X"
-                        numero_match = re.search(r'más\s*de\s*(\d+)', numero_str)
-                        if numero_match:
-                            return f"más de {numero_match.group(1)}"
-                    else:
-                        # Limpiar puntos de separación de miles
-                        numero_limpio = numero_str.replace('.', '')
-                        try:
-                            return int(numero_limpio)
-                        except ValueError:
-                            pass
-                
-                print(f"❌ [TOTAL IC] No se pudo extraer número de: '{total_text}'")
-                return None
-            
-            print(f"❌ [TOTAL IC] No se encontró el selector '{selector}'")
-            return None
-    
-    except Exception as e:
-        print(f"❌ [REQUESTS] Error al extraer total: {e}")
-    
+    if response.status_code == 200:
+        return _total_desde_html_infocasas(BeautifulSoup(response.text, 'lxml'))
+    print(f"❌ [REQUESTS] Status: {response.status_code}")
+    return _total_infocasas_selenium(url_base_con_filtros)
+
+
+def _total_infocasas_selenium(url_base_con_filtros):
     # Fallback con Selenium
     print("🔄 [TOTAL IC] Fallback: intentando con Selenium...")
     driver = None
@@ -92,20 +112,7 @@ def extraer_total_resultados_infocasas(url_base_con_filtros, api_key=None, use_s
             element = driver.find_element(By.CSS_SELECTOR, 'div.search-result-display')
             total_text = element.text.strip()
             print(f"✅ [SELENIUM IC] Texto encontrado: '{total_text}'")
-            
-            match = re.search(r'de\s*(más\s*de\s*\d+|\d+(?:\.\d+)*)\s*resultado', total_text)
-            if match:
-                numero_str = match.group(1)
-                if 'más' in numero_str and 'de' in numero_str:
-                    numero_match = re.search(r'más\s*de\s*(\d+)', numero_str)
-                    if numero_match:
-                        return f"más de {numero_match.group(1)}"
-                else:
-                    numero_limpio = numero_str.replace('.', '')
-                    try:
-                        return int(numero_limpio)
-                    except ValueError:
-                        pass
+            return _total_desde_texto_infocasas(total_text)
         
         except Exception as e:
             print(f"❌ [SELENIUM IC] No se encontró elemento de resultados: {e}")
@@ -121,8 +128,6 @@ def extraer_total_resultados_infocasas(url_base_con_filtros, api_key=None, use_s
                 driver.quit()
             except:
                 pass
-    
-    return None
 
 
 def scrape_infocasas(filtros, keywords=None, max_paginas=3, workers_fase1=1, workers_fase2=1, use_scrapingbee=False, api_key=None):
@@ -183,8 +188,7 @@ def scrape_infocasas(filtros, keywords=None, max_paginas=3, workers_fase1=1, wor
         urls_propiedades.extend(urls_pagina)
         print(f"✅ [INFOCASAS] Página {pagina_actual}: {len(urls_pagina)} URLs encontradas")
         
-        pagina_actual += 1
-        time.sleep(1)  # Pausa entre páginas
+        pagina_actual += 1  # el ritmo entre páginas lo impone el rate limiter del fetcher
     
     print(f"📋 [INFOCASAS] Total URLs recolectadas: {len(urls_propiedades)}")
     
@@ -225,8 +229,6 @@ def scrape_infocasas(filtros, keywords=None, max_paginas=3, workers_fase1=1, wor
                     else:
                         print(f"❌ [INFOCASAS] Propiedad no cumple keywords: {detalle.get('titulo', 'Sin título')}")
                 
-                time.sleep(0.5)  # Pausa entre requests
-                
             except Exception as e:
                 print(f"❌ [INFOCASAS] Error al extraer detalles de {url}: {e}")
                 continue
@@ -251,9 +253,9 @@ def extraer_urls_propiedades_infocasas(url_pagina, use_scrapingbee=False, api_ke
     try:
         if use_scrapingbee and api_key:
             params = {'api_key': api_key, 'url': url_pagina}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, headers=HEADERS, timeout=60)
+            response = fetcher.fetch('https://app.scrapingbee.com/api/v1/', params=params, timeout=60, cache='listado')
         else:
-            response = requests.get(url_pagina, headers=HEADERS, timeout=60)
+            response = fetcher.fetch(url_pagina, timeout=60, cache='listado')
         
         if response.status_code != 200:
             print(f"❌ [URLS IC] Status: {response.status_code}")
@@ -292,9 +294,9 @@ def extraer_detalle_propiedad_infocasas(url_propiedad, use_scrapingbee=False, ap
     try:
         if use_scrapingbee and api_key:
             params = {'api_key': api_key, 'url': url_propiedad}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, headers=HEADERS, timeout=60)
+            response = fetcher.fetch('https://app.scrapingbee.com/api/v1/', params=params, timeout=60, cache='detalle')
         else:
-            response = requests.get(url_propiedad, headers=HEADERS, timeout=60)
+            response = fetcher.fetch(url_propiedad, timeout=60, cache='detalle')
         
         if response.status_code != 200:
             print(f"❌ [DETALLE IC] Status {response.status_code} para {url_propiedad}")
@@ -401,22 +403,7 @@ def verificar_keywords_en_contenido_infocasas(detalle, keyword_groups):
     caracteristicas = ' '.join([f"{k} {v}" for k, v in detalle.get('caracteristicas', {}).items()])
     comodidades = ' '.join(detalle.get('comodidades', []))
     
-    texto_completo = f"{titulo} {descripcion} {ubicacion} {caracteristicas} {comodidades}".lower()
-    
-    # Verificar cada grupo de keywords
-    for grupo in keyword_groups:
-        grupo_encontrado = False
-        for keyword in grupo:
-            if keyword.lower() in texto_completo:
-                grupo_encontrado = True
-                break
-            # También verificar con stemming
-            keyword_stem = stemming_basico(keyword.lower())
-            if keyword_stem and keyword_stem in texto_completo:
-                grupo_encontrado = True
-                break
-        
-        if not grupo_encontrado:
-            return False
+    texto_completo = f"{titulo} {descripcion} {ubicacion} {caracteristicas} {comodidades}"
     
-    return True
\ No newline at end of file
+    # AND entre grupos; OR entre variantes (exacta o con stemming)
+    return matcher_para_grupos(keyword_groups, truncar=False).coincide(texto_completo)
\ No newline at end of file
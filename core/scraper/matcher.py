@@ -0,0 +1,159 @@
+"""Matcher de keywords compilado (Aho-Corasick).
+
+Los grupos de `build_keyword_groups` (OR entre las variantes de un grupo, AND
+entre grupos) se compilan una sola vez en un autómata con todos los patrones de
+todas las variantes:
+
+    variante normalizada        "terrazas"
+    raíz de stemming_basico     "terraz"    (stemming=True)
+    raíz aproximada v[:-2]      "terraz"    (truncar=True, sólo si len(v) > 4)
+
+`evaluar` recorre el texto normalizado UNA vez y devuelve, por grupo, la
+primera variante (en el orden del grupo) que aparece, o None. El costo depende
+del largo del texto, no de cuántas keywords/sinónimos haya.
+
+Con `difuso` (umbral de trigramas, uno para todos o uno por grupo) los grupos
+sin coincidencia exacta se prueban además por similitud de trigramas contra las
+palabras del texto (ver trigramas.py). `matcher_para_grupos` lo usa en lugar de
+la raíz `v[:-2]` cuando MATCH_DIFUSO == 'trigramas'.
+
+Los matchers son inmutables y se comparten entre hilos; `matcher_para_grupos`
+los cachea por contenido de los grupos, así una búsqueda compila el suyo una
+vez aunque se evalúen cientos de propiedades.
+"""
+from collections import deque
+from functools import lru_cache
+
+from .constants import MATCH_DIFUSO, UMBRAL_TRIGRAMAS
+from .trigramas import variante_similar_en
+from .utils import normalizar_texto, stemming_basico
+
+
+class MatcherKeywords:
+    """Autómata Aho-Corasick sobre las variantes de uno o más grupos de keywords."""
+
+    def __init__(self, keyword_groups, stemming=True, truncar=True, difuso=None):
+        self.grupos = [list(grupo) for grupo in keyword_groups or []]
+        self.stemming = stemming
+        self.truncar = truncar
+        if difuso is None or isinstance(difuso, (int, float)):
+            self.umbrales = [difuso] * len(self.grupos)
+        else:
+            self.umbrales = list(difuso)
+
+        ids_patron = {}
+        # Por grupo: [(variante original, frozenset(ids de sus patrones)), ...]
+        self._variantes = []
+        for grupo in self.grupos:
+            variantes = []
+            for variante in grupo:
+                ids = set()
+                for patron in self._patrones_de(variante):
+                    ids.add(ids_patron.setdefault(patron, len(ids_patron)))
+                variantes.append((variante, frozenset(ids)))
+            self._variantes.append(variantes)
+        self._total_patrones = len(ids_patron)
+        self._construir(ids_patron)
+
+    def _patrones_de(self, variante):
+        v = normalizar_texto(str(variante))
+        if not v:
+            return set()
+        patrones = {v}
+        if self.stemming:
+            v_stem = stemming_basico(v)
+            if v_stem:
+                patrones.add(v_stem)
+        if self.truncar and len(v) > 4:
+            patrones.add(v[:-2])
+        return patrones
+
+    def _construir(self, ids_patron):
+        goto = [{}]
+        salida = [set()]
+        for patron, pid in ids_patron.items():
+            estado = 0
+            for c in patron:
+                siguiente = goto[estado].get(c)
+                if siguiente is None:
+                    siguiente = len(goto)
+                    goto.append({})
+                    salida.append(set())
+                    goto[estado][c] = siguiente
+                estado = siguiente
+            salida[estado].add(pid)
+
+        fallo = [0] * len(goto)
+        cola = deque(goto[0].values())
+        while cola:
+            r = cola.popleft()
+            for c, s in goto[r].items():
+                cola.append(s)
+                f = fallo[r]
+                while f and c not in goto[f]:
+                    f = fallo[f]
+                fallo[s] = goto[f].get(c, 0)
+                salida[s] |= salida[fallo[s]]
+
+        self._goto = goto
+        self._fallo = fallo
+        self._salida = [frozenset(ids) if ids else None for ids in salida]
+
+    def patrones_en(self, texto_normalizado: str) -> set:
+        """Ids de todos los patrones que aparecen en el texto (ya normalizado)."""
+        goto, fallo, salida = self._goto, self._fallo, self._salida
+        total = self._total_patrones
+        encontrados = set()
+        estado = 0
+        for c in texto_normalizado:
+            while estado and c not in goto[estado]:
+                estado = fallo[estado]
+            estado = goto[estado].get(c, 0)
+            if salida[estado] is not None:
+                encontrados |= salida[estado]
+                if len(encontrados) == total:
+                    break
+        return encontrados
+
+    def evaluar(self, texto: str, normalizado: bool = False) -> list:
+        """Por grupo, la primera variante encontrada en el texto (o None)."""
+        if not self._variantes:
+            return []
+        texto_norm = texto if normalizado else normalizar_texto(texto)
+        encontrados = self.patrones_en(texto_norm)
+        resultado = [
+            next((variante for variante, ids in variantes if not ids.isdisjoint(encontrados)), None)
+            for variantes in self._variantes
+        ]
+        tokens = None
+        for i, umbral in enumerate(self.umbrales):
+            if resultado[i] is None and umbral:
+                if tokens is None:
+                    tokens = set(texto_norm.split())
+                resultado[i] = next(
+                    (v for v in self.grupos[i] if variante_similar_en(normalizar_texto(str(v)), tokens, umbral)),
+                    None
+                )
+        return resultado
+
+    def coincide(self, texto: str, normalizado: bool = False) -> bool:
+        """AND entre grupos, OR dentro de cada grupo. Sin grupos, siempre coincide."""
+        return all(variante is not None for variante in self.evaluar(texto, normalizado))
+
+
+@lru_cache(maxsize=64)
+def _compilar(grupos, stemming, truncar, difuso):
+    return MatcherKeywords(grupos, stemming=stemming, truncar=truncar, difuso=difuso)
+
+
+def matcher_para_grupos(keyword_groups, stemming=True, truncar=True, umbrales=None) -> MatcherKeywords:
+    """Matcher compilado para estos grupos (cacheado: se compila una vez por búsqueda).
+
+    `truncar` pide el matching aproximado: trigramas (umbral UMBRAL_TRIGRAMAS, o `umbrales`
+    por grupo) o la raíz `v[:-2]`, según MATCH_DIFUSO.
+    """
+    grupos = tuple(tuple(str(v) for v in grupo) for grupo in keyword_groups or [])
+    if truncar and MATCH_DIFUSO == 'trigramas':
+        difuso = tuple(umbrales) if umbrales is not None else UMBRAL_TRIGRAMAS
+        return _compilar(grupos, stemming, False, difuso)
+    return _compilar(grupos, stemming, truncar, None)
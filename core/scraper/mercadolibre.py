@@ -1,91 +1,135 @@
 import time
 import re
-import requests
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from typing import List, Dict, Any
 from .browser import iniciar_driver, cargar_cookies
 from .progress import tomar_captura_debug, send_progress_update
 from .url_builder import build_mercadolibre_url
-from .utils import extraer_variantes_keywords, build_keyword_groups, stemming_basico
-from .constants import HEADERS
+from .utils import extraer_variantes_keywords, build_keyword_groups
+from .matcher import matcher_para_grupos
+from . import fetcher
+from . import estado_embebido
+from .extractors import parsear_listado_mercadolibre
+from .constants import CAPTCHA_INDICATORS, ESTADO_EMBEBIDO_ML
+
+
+def _url_primera_pagina(url_base_con_filtros):
+    if '_NoIndex_True' in url_base_con_filtros:
+        return url_base_con_filtros
+    return f"{url_base_con_filtros}_NoIndex_True"
+
+
+def _descargar_listado(url_pagina, api_key=None, use_scrapingbee=False):
+    """GET de una página de listado. Lanza `requests.RequestException` si no hay red."""
+    print(f"📡 [TOTAL ML] Solicitando: {url_pagina}")
+    if use_scrapingbee and api_key:
+        params = {'api_key': api_key, 'url': url_pagina}
+        return fetcher.fetch('https://app.scrapingbee.com/api/v1/', params=params, timeout=60, cache='listado')
+    return fetcher.fetch(url_pagina, timeout=60, cache='listado')
+
+
+def _total_desde_html(html_content, estado=None):
+    """Total de publicaciones de un listado ya descargado (None si no aparece)."""
+    if ESTADO_EMBEBIDO_ML:
+        total = estado_embebido.total_mercadolibre(html_content, estado=estado)
+        if total is not None:
+            print(f"✅ [TOTAL EXTRAÍDO] {total:,} publicaciones (estado JSON)")
+            return total
+    soup = BeautifulSoup(html_content, 'lxml')
+    selectores = [
+        '.ui-search-search-result__quantity-results',
+        '.ui-search-results__quantity-results',
+        '.ui-search-breadcrumb__title',
+        '.ui-search-results-header__title',
+        "[class*='quantity-results']",
+        "[class*='results-quantity']",
+    ]
+    total_text = None
+    for selector in selectores:
+        el = soup.select_one(selector)
+        if el and el.get_text(strip=True):
+            total_text = el.get_text(strip=True)
+            break
+    if not total_text:
+        m = re.search(r'(\d{1,3}(?:[.,]\d{3})+|\d+)\s*resultados?', soup.get_text(" ", strip=True), re.IGNORECASE)
+        if m:
+            total_text = m.group(0)
+    if not total_text:
+        patterns = [r'"quantity"\s*:\s*(\d+)', r'"total"\s*:\s*(\d+)', r'"numberOfItems"\s*:\s*(\d+)']
+        for pattern in patterns:
+            m = re.search(pattern, html_content, re.IGNORECASE)
+            if m:
+                total_text = m.group(1)
+                break
+    if total_text:
+        numeros = re.findall(r'[\d.,]+', total_text)
+        if numeros:
+            total = int(numeros[0].replace('.', '').replace(',', ''))
+            print(f"✅ [TOTAL EXTRAÍDO] {total:,} publicaciones")
+            return total
+    items = soup.find_all('li', class_='ui-search-layout__item')
+    if items:
+        print(f"⚠️ [TOTAL ML] No se halló total explícito; primera página tiene {len(items)} items")
+    print("⚠️ [TOTAL ML] Requests/ScrapingBee obtuvo contenido pero no encontró el total")
+    return None
+
+
+def primera_pagina_mercadolibre(url_base_con_filtros, api_key=None, use_scrapingbee=False):
+    """Descarga UNA vez la primera página del listado y devuelve (total, set(URLs), {URL: título}).
+
+    El mismo HTML alimenta el total y la página 1 de FASE 1 (antes eran dos GETs más
+    una prueba de conectividad contra la home). Si el sitio no responde devuelve
+    (None, set(), {}); si responde pero sin total se intenta con Chrome.
+    """
+    url_primera_pagina = _url_primera_pagina(url_base_con_filtros)
+    print(f"🔍 [PRIMERA PÁGINA ML] {url_primera_pagina}")
+    try:
+        response = _descargar_listado(url_primera_pagina, api_key, use_scrapingbee)
+    except Exception as e:
+        print(f"❌ [CONECTIVIDAD] No se puede acceder a MercadoLibre: {e}")
+        return None, set(), {}
+    if response.status_code != 200:
+        print(f"❌ [TOTAL ML] Requests falló con código: {response.status_code}")
+        return _total_mercadolibre_selenium(url_base_con_filtros), set(), {}
+    html_content = response.text
+    estado = estado_embebido.extraer_estado(html_content) if ESTADO_EMBEBIDO_ML else None
+    total = _total_desde_html(html_content, estado=estado)
+    urls, titulos = parsear_listado_mercadolibre(html_content, url_primera_pagina, estado=estado)
+    if total is None:
+        total = _total_mercadolibre_selenium(url_base_con_filtros)
+    return total, urls, titulos
 
 
 def extraer_total_resultados_mercadolibre(url_base_con_filtros, api_key=None, use_scrapingbee=False):
     print(f"🔍 [TOTAL ML] Iniciando extracción para URL: {url_base_con_filtros}")
     try:
-        print("🌐 [CONECTIVIDAD] Probando acceso básico a MercadoLibre...")
-        test_response = requests.get("https://www.mercadolibre.com.uy/", headers=HEADERS, timeout=10)
-        print(f"✅ [CONECTIVIDAD] MercadoLibre accesible - Status: {test_response.status_code}")
+        print(f"🌐 [TOTAL ML] Intentando con {'ScrapingBee' if (use_scrapingbee and api_key) else 'requests'} primero...")
+        response = _descargar_listado(_url_primera_pagina(url_base_con_filtros), api_key, use_scrapingbee)
     except Exception as e:
+        # Sin red no tiene sentido levantar Chrome
         print(f"❌ [CONECTIVIDAD] No se puede acceder a MercadoLibre: {e}")
         return None
     try:
-        print(f"🌐 [TOTAL ML] Intentando con {'ScrapingBee' if (use_scrapingbee and api_key) else 'requests'} primero...")
-        if '_NoIndex_True' in url_base_con_filtros:
-            url_primera_pagina = url_base_con_filtros
-        else:
-            url_primera_pagina = f"{url_base_con_filtros}_NoIndex_True"
-        print(f"📡 [TOTAL ML] Solicitando: {url_primera_pagina}")
-        if use_scrapingbee and api_key:
-            params = {'api_key': api_key, 'url': url_primera_pagina}
-            response = requests.get('https://app.scrapingbee.com/api/v1/', params=params, headers=HEADERS, timeout=60)
-        else:
-            response = requests.get(url_primera_pagina, headers=HEADERS, timeout=60)
-        if response.status_code != 200:
-            print(f"❌ [REQUESTS] Status: {response.status_code}")
         if response.status_code == 200:
-            html_content = response.text
-            soup = BeautifulSoup(html_content, 'lxml')
-            selectores = [
-                '.ui-search-search-result__quantity-results',
-                '.ui-search-results__quantity-results',
-                '.ui-search-breadcrumb__title',
-                '.ui-search-results-header__title',
-                "[class*='quantity-results']",
-                "[class*='results-quantity']",
-            ]
-            total_text = None
-            for selector in selectores:
-                el = soup.select_one(selector)
-                if el and el.get_text(strip=True):
-                    total_text = el.get_text(strip=True)
-                    break
-            if not total_text:
-                m = re.search(r'(\d{1,3}(?:[.,]\d{3})+|\d+)\s*resultados?', soup.get_text(" ", strip=True), re.IGNORECASE)
-                if m:
-                    total_text = m.group(0)
-            if not total_text:
-                patterns = [r'"quantity"\s*:\s*(\d+)', r'"total"\s*:\s*(\d+)', r'"numberOfItems"\s*:\s*(\d+)']
-                for pattern in patterns:
-                    m = re.search(pattern, html_content, re.IGNORECASE)
-                    if m:
-                        total_text = m.group(1)
-                        break
-            if total_text:
-                numeros = re.findall(r'[\d.,]+', total_text)
-                if numeros:
-                    total = int(numeros[0].replace('.', '').replace(',', ''))
-                    print(f"✅ [TOTAL EXTRAÍDO] {total:,} publicaciones")
-                    return total
-            items = soup.find_all('li', class_='ui-search-layout__item')
-            if items:
-                print(f"⚠️ [TOTAL ML] No se halló total explícito; primera página tiene {len(items)} items")
-            print("⚠️ [TOTAL ML] Requests/ScrapingBee obtuvo contenido pero no encontró el total")
+            total = _total_desde_html(response.text)
+            if total is not None:
+                return total
         else:
             print(f"❌ [TOTAL ML] Requests falló con código: {response.status_code}")
     except Exception as e:
         print(f"❌ [TOTAL ML] Error con requests: {e}")
+    return _total_mercadolibre_selenium(url_base_con_filtros)
+
+
+def _total_mercadolibre_selenium(url_base_con_filtros):
     print("🔄 [TOTAL ML] Fallback a Chrome...")
     driver = None
     try:
         print("🔍 [TOTAL ML] Iniciando driver...")
         driver = iniciar_driver()
         print("✅ [TOTAL ML] Driver iniciado correctamente")
-        if '_NoIndex_True' in url_base_con_filtros:
-            url_primera_pagina = url_base_con_filtros
-        else:
-            url_primera_pagina = f"{url_base_con_filtros}_NoIndex_True"
+        url_primera_pagina = _url_primera_pagina(url_base_con_filtros)
         print(f"🔍 [TOTAL ML] Accediendo a: {url_primera_pagina}")
         driver.get(url_primera_pagina)
         print("✅ [TOTAL ML] Página cargada, esperando contenido...")
@@ -105,11 +149,7 @@ def extraer_total_resultados_mercadolibre(url_base_con_filtros, api_key=None, us
         print(f"📏 [TOTAL ML] HTML Length: {page_source_length}")
         page_title_l = page_title.lower()
         page_source_sample = driver.page_source[:2000].lower()
-        captcha_indicators = [
-            "captcha", "robot", "verificaci", "blocked", "security",
-            "too many requests", "rate limit", "forbidden"
-        ]
-        found_captcha_indicators = [ind for ind in captcha_indicators if ind in page_source_sample or ind in page_title_l]
+        found_captcha_indicators = [ind for ind in CAPTCHA_INDICATORS if ind in page_source_sample or ind in page_title_l]
         if found_captcha_indicators:
             print(f"🛑 [CAPTCHA DETECTED] Indicadores encontrados: {found_captcha_indicators}")
             screenshot_path = tomar_captura_debug(driver, f"captcha_detected_{'-'.join(found_captcha_indicators[:2])}")
@@ -194,7 +234,6 @@ def extraer_total_resultados_mercadolibre(url_base_con_filtros, api_key=None, us
 
 def scrape_mercadolibre(filters: Dict[str, Any], keywords: List[str], max_pages: int = 3, search_id: str = None) -> Dict[str, List[Dict[str, Any]]]:
     import time
-    import unicodedata
     import re
     import os
     from selenium.webdriver.common.by import By
@@ -210,10 +249,11 @@ def scrape_mercadolibre(filters: Dict[str, Any], keywords: List[str], max_pages:
                 return False
         return False
 
-    from core.search_manager import procesar_keywords, normalizar_texto
+    from core.search_manager import procesar_keywords
     keywords_filtradas = procesar_keywords(' '.join(keywords))
     # Construir grupos (OR interno) y lista plana solo para logs
     keyword_groups = build_keyword_groups(keywords_filtradas)
+    matcher = matcher_para_grupos(keyword_groups)
     keywords_con_variantes = extraer_variantes_keywords(keywords_filtradas)
     base_url = build_mercadolibre_url(filters)
     print(f"[scraper] URL base de búsqueda: {base_url}")
@@ -336,32 +376,13 @@ def scrape_mercadolibre(filters: Dict[str, Any], keywords: List[str], max_pages:
                     pass
                 caracteristicas = ' '.join(caracteristicas_kv + caracteristicas_sueltas)
 
-                def normalizar(texto):
-                    return unicodedata.normalize('NFKD', str(texto)).encode('ASCII', 'ignore').decode('ASCII').lower()
-
-                texto_total_norm = normalizar(f"{titulo_text} {descripcion} {caracteristicas}")
                 # AND entre grupos; OR dentro de cada grupo
                 if not keyword_groups:
                     print("⚠️  No se especificaron palabras clave para filtrar.\n")
                     cumple = True
                 else:
-                    grupos_ok = []
-                    for grupo in keyword_groups:
-                        variantes_norm = [normalizar(v) for v in grupo]
-                        # OR: encontrada si alguna variante aparece (directa, stem o raíz aproximada)
-                        any_match = False
-                        for v in variantes_norm:
-                            if v in texto_total_norm:
-                                any_match = True
-                                break
-                            v_stem = stemming_basico(v)
-                            if v_stem and v_stem in texto_total_norm:
-                                any_match = True
-                                break
-                            if len(v) > 4 and v[:-2] in texto_total_norm:
-                                any_match = True
-                                break
-                        grupos_ok.append(any_match)
+                    # OR: encontrada si alguna variante aparece (directa, stem o raíz aproximada)
+                    grupos_ok = [v is not None for v in matcher.evaluar(f"{titulo_text} {descripcion} {caracteristicas}")]
                     if grupos_ok:
                         cumple = all(grupos_ok)
                         if cumple:
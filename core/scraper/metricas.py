@@ -0,0 +1,69 @@
+"""Cronometraje por fase del pipeline de scraping.
+
+Fases que registra `run.py`:
+    url_build -> construcción de la URL con filtros
+    total     -> extracción del total de resultados
+    fase1     -> recolección de URLs de los listados
+    dedup     -> chequeo contra la BD y análisis de propiedades existentes
+    fase2     -> detalle de propiedades nuevas (incluye `db`)
+    db        -> escrituras en BD (anidada dentro de fase2 / atajo sin keywords)
+
+Con keywords, MercadoLibre corre FASE 1 -> dedup -> FASE 2 en streaming
+(`pipeline.py`): `fase2` es el tramo completo del pipeline y `fase1`/`dedup`
+acumulan el tiempo de cada página y de cada lote, solapados con `fase2`.
+
+Los acumulados son por proceso y thread-safe; `manage.py benchmark_scraper`
+los reinicia antes de cada corrida y los lee al final.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+_lock = threading.Lock()
+_acumulado = {}
+
+
+def registrar(fase: str, segundos: float):
+    with _lock:
+        datos = _acumulado.setdefault(fase, {'segundos': 0.0, 'veces': 0})
+        datos['segundos'] += segundos
+        datos['veces'] += 1
+
+
+@contextmanager
+def fase(nombre: str):
+    """`with metricas.fase('db'): ...` suma el tiempo del bloque a la fase."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nombre, time.perf_counter() - inicio)
+
+
+class Cronometro:
+    """Marca fases consecutivas sin reindentar el código: cada `marcar` cierra la anterior."""
+
+    def __init__(self):
+        self._ultimo = time.perf_counter()
+
+    def marcar(self, nombre: str) -> float:
+        ahora = time.perf_counter()
+        segundos = ahora - self._ultimo
+        self._ultimo = ahora
+        registrar(nombre, segundos)
+        return segundos
+
+
+def obtener() -> dict:
+    with _lock:
+        return {f: dict(d) for f, d in _acumulado.items()}
+
+
+def reiniciar():
+    with _lock:
+        _acumulado.clear()
+
+
+def resumen() -> str:
+    return ' | '.join(f"{f}: {d['segundos']:.2f}s" for f, d in obtener().items())
@@ -0,0 +1,147 @@
+"""Pipeline en streaming entre FASE 1 (listados) y FASE 2 (detalles).
+
+En lugar de recolectar todas las páginas antes de deduplicar y scrapear:
+
+    [hilo fase1]  página -> URLs ----------------------------+
+                                                             v
+    [hilo llamador]  cola de eventos -> dedup en BD por lotes -> MotorFase2
+                          ^                                       |
+                          +---------- (url, datos) ---------------+
+
+Cada página de listado entra a la cola apenas se descarga; el hilo llamador la
+deduplica contra la BD en lotes chicos (`filtrar`) y manda las URLs nuevas al
+motor de FASE 2, cuyos resultados llegan por la misma cola. Así la primera
+coincidencia puede informarse tras una página y un detalle, no tras todo el
+crawl.
+
+Contrapresión: el motor nunca tiene más de `max_en_vuelo` detalles pendientes;
+lo que sobra queda en espera en el hilo llamador y, mientras haya espera, no
+se liberan cupos de página, así que el hilo de FASE 1 se frena con a lo sumo
+`paginas_en_cola` páginas descargadas sin consumir.
+
+El hilo llamador es el único que toca la BD (`filtrar` y el consumidor del
+generador), igual que con `MotorFase2.ejecutar`.
+"""
+import queue
+import threading
+from collections import deque
+
+from . import metricas
+from .constants import PIPELINE_PAGINAS_EN_COLA, PIPELINE_LOTE_DEDUP
+from .fase2 import FIN
+
+
+_FIN_FASE1 = object()
+
+
+class _Pagina:
+    __slots__ = ('url', 'urls', 'titulos')
+
+    def __init__(self, url, urls, titulos):
+        self.url = url
+        self.urls = urls
+        self.titulos = titulos
+
+
+class PipelineStreaming:
+    """FASE 1 -> dedup -> FASE 2 en streaming.
+
+    Args:
+        paginas: URLs de listado en orden.
+        recolectar: `recolectar(url_pagina) -> (set(urls), {url: título})`, corre en el hilo de FASE 1.
+        filtrar: `filtrar(urls, titulos) -> urls a scrapear`, corre en el hilo llamador por lote.
+
+    El motor de FASE 2 se crea con `salida=pipeline.eventos` y se pasa sin iniciar a `ejecutar`.
+    """
+
+    def __init__(self, paginas, recolectar, filtrar, max_en_vuelo=None,
+                 paginas_en_cola=None, lote_dedup=None):
+        self.paginas = list(paginas)
+        self.recolectar = recolectar
+        self.filtrar = filtrar
+        self.max_en_vuelo = max_en_vuelo
+        self.paginas_en_cola = max(1, int(paginas_en_cola or PIPELINE_PAGINAS_EN_COLA))
+        self.lote_dedup = max(1, int(lote_dedup or PIPELINE_LOTE_DEDUP))
+
+        self.eventos = queue.Queue()
+        self._cupos_pagina = threading.Semaphore(self.paginas_en_cola)
+        self._detener = threading.Event()
+        self.paginas_procesadas = 0
+        self.urls_recolectadas = 0
+        self.urls_a_scrapear = 0
+
+    # ---- Hilo de FASE 1 ----
+
+    def _producir(self):
+        try:
+            for url_pagina in self.paginas:
+                self._cupos_pagina.acquire()
+                if self._detener.is_set():
+                    break
+                try:
+                    with metricas.fase('fase1'):
+                        urls, titulos = self.recolectar(url_pagina)
+                except Exception as e:
+                    print(f"⚠️ [PIPELINE] Error recolectando {url_pagina}: {e}")
+                    urls, titulos = set(), {}
+                self.eventos.put(_Pagina(url_pagina, urls or set(), titulos if isinstance(titulos, dict) else {}))
+        finally:
+            self.eventos.put(_FIN_FASE1)
+
+    # ---- Hilo llamador ----
+
+    def ejecutar(self, motor):
+        """Generador de (url, datos) de FASE 2, en el hilo llamador."""
+        # Ventana por defecto: el doble de lo que el motor deja en vuelo por host, para que nunca espere trabajo
+        max_en_vuelo = max(1, int(self.max_en_vuelo or motor.max_por_host * 2))
+        motor.iniciar()
+        productor = threading.Thread(target=self._producir, name='pipeline-fase1', daemon=True)
+        productor.start()
+
+        vistas = set()
+        en_espera = deque()
+        en_vuelo = 0
+        paginas_retenidas = 0
+        fase1_terminada = False
+        motor_cerrado = False
+        try:
+            while True:
+                # Despachar al motor hasta llenar la ventana
+                while en_espera and en_vuelo < max_en_vuelo:
+                    motor.enviar(en_espera.popleft())
+                    en_vuelo += 1
+                # Sin trabajo retenido, la FASE 1 puede seguir descargando páginas
+                if not en_espera and paginas_retenidas:
+                    for _ in range(paginas_retenidas):
+                        self._cupos_pagina.release()
+                    paginas_retenidas = 0
+                if fase1_terminada and not en_espera and en_vuelo == 0 and not motor_cerrado:
+                    motor.cerrar()
+                    motor_cerrado = True
+
+                evento = self.eventos.get()
+                if evento is FIN:
+                    break
+                if evento is _FIN_FASE1:
+                    fase1_terminada = True
+                elif isinstance(evento, _Pagina):
+                    self.paginas_procesadas += 1
+                    paginas_retenidas += 1
+                    nuevas = [u for u in evento.urls if u not in vistas]
+                    vistas.update(nuevas)
+                    self.urls_recolectadas += len(nuevas)
+                    for i in range(0, len(nuevas), self.lote_dedup):
+                        lote = nuevas[i:i + self.lote_dedup]
+                        a_scrapear = list(self.filtrar(lote, {u: evento.titulos[u] for u in lote if u in evento.titulos}))
+                        self.urls_a_scrapear += len(a_scrapear)
+                        en_espera.extend(a_scrapear)
+                else:
+                    en_vuelo -= 1
+                    yield evento
+        finally:
+            self._detener.set()
+            self._cupos_pagina.release()
+            if not motor_cerrado:
+                motor.cerrar()
+            productor.join(timeout=5)
+            motor.esperar()
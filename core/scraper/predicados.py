@@ -0,0 +1,260 @@
+"""Compilador de frases numéricas de keywords a predicados sobre la metadata.
+
+La IA deja como keywords condiciones que no son filtros de la plataforma
+("gastos comunes menores a 5.000 pesos", "garage para 2 autos"). Como texto
+casi nunca aparecen literalmente en la publicación: dan falsos negativos y
+obligan a scrapear el detalle de cada candidata. Acá se reconocen las frases
+de la forma <atributo> [comparador] <número> [unidad] sobre atributos conocidos
+y se traducen a predicados sobre `Propiedad.metadata`:
+
+    "gastos comunes menores a 5.000 pesos"  -> gastos_comunes_valor <= 5000
+    "garage para 2 autos"                   -> cocheras_max >= 2
+    "mas de 80 m2"                          -> superficie_total_max >= 80
+    "hasta u$s 150.000"                     -> precio_valor <= 150000 (USD)
+
+Cada predicado se evalúa en SQL (`q()`, sobre las columnas tipadas de Propiedad) para
+las propiedades que ya están en la BD, o en Python (`cumple()`) sobre la
+metadata de una propiedad recién scrapeada. Los que tienen filtro equivalente
+en la URL de la plataforma se agregan además a los filtros (`aplicar_a_filtros`)
+para que la plataforma descarte antes y se descarguen menos páginas; sólo los
+que la URL no garantiza (`pendientes_tras_filtros`) se evalúan después.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Q
+
+# Atributo -> (regex que lo nombra, campo para >=, campo para <=, filtro de URL, comparador por defecto).
+# Los atributos con rango (p. ej. emprendimientos de 1 a 3 dormitorios) comparan >= contra el máximo
+# y <= contra el mínimo: basta con que alguna unidad del rango cumpla.
+ATRIBUTOS = {
+    'gastos_comunes': (r'gastos? comun(?:es)?|gc|expensas', 'gastos_comunes_valor', 'gastos_comunes_valor',
+                       None, 'lte'),
+    'precio': (r'precio|cuesta|valor|alquiler de|u\$s|usd|dolares', 'precio_valor', 'precio_valor', 'precio', 'lte'),
+    # Hace falta el sustantivo: "autos"/"vehículos" sólo valen como unidad ("garage para 2 autos"),
+    # solos son cualquier cosa ("a 5 minutos en auto del centro")
+    'cocheras': (r'garages?|garajes?|cocheras?|estacionamientos?', 'cocheras_max', 'cocheras_min',
+                 'cocheras', 'gte'),
+    'dormitorios': (r'dormitorios?|dorm|habitaciones|cuartos', 'dormitorios_max', 'dormitorios_min',
+                    'dormitorios', 'gte'),
+    'banos': (r'banos?', 'banos_max', 'banos_min', 'banos', 'gte'),
+    # Sólo con unidad de área: "a 100 metros del mar" es una distancia, no una superficie
+    'superficie': (r'm2|m²|mts2|mts cuadrados|metros cuadrados|superficie', 'superficie_total_max',
+                   'superficie_total_min', 'superficie_total', 'gte'),
+    # "años" solo no alcanza: "reciclado hace 5 años" no habla de la antigüedad del inmueble
+    'antiguedad': (r'anos de antiguedad|antiguedad', 'antiguedad', 'antiguedad', 'antiguedad', 'lte'),
+}
+
+COMPARADORES = (
+    ('lte', r'menos de|menor(?:es)? (?:a|de|que)|hasta|como maximo|maximo|max|no mas de|por debajo de|<=?'),
+    ('gte', r'mas de|mayor(?:es)? (?:a|de|que)|desde|como minimo|minimo|min|al menos|por lo menos|>=?'),
+)
+
+MONEDAS = {
+    'USD': (r'u\$s|us\$|usd|dolares?', ('USD', 'US$', 'U$S')),
+    'UYU': (r'pesos|\$u|uyu', ('UYU', '$', '$U')),
+}
+
+# Claves de filtro que cada constructor de URL (url_builder) aplica de verdad -> clave que además tiene
+# que estar presente cuando el constructor sólo la usa como parte de un rango (None = siempre se aplica).
+# Lo que no figura acá no se filtra en la plataforma: "hasta 2 dormitorios" en MercadoLibre, antigüedad o
+# cantidad de cocheras en InfoCasas (sólo "con-garaje"), baños mínimos en InfoCasas (es cantidad exacta).
+FILTROS_POR_PLATAFORMA = {
+    'mercadolibre': {
+        'precio_min': None, 'precio_max': None,
+        'banos_min': None, 'banos_max': None,
+        'cocheras_min': None, 'cocheras_max': None,
+        'antiguedad_min': None, 'antiguedad_max': None,
+        'superficie_total_min': None, 'superficie_total_max': None,
+        'dormitorios_min': None, 'dormitorios_max': 'dormitorios_min',
+    },
+    'infocasas': {
+        'precio_min': None, 'precio_max': None,
+        'superficie_total_min': None, 'superficie_total_max': None,
+        'dormitorios_min': None, 'dormitorios_max': 'dormitorios_min',
+        'banos_min': 'banos_max', 'banos_max': 'banos_min',
+    },
+}
+
+_NUMERO = re.compile(r'(?<!\w)(\d{1,3}(?:\.\d{3})+|\d+(?:,\d+)?)\s*(mil|k)?\b')
+
+
+class Predicado:
+    """Comparación numérica `campo <op> valor` sobre la metadata de una propiedad."""
+
+    __slots__ = ('atributo', 'campo', 'operador', 'valor', 'moneda', 'frase')
+
+    def __init__(self, atributo, campo, operador, valor, moneda=None, frase=''):
+        self.atributo = atributo
+        self.campo = campo
+        self.operador = operador
+        self.valor = valor
+        self.moneda = moneda
+        self.frase = frase
+
+    def __repr__(self):
+        signo = '>=' if self.operador == 'gte' else '<='
+        moneda = f' {self.moneda}' if self.moneda else ''
+        return f'<Predicado {self.campo} {signo} {self.valor}{moneda}>'
+
+    def __eq__(self, otro):
+        return isinstance(otro, Predicado) and (
+            self.campo, self.operador, self.valor, self.moneda
+        ) == (otro.campo, otro.operador, otro.valor, otro.moneda)
+
+    def q(self) -> Q:
+        """Condición SQL equivalente, sobre la columna tipada e indexada del mismo nombre."""
+        condicion = Q(**{f'{self.campo}__{self.operador}': self.valor})
+        if self.moneda:
+            condicion &= Q(precio_moneda__in=MONEDAS[self.moneda][1])
+        return condicion
+
+    def cumple(self, metadata: Optional[Dict]) -> bool:
+        """Misma condición que `q()`, sobre la metadata en memoria. Sin dato no cumple."""
+        metadata = metadata or {}
+        try:
+            actual = float(metadata.get(self.campo))
+        except (TypeError, ValueError):
+            return False
+        if self.moneda and metadata.get('precio_moneda') not in MONEDAS[self.moneda][1]:
+            return False
+        return actual >= self.valor if self.operador == 'gte' else actual <= self.valor
+
+
+def _normalizar(frase: str) -> str:
+    # Como normalizar_texto pero conservando '.', ',', '$' y comparadores: forman parte de números y monedas
+    texto = unicodedata.normalize('NFD', str(frase).lower())
+    texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
+    return re.sub(r'\s+', ' ', texto).strip()
+
+
+def parsear_numero(texto) -> Optional[float]:
+    """Primer número de un texto ("$ 5.000", "1,5", "150 mil") o None."""
+    if isinstance(texto, (int, float)):
+        return float(texto)
+    m = _NUMERO.search(_normalizar(texto or ''))
+    if not m:
+        return None
+    numero = float(m.group(1).replace('.', '').replace(',', '.'))
+    return numero * 1000 if m.group(2) else numero
+
+
+def compilar_frase(frase: str) -> Optional[Predicado]:
+    """
+    Predicado de una frase de keyword, o None si no es una condición numérica sobre un atributo conocido.
+    Una frase que nombra más de un atributo ("2 dormitorios y 2 baños") también queda como texto:
+    un único predicado perdería las demás condiciones.
+    """
+    texto = _normalizar(frase)
+    valor = parsear_numero(texto)
+    if valor is None:
+        return None
+    atributos = [
+        atributo for atributo, (patron, *_resto) in ATRIBUTOS.items()
+        if re.search(rf'(?<![a-z])(?:{patron})(?![a-z])', texto)
+    ]
+    if len(atributos) != 1:
+        return None
+    atributo = atributos[0]
+    _patron, campo_gte, campo_lte, _filtro, operador_defecto = ATRIBUTOS[atributo]
+    operador = next((op for op, p in COMPARADORES if re.search(rf'(?:^|\s)(?:{p})(?=\s|\d|$)', texto)),
+                    operador_defecto)
+    moneda = None
+    if atributo == 'precio':
+        moneda = next((m for m, (p, _) in MONEDAS.items() if re.search(p, texto)), None)
+    campo = campo_gte if operador == 'gte' else campo_lte
+    return Predicado(atributo, campo, operador, valor, moneda, frase)
+
+
+def compilar_keywords(keywords) -> Tuple[List[Predicado], List[str]]:
+    """
+    Separa las frases numéricas de las keywords de texto.
+
+    Returns:
+        (predicados, keywords restantes para el matching por texto, en el orden original)
+    """
+    predicados, restantes = [], []
+    for keyword in keywords or []:
+        predicado = compilar_frase(keyword) if isinstance(keyword, str) else None
+        if predicado is None:
+            restantes.append(keyword)
+        elif predicado not in predicados:
+            predicados.append(predicado)
+    if predicados:
+        print(f"🧮 [PREDICADOS] {len(predicados)} frases numéricas compiladas: {predicados}")
+    return predicados, restantes
+
+
+def _clave_filtro(predicado: Predicado) -> Optional[str]:
+    filtro = ATRIBUTOS[predicado.atributo][3]
+    return f"{filtro}_{'min' if predicado.operador == 'gte' else 'max'}" if filtro else None
+
+
+def _valor_filtro(valor):
+    return int(valor) if valor == int(valor) else valor
+
+
+def aplicar_a_filtros(predicados: List[Predicado], filters: Dict, plataforma: str) -> Dict:
+    """
+    Copia de `filters` con los predicados que la URL de `plataforma` sabe filtrar
+    (`<filtro>_min`/`<filtro>_max`, ver FILTROS_POR_PLATAFORMA). No pisa filtros que ya vengan definidos.
+    """
+    filtros = dict(filters or {})
+    consumidas = FILTROS_POR_PLATAFORMA.get(plataforma, {})
+    candidatos = {}
+    for predicado in predicados:
+        clave = _clave_filtro(predicado)
+        if clave not in consumidas:
+            continue
+        if predicado.atributo == 'precio' and predicado.moneda:
+            if filtros.get('moneda') and filtros['moneda'].upper() != predicado.moneda:
+                continue
+            filtros.setdefault('moneda', predicado.moneda)
+        candidatos.setdefault(clave, _valor_filtro(predicado.valor))
+    for clave, valor in candidatos.items():
+        # Las que sólo se aplican en rango necesitan el otro extremo (del usuario o de otro predicado)
+        requisito = consumidas[clave]
+        if requisito is None or filtros.get(requisito) not in (None, '') or requisito in candidatos:
+            filtros.setdefault(clave, valor)
+    return filtros
+
+
+def cubierto_por_filtros(predicado: Predicado, filtros: Dict, plataforma: str) -> bool:
+    """True si la URL de `plataforma` construida con `filtros` ya garantiza el predicado."""
+    clave = _clave_filtro(predicado)
+    consumidas = FILTROS_POR_PLATAFORMA.get(plataforma, {})
+    if clave not in consumidas or filtros.get(clave) in (None, ''):
+        return False
+    requisito = consumidas[clave]
+    if requisito and filtros.get(requisito) in (None, ''):
+        return False
+    if predicado.moneda and (filtros.get('moneda') or 'USD').upper() != predicado.moneda:
+        return False
+    try:
+        valor = float(filtros[clave])
+    except (TypeError, ValueError):
+        return False
+    # Un filtro del usuario más laxo que el predicado no alcanza
+    return valor >= predicado.valor if predicado.operador == 'gte' else valor <= predicado.valor
+
+
+def pendientes_tras_filtros(predicados: List[Predicado], filtros: Dict, plataforma: str) -> List[Predicado]:
+    """Los predicados que la URL de la plataforma no garantiza: hay que evaluarlos sobre la propiedad."""
+    return [p for p in predicados if not cubierto_por_filtros(p, filtros, plataforma)]
+
+
+def ids_que_cumplen(predicados: List[Predicado], propiedad_ids) -> set:
+    """De un conjunto de propiedades, las que cumplen todos los predicados: una query."""
+    from core.models import Propiedad
+    propiedad_ids = list(propiedad_ids)
+    if not predicados:
+        return set(propiedad_ids)
+    condicion = Q()
+    for predicado in predicados:
+        condicion &= predicado.q()
+    return set(Propiedad.objects.filter(id__in=propiedad_ids).filter(condicion).values_list('id', flat=True))
+
+
+def cumple_todos(predicados: List[Predicado], metadata: Optional[Dict]) -> bool:
+    return all(p.cumple(metadata) for p in predicados)
@@ -1,5 +1,7 @@
 from datetime import datetime
 import os
+import threading
+from contextlib import contextmanager
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
@@ -61,7 +63,57 @@ def tomar_captura_debug(driver, motivo="debug"):
         return None
 
 
+_hilo = threading.local()
+
+
+class FlujoCombinado:
+    """Une en un solo stream el progreso de varias plataformas que corren en paralelo.
+
+    Cada plataforma sigue llamando a `send_progress_update` como si estuviera sola;
+    dentro de `flujo_plataforma(...)` los mensajes se etiquetan con la plataforma,
+    `total_found` pasa a ser la suma de los totales informados, `matched_publications`
+    la concatenación de las listas de cada una, y los `final_message` parciales se
+    degradan a mensajes de estado: el cierre lo anuncia el orquestador al final.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totales = {}
+        self.coincidencias = {}
+
+    def adaptar(self, plataforma, total_found, current_search_item, matched_publications, final_message, all_matched_properties):
+        with self._lock:
+            if total_found is not None:
+                self.totales[plataforma] = total_found
+                total_found = sum(self.totales.values())
+            if matched_publications is not None:
+                self.coincidencias[plataforma] = list(matched_publications)
+                matched_publications = [m for lista in self.coincidencias.values() for m in lista]
+        if final_message:
+            current_search_item, final_message, all_matched_properties = final_message, None, None
+        if current_search_item:
+            current_search_item = f"[{plataforma}] {current_search_item}"
+        return total_found, current_search_item, matched_publications, final_message, all_matched_properties
+
+
+@contextmanager
+def flujo_plataforma(flujo: FlujoCombinado, plataforma: str):
+    """Asocia el thread actual a `plataforma` dentro de `flujo` (ver `FlujoCombinado`)."""
+    _hilo.flujo = (flujo, plataforma)
+    try:
+        yield
+    finally:
+        _hilo.flujo = None
+
+
 def send_progress_update(total_found=None, estimated_time=None, current_search_item=None, matched_publications=None, final_message=None, page_items_found=None, debug_screenshot=None, all_matched_properties=None):
+    contexto = getattr(_hilo, 'flujo', None)
+    if contexto is not None:
+        flujo, plataforma = contexto
+        total_found, current_search_item, matched_publications, final_message, all_matched_properties = flujo.adaptar(
+            plataforma, total_found, current_search_item, matched_publications, final_message, all_matched_properties
+        )
+
     if final_message:
         print(f'✅ [FINAL] {final_message}')
     elif current_search_item and not current_search_item.startswith("Búsqueda actual"):
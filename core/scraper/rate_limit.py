@@ -0,0 +1,191 @@
+"""Rate limiter por host compartido por todos los hilos, corrutinas y procesos del scraper.
+
+Cada host tiene una cubeta de tokens (token bucket) con una tasa que se ajusta sola
+(AIMD): ante un 429/403 o una página de captcha la tasa se multiplica por
+`RATE_LIMIT_FACTOR_BAJA` y cada respuesta sana la recupera de a
+`RATE_LIMIT_INCREMENTO` req/s hasta volver al techo `RATE_LIMIT_RPS`.
+
+El estado vive en memoria del proceso (con lock, sirve para hilos y para el
+motor asyncio de FASE 2, que descarga desde un pool de hilos). Si se define
+`SCRAPER_RATE_REDIS_URL` el mismo algoritmo corre como script Lua en Redis y
+las cubetas se comparten entre procesos; si Redis falla se vuelve a memoria.
+
+`fetcher.fetch` llama a `esperar_turno` antes de cada request y a
+`registrar_respuesta` después, así que los extractores no necesitan sleeps fijos.
+"""
+import re
+import threading
+import time
+
+from .constants import (
+    RATE_LIMIT_ACTIVO, RATE_LIMIT_RPS, RATE_LIMIT_RPS_MIN, RATE_LIMIT_RAFAGA,
+    RATE_LIMIT_FACTOR_BAJA, RATE_LIMIT_INCREMENTO, RATE_LIMIT_REDIS_URL,
+    CAPTCHA_INDICATORS,
+)
+
+
+_TITULO_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_STATUS_BLOQUEO = (429, 403)
+
+# Mismo algoritmo que `_aplicar`, ejecutado atómicamente en Redis
+_SCRIPT_LUA = """
+local ahora = tonumber(ARGV[1])
+local accion = ARGV[2]
+local rps_max = tonumber(ARGV[3])
+local rps_min = tonumber(ARGV[4])
+local rafaga = tonumber(ARGV[5])
+local factor = tonumber(ARGV[6])
+local incremento = tonumber(ARGV[7])
+local pausa = tonumber(ARGV[8])
+local d = redis.call('HMGET', KEYS[1], 'tokens', 'ultimo', 'rps', 'pausa_hasta')
+local tokens = tonumber(d[1]) or rafaga
+local ultimo = tonumber(d[2]) or ahora
+local rps = tonumber(d[3]) or rps_max
+local pausa_hasta = tonumber(d[4]) or 0
+tokens = math.min(rafaga, tokens + math.max(0, ahora - ultimo) * rps)
+local espera = 0
+if accion == 'reservar' then
+  tokens = tokens - 1
+  if tokens < 0 then espera = -tokens / rps end
+  espera = espera + math.max(0, pausa_hasta - ahora)
+elseif accion == 'penalizar' then
+  rps = math.max(rps_min, rps * factor)
+  tokens = math.min(tokens, 0)
+  pausa_hasta = math.max(pausa_hasta, ahora + pausa)
+else
+  rps = math.min(rps_max, rps + incremento)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ultimo', ahora, 'rps', rps, 'pausa_hasta', pausa_hasta)
+redis.call('EXPIRE', KEYS[1], 3600)
+return {tostring(espera), tostring(rps)}
+"""
+
+_lock = threading.Lock()
+_cubetas = {}
+_rps_actual = {}
+_bloqueos = {}
+
+_redis_script = None
+_redis_deshabilitado = False
+
+
+def _aplicar(estado: dict, accion: str, ahora: float, pausa: float = 0.0) -> float:
+    """Actualiza la cubeta `estado` in-place y devuelve los segundos a esperar."""
+    estado['tokens'] = min(RATE_LIMIT_RAFAGA, estado['tokens'] + max(0.0, ahora - estado['ultimo']) * estado['rps'])
+    estado['ultimo'] = ahora
+    espera = 0.0
+    if accion == 'reservar':
+        estado['tokens'] -= 1
+        if estado['tokens'] < 0:
+            espera = -estado['tokens'] / estado['rps']
+        espera += max(0.0, estado['pausa_hasta'] - ahora)
+    elif accion == 'penalizar':
+        estado['rps'] = max(RATE_LIMIT_RPS_MIN, estado['rps'] * RATE_LIMIT_FACTOR_BAJA)
+        estado['tokens'] = min(estado['tokens'], 0.0)
+        estado['pausa_hasta'] = max(estado['pausa_hasta'], ahora + pausa)
+    else:
+        estado['rps'] = min(RATE_LIMIT_RPS, estado['rps'] + RATE_LIMIT_INCREMENTO)
+    return espera
+
+
+def _get_redis_script():
+    global _redis_script, _redis_deshabilitado
+    if _redis_script is not None or _redis_deshabilitado or not RATE_LIMIT_REDIS_URL:
+        return _redis_script
+    try:
+        import redis
+        cliente = redis.Redis.from_url(RATE_LIMIT_REDIS_URL, socket_timeout=2)
+        _redis_script = cliente.register_script(_SCRIPT_LUA)
+    except Exception as e:
+        print(f"⚠️ [RATE] Redis no disponible ({e}); usando cubetas en memoria")
+        _redis_deshabilitado = True
+    return _redis_script
+
+
+def _operar(host: str, accion: str, pausa: float = 0.0) -> float:
+    global _redis_deshabilitado
+    script = _get_redis_script()
+    if script is not None:
+        try:
+            espera, rps = script(
+                keys=[f'scraper:rate:{host}'],
+                args=[time.time(), accion, RATE_LIMIT_RPS, RATE_LIMIT_RPS_MIN, RATE_LIMIT_RAFAGA,
+                      RATE_LIMIT_FACTOR_BAJA, RATE_LIMIT_INCREMENTO, pausa],
+            )
+            _rps_actual[host] = float(rps)
+            return float(espera)
+        except Exception as e:
+            print(f"⚠️ [RATE] Error en Redis ({e}); usando cubetas en memoria")
+            _redis_deshabilitado = True
+    with _lock:
+        estado = _cubetas.get(host)
+        if estado is None:
+            estado = _cubetas[host] = {
+                'tokens': RATE_LIMIT_RAFAGA, 'ultimo': time.monotonic(),
+                'rps': RATE_LIMIT_RPS, 'pausa_hasta': 0.0,
+            }
+        espera = _aplicar(estado, accion, time.monotonic(), pausa)
+        _rps_actual[host] = estado['rps']
+        return espera
+
+
+def esperar_turno(host: str) -> float:
+    """Bloquea el hilo hasta que el host admita otra request. Devuelve los segundos esperados."""
+    if not RATE_LIMIT_ACTIVO or not host:
+        return 0.0
+    espera = _operar(host, 'reservar')
+    if espera > 0:
+        time.sleep(espera)
+    return espera
+
+
+def es_bloqueo(status_code: int, contenido: bytes = b'') -> bool:
+    """True si la respuesta parece un rate-limit o un captcha.
+
+    Los indicadores se buscan sólo en el <title>: en el cuerpo aparecen en páginas
+    normales (p.ej. `<meta name="robots">`).
+    """
+    if status_code in _STATUS_BLOQUEO:
+        return True
+    match = _TITULO_RE.search(contenido[:65536] if contenido else b'')
+    if not match:
+        return False
+    titulo = match.group(1).decode('utf-8', errors='ignore').lower()
+    return any(ind in titulo for ind in CAPTCHA_INDICATORS)
+
+
+def registrar_respuesta(host: str, status_code: int, contenido: bytes = b'', retry_after=None) -> bool:
+    """Ajusta la tasa del host según la respuesta. Devuelve True si se detectó bloqueo."""
+    if not RATE_LIMIT_ACTIVO or not host:
+        return False
+    if es_bloqueo(status_code, contenido):
+        try:
+            pausa = float(retry_after) if retry_after else 0.0
+        except (TypeError, ValueError):
+            pausa = 0.0
+        _operar(host, 'penalizar', pausa)
+        with _lock:
+            _bloqueos[host] = _bloqueos.get(host, 0) + 1
+        print(f"🐢 [RATE] {host}: bloqueo (HTTP {status_code}) -> {_rps_actual.get(host, 0):.2f} req/s"
+              + (f", pausa {pausa:.0f}s" if pausa else ""))
+        return True
+    if status_code < 400:
+        _operar(host, 'recompensar')
+    return False
+
+
+def estado() -> dict:
+    """Tasa actual y bloqueos vistos por host (en este proceso)."""
+    with _lock:
+        return {
+            host: {'rps': rps, 'bloqueos': _bloqueos.get(host, 0)}
+            for host, rps in _rps_actual.items()
+        }
+
+
+def reiniciar():
+    """Olvida las cubetas locales (útil en tests)."""
+    with _lock:
+        _cubetas.clear()
+        _rps_actual.clear()
+        _bloqueos.clear()
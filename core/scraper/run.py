@@ -1,20 +1,28 @@
 import concurrent.futures
 import os
-import unicodedata
 from typing import Dict, Any, List
-from django.utils import timezone
-from core.models import Propiedad, Plataforma, PalabraClave, BusquedaPalabraClave, ResultadoBusqueda, Busqueda
+from django.db import connections, transaction
+from core.models import Propiedad, Plataforma, PalabraClave, BusquedaPalabraClave, Busqueda
+from core.escritor_resultados import EscritorResultados
+from core.ingesta import IngestaPropiedades
 from core.search_manager import (
     normalizar_texto, procesar_keywords, get_or_create_palabra_clave, 
-    procesar_propiedad_existente, verificar_coincidencias_keywords, 
-    procesar_propiedad_nueva
+    procesar_propiedades_existentes, guardar_resultados_busqueda_con_keywords,
+    crear_propiedades_basicas
 )
 from .url_builder import build_mercadolibre_url, build_infocasas_url
-from .mercadolibre import extraer_total_resultados_mercadolibre, scrape_mercadolibre
-from .infocasas import extraer_total_resultados_infocasas, scrape_infocasas
-from .extractors import scrape_detalle_con_requests, recolectar_urls_de_pagina, scrape_detalle_infocasas_con_requests, recolectar_urls_infocasas_de_pagina
-from .progress import send_progress_update
-from .utils import stemming_basico, extraer_variantes_keywords, build_keyword_groups
+from .mercadolibre import primera_pagina_mercadolibre, scrape_mercadolibre
+from .infocasas import primera_pagina_infocasas, scrape_infocasas
+from .extractors import recolectar_urls_de_pagina, scrape_detalle_infocasas_con_requests, recolectar_urls_infocasas_de_pagina
+from .progress import send_progress_update, FlujoCombinado, flujo_plataforma
+from .constants import PLATAFORMAS_EN_PARALELO
+from .fase2 import MotorFase2
+from .pipeline import PipelineStreaming
+from . import metricas
+from . import fetcher
+from .utils import extraer_variantes_keywords, build_keyword_groups
+from .matcher import matcher_para_grupos
+from .predicados import compilar_keywords, aplicar_a_filtros, pendientes_tras_filtros, cumple_todos, ids_que_cumplen
 
 
 def extraer_titulo_de_url_infocasas(url):
@@ -63,57 +71,20 @@ def buscar_en_contenido_almacenado(prop, keyword_groups, keywords_ya_cubiertas=N
     Busca keywords en el contenido almacenado de una propiedad.
     Si keywords_ya_cubiertas se proporciona, solo busca las faltantes.
     """
-    # Construir texto completo de la propiedad desde los datos almacenados
-    titulo = prop.titulo or ''
-    descripcion = prop.descripcion or ''
-    caracteristicas = ''
-    
-    # Extraer características del metadata si existe
-    if prop.metadata and isinstance(prop.metadata, dict):
-        caracteristicas = prop.metadata.get('caracteristicas', '')
-    
-    texto_total = f"{titulo.lower()} {descripcion.lower()} {caracteristicas.lower()}"
+    # Texto normalizado persistido en la propiedad (título + descripción + características)
+    texto_total = prop.texto_busqueda or prop.calcular_texto_busqueda()
     
     # Verificar coincidencia con keyword_groups
     if not keyword_groups:
         return True
     
-    def normalizar(texto):
-        return unicodedata.normalize('NFKD', str(texto)).encode('ASCII', 'ignore').decode('ASCII').lower()
-    
-    texto_total_norm = normalizar(texto_total)
     grupos_ok = []
-    
-    for grupo in keyword_groups:
+    for grupo, variante in zip(keyword_groups, matcher_para_grupos(keyword_groups).evaluar(texto_total, normalizado=True)):
         # Si ya tenemos keywords cubiertas, verificar si este grupo ya está cubierto
-        if keywords_ya_cubiertas:
-            grupo_ya_cubierto = False
-            for keyword in grupo:
-                keyword_norm = normalizar_texto(str(keyword))
-                if keyword_norm in keywords_ya_cubiertas:
-                    grupo_ya_cubierto = True
-                    break
-            if grupo_ya_cubierto:
-                grupos_ok.append(True)
-                continue
-        
-        # Buscar en contenido almacenado
-        variantes_norm = [normalizar(v) for v in grupo]
-        any_match = False
-        for v in variantes_norm:
-            if v in texto_total_norm:
-                any_match = True
-                break
-            # Busqueda con stemming
-            v_stem = stemming_basico(v)
-            if v_stem and v_stem in texto_total_norm:
-                any_match = True
-                break
-            # Busqueda parcial para palabras largas
-            if len(v) > 4 and v[:-2] in texto_total_norm:
-                any_match = True
-                break
-        grupos_ok.append(any_match)
+        if keywords_ya_cubiertas and any(normalizar_texto(str(keyword)) in keywords_ya_cubiertas for keyword in grupo):
+            grupos_ok.append(True)
+            continue
+        grupos_ok.append(variante is not None)
     
     cumple = all(grupos_ok) if grupos_ok else True
     
@@ -125,7 +96,7 @@ def buscar_en_contenido_almacenado(prop, keyword_groups, keywords_ya_cubiertas=N
     return cumple
 
 
-def run_scraper(filters: dict, keywords: list = None, max_paginas: int = 3, workers_fase1: int = 1, workers_fase2: int = 1, busqueda: 'Busqueda' = None, plataformas: list = None, plataforma: str = None):
+def run_scraper(filters: dict, keywords: list = None, max_paginas: int = 3, workers_fase1: int = 1, workers_fase2: int = None, busqueda: 'Busqueda' = None, plataformas: list = None, plataforma: str = None):
     """
     Orquestador principal que maneja múltiples plataformas.
     
@@ -134,7 +105,7 @@ def run_scraper(filters: dict, keywords: list = None, max_paginas: int = 3, work
         keywords: Lista de palabras clave
         max_paginas: Máximo de páginas a procesar por plataforma
         workers_fase1: Workers para fase de recolección
-        workers_fase2: Workers para fase de detalle
+        workers_fase2: Requests de detalle en vuelo por host en FASE 2 (None = SCRAPER_FASE2_POR_HOST)
         busqueda: Objeto Busqueda para guardar resultados
         plataformas: Lista de plataformas ['MercadoLibre', 'InfoCasas', 'Todas']
         plataforma: Plataforma individual ('mercadolibre', 'infocasas', 'todas')
@@ -163,57 +134,62 @@ def run_scraper(filters: dict, keywords: list = None, max_paginas: int = 3, work
     
     print(f"🎯 [SCRAPER MULTI] Plataformas activas: {plataformas_activas}")
     
-    # Procesar cada plataforma
-    resultados_totales = []
-    
-    for i, plataforma in enumerate(plataformas_activas):
-        print(f"\n{'='*60}")
-        print(f"🏠 [PLATAFORMA {i+1}/{len(plataformas_activas)}] Procesando {plataforma}")
-        print(f"{'='*60}")
-        
-        send_progress_update(current_search_item=f"Procesando plataforma {plataforma} ({i+1}/{len(plataformas_activas)})...")
-        
-        try:
-            if plataforma == 'MercadoLibre':
-                resultados_plataforma = run_scraper_mercadolibre(filters, keywords, max_paginas, workers_fase1, workers_fase2, busqueda)
-            elif plataforma == 'InfoCasas':
-                resultados_plataforma = run_scraper_infocasas(filters, keywords, max_paginas, workers_fase1, workers_fase2, busqueda)
-            else:
-                print(f"❌ [SCRAPER MULTI] Plataforma no soportada: {plataforma}")
-                continue
-            
-            if resultados_plataforma:
-                # Agregar identificador de plataforma a cada resultado
-                for resultado in resultados_plataforma:
-                    resultado['plataforma'] = plataforma
-                
-                resultados_totales.extend(resultados_plataforma)
-                print(f"✅ [PLATAFORMA] {plataforma}: {len(resultados_plataforma)} resultados")
-            else:
-                print(f"❌ [PLATAFORMA] {plataforma}: 0 resultados")
-        
-        except Exception as e:
-            print(f"❌ [PLATAFORMA] Error en {plataforma}: {e}")
-            send_progress_update(current_search_item=f"Error en plataforma {plataforma}: {str(e)}")
-            continue
-    
-    # Consolidar resultados finales
-    print(f"\n🎯 [SCRAPER MULTI] Consolidando {len(resultados_totales)} resultados de {len(plataformas_activas)} plataformas")
-    
-    # Eliminar duplicados por URL (aunque es poco probable entre plataformas)
+    # Procesar plataformas: en paralelo cuando hay más de una (el tiempo total tiende al de la más lenta)
     urls_vistas = set()
     resultados_unicos = []
-    
-    for resultado in resultados_totales:
-        url = resultado.get('url', '')
-        if url and url not in urls_vistas:
-            urls_vistas.add(url)
-            resultados_unicos.append(resultado)
-    
+
+    def consolidar(plataforma, resultados_plataforma):
+        """Agrega los resultados de una plataforma a medida que llegan, sin duplicar URLs."""
+        if not resultados_plataforma:
+            print(f"❌ [PLATAFORMA] {plataforma}: 0 resultados")
+            return
+        nuevos = 0
+        for resultado in resultados_plataforma:
+            # Agregar identificador de plataforma a cada resultado
+            resultado['plataforma'] = plataforma
+            url = resultado.get('url', '')
+            if url and url not in urls_vistas:
+                urls_vistas.add(url)
+                resultados_unicos.append(resultado)
+                nuevos += 1
+        print(f"✅ [PLATAFORMA] {plataforma}: {len(resultados_plataforma)} resultados ({nuevos} nuevos en el consolidado)")
+
+    paralelo = len(plataformas_activas) > 1 and _plataformas_en_paralelo()
+
+    if paralelo:
+        print(f"⚡ [SCRAPER MULTI] Ejecutando {len(plataformas_activas)} plataformas en paralelo")
+        flujo = FlujoCombinado()
+        send_progress_update(current_search_item=f"Procesando plataformas en paralelo: {', '.join(plataformas_activas)}...")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(plataformas_activas), thread_name_prefix='plataforma') as executor:
+            futuros = {
+                executor.submit(_ejecutar_plataforma_en_thread, flujo, plataforma, filters, keywords, max_paginas, workers_fase1, workers_fase2, busqueda): plataforma
+                for plataforma in plataformas_activas
+            }
+            for futuro in concurrent.futures.as_completed(futuros):
+                consolidar(futuros[futuro], futuro.result())
+                send_progress_update(
+                    current_search_item=f"Plataforma {futuros[futuro]} terminada. {len(resultados_unicos)} resultados consolidados.",
+                    matched_publications=resultados_unicos,
+                )
+    else:
+        for i, plataforma in enumerate(plataformas_activas):
+            print(f"\n{'='*60}")
+            print(f"🏠 [PLATAFORMA {i+1}/{len(plataformas_activas)}] Procesando {plataforma}")
+            print(f"{'='*60}")
+
+            send_progress_update(current_search_item=f"Procesando plataforma {plataforma} ({i+1}/{len(plataformas_activas)})...")
+            consolidar(plataforma, _ejecutar_plataforma(plataforma, filters, keywords, max_paginas, workers_fase1, workers_fase2, busqueda))
+
+    print(f"\n🎯 [SCRAPER MULTI] Consolidados {len(resultados_unicos)} resultados únicos de {len(plataformas_activas)} plataformas")
+
     total_final = len(resultados_unicos)
     total_coincidentes = len([r for r in resultados_unicos if r.get('coincide', True)])
     
     print(f"📊 [RESUMEN MULTI] Total final: {total_final} | Coincidentes: {total_coincidentes}")
+    resumen_red = fetcher.resumen_stats()
+    if resumen_red:
+        print(f"📶 [FETCH] Métricas de red por host:\n{resumen_red}")
+    print(f"⏱️ [FASES] {metricas.resumen()}")
     
     # Mensaje final
     plataformas_str = ', '.join(plataformas_activas)
@@ -226,13 +202,114 @@ def run_scraper(filters: dict, keywords: list = None, max_paginas: int = 3, work
     return resultados_unicos
 
 
-def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas: int = 3, workers_fase1: int = 1, workers_fase2: int = 1, busqueda: 'Busqueda' = None):
+def _plataformas_en_paralelo() -> bool:
+    """Si las plataformas de una búsqueda "Todas" pueden correr cada una en su thread."""
+    conexion = transaction.get_connection()
+    # Las conexiones de Django son por thread: dentro de una transacción del llamador
+    # (p. ej. `benchmark_scraper`, que revierte lo escrito) todo debe ir por la misma
+    if conexion.in_atomic_block:
+        return False
+    if PLATAFORMAS_EN_PARALELO == 'auto':
+        # SQLite admite un solo escritor: con dos pipelines escribiendo, uno espera el lock y falla
+        return conexion.vendor != 'sqlite'
+    return PLATAFORMAS_EN_PARALELO in ('1', 'true', 'yes')
+
+
+def _ejecutar_plataforma(plataforma, filters, keywords, max_paginas, workers_fase1, workers_fase2, busqueda):
+    """Pipeline completo de una plataforma. Los errores se informan y cuentan como 0 resultados."""
+    try:
+        if plataforma == 'MercadoLibre':
+            return run_scraper_mercadolibre(filters, keywords, max_paginas, workers_fase1, workers_fase2, busqueda)
+        if plataforma == 'InfoCasas':
+            return run_scraper_infocasas(filters, keywords, max_paginas, workers_fase1, workers_fase2, busqueda)
+        print(f"❌ [SCRAPER MULTI] Plataforma no soportada: {plataforma}")
+    except Exception as e:
+        print(f"❌ [PLATAFORMA] Error en {plataforma}: {e}")
+        send_progress_update(current_search_item=f"Error en plataforma {plataforma}: {str(e)}")
+    return []
+
+
+def _ejecutar_plataforma_en_thread(flujo, plataforma, *args):
+    """`_ejecutar_plataforma` en un thread del pool, con su progreso etiquetado dentro de `flujo`."""
+    try:
+        with flujo_plataforma(flujo, plataforma):
+            return _ejecutar_plataforma(plataforma, *args)
+    finally:
+        # Cada thread abre su propia conexión a la BD: no dejarla colgada al terminar
+        connections.close_all()
+
+
+def _analizar_existentes(propiedades, palabras_clave_busqueda, keyword_groups, busqueda=None, etiqueta='NUEVO SISTEMA',
+                         predicados=None) -> List[dict]:
+    """
+    Evalúa las keywords sobre propiedades que ya están en la BD (FASE 2 no las vuelve a scrapear).
+    Relaciones keyword-propiedad y ResultadoBusqueda se resuelven en lote para todo el conjunto;
+    los predicados numéricos se evalúan en SQL con una sola query.
+    """
+    propiedades = list(propiedades)
+    if not propiedades:
+        return []
+    cumplen = ids_que_cumplen(predicados, [p.id for p in propiedades]) if predicados else None
+    descartadas = {p.id for p in propiedades if p.id not in cumplen} if cumplen is not None else None
+    try:
+        resultados_por_propiedad = procesar_propiedades_existentes(propiedades, palabras_clave_busqueda)
+        if busqueda:
+            guardar_resultados_busqueda_con_keywords(busqueda, propiedades, descartadas=descartadas)
+    except Exception as e:
+        print(f"❌ [ERROR {etiqueta}] Error procesando {len(propiedades)} propiedades existentes: {str(e)}")
+        return _analizar_existentes_fallback(propiedades, keyword_groups, busqueda, descartadas)
+
+    analizadas = []
+    for prop in propiedades:
+        # Agregar todas las propiedades existentes con su estado de coincidencia
+        todas_encontradas = all(resultados_por_propiedad.get(prop.id, {}).values()) and not (
+            descartadas and prop.id in descartadas
+        )
+        analizadas.append({
+            'title': prop.titulo or 'Sin título',
+            'url': prop.url,
+            'coincide': todas_encontradas
+        })
+        if todas_encontradas:
+            print(f"✅ [{etiqueta}] Coincide: {prop.titulo or prop.url}")
+        else:
+            print(f"❌ [{etiqueta}] No coincide: {prop.titulo or prop.url}")
+    return analizadas
+
+
+def _analizar_existentes_fallback(propiedades, keyword_groups, busqueda=None, descartadas=None) -> List[dict]:
+    """Sistema anterior: matching directo sobre el contenido almacenado, propiedad por propiedad."""
+    analizadas = []
+    with EscritorResultados() as escritor:
+        for prop in propiedades:
+            coincide_propiedad = buscar_en_contenido_almacenado(prop, keyword_groups) and not (
+                descartadas and prop.id in descartadas
+            )
+            analizadas.append({
+                'title': prop.titulo or 'Sin título',
+                'url': prop.url,
+                'coincide': coincide_propiedad
+            })
+            
+            # Crear ResultadoBusqueda si se proporciona la búsqueda
+            if busqueda:
+                escritor.agregar(busqueda, prop, coincide_propiedad)
+    return analizadas
+
+
+def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas: int = 3, workers_fase1: int = 1, workers_fase2: int = None, busqueda: 'Busqueda' = None):
     """
     Función específica de scraping para MercadoLibre (función original renombrada).
     """
     print(f"🚀 [SCRAPER] Iniciando búsqueda - Filtros: {len(filters)} | Keywords: {len(keywords) if keywords else 0}")
     matched_publications_titles: List[dict] = []
+    cronometro = metricas.Cronometro()
 
+    # Frases numéricas ("garage para 2 autos") -> predicados sobre metadata, no matching por texto
+    predicados, keywords = compilar_keywords(keywords)
+    filters = aplicar_a_filtros(predicados, filters, 'mercadolibre')
+    # Los que ya garantiza la URL no se vuelven a evaluar (el detalle puede no traer el dato)
+    predicados = pendientes_tras_filtros(predicados, filters, 'mercadolibre')
     keywords_filtradas = procesar_keywords(' '.join(keywords)) if keywords else []
     keyword_groups = build_keyword_groups(keywords_filtradas)
     keywords_con_variantes = extraer_variantes_keywords(keywords_filtradas)
@@ -252,7 +329,6 @@ def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas:
 
     cant_propiedades_omitidas = 0
     nuevas_propiedades_guardadas = 0
-    urls_a_visitar_final = set()
     titulos_por_url_total = {}
 
     try:
@@ -264,9 +340,11 @@ def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas:
         print(f"❌ [URL BUILD] Error construyendo URL: {e}")
         send_progress_update(final_message=f"❌ Error construyendo URL: {e}")
         return
+    cronometro.marcar('url_build')
 
     send_progress_update(current_search_item="🔍 Extrayendo total de resultados de MercadoLibre...")
-    total_ml = extraer_total_resultados_mercadolibre(
+    # Una sola descarga de la primera página: da el total y las URLs de la página 1 de FASE 1
+    total_ml, urls_primera_pagina, titulos_primera_pagina = primera_pagina_mercadolibre(
         url_base_con_filtros,
         api_key=API_KEY,
         use_scrapingbee=USE_THREADS and bool(API_KEY)
@@ -277,6 +355,7 @@ def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas:
     else:
         print("[Principal] No se pudo extraer el total de MercadoLibre")
         send_progress_update(current_search_item="❌ No se pudo obtener el total de resultados")
+    cronometro.marcar('total')
 
     if total_ml:
         paginas_a_buscar = min(max_paginas, (total_ml // 48) + (1 if total_ml % 48 else 0))
@@ -292,123 +371,45 @@ def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas:
         paginas_de_resultados.append(page_url)
 
     modo = 'concurrencia (ScrapingBee)' if USE_THREADS else 'secuencial (requests)'
-    print(f"\n--- FASE 1: Se intentarán recolectar {len(paginas_de_resultados)} páginas (modo: {modo}, workers: {workers_fase1 if USE_THREADS else 1}) ---")
-    send_progress_update(current_search_item=f"FASE 1: Recolectando URLs de {len(paginas_de_resultados)} páginas ({modo})...")
-    urls_recolectadas_bruto = set()
     ubicacion_param = filters.get('ciudad', filters.get('departamento', 'montevideo'))
-    if USE_THREADS:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=workers_fase1) as executor:
-            mapa_futuros = {executor.submit(recolectar_urls_de_pagina, url, API_KEY, ubicacion_param, True): url for url in paginas_de_resultados}
-            for futuro in concurrent.futures.as_completed(mapa_futuros):
-                urls_nuevas, titulos_map = futuro.result()
-                urls_recolectadas_bruto.update(urls_nuevas)
-                # Merge títulos por URL
-                if isinstance(titulos_map, dict):
-                    titulos_por_url_total.update({u: t for u, t in titulos_map.items() if u not in titulos_por_url_total})
-    else:
-        for url in paginas_de_resultados:
-            urls_nuevas, titulos_map = recolectar_urls_de_pagina(url, API_KEY, ubicacion_param, False)
-            urls_recolectadas_bruto.update(urls_nuevas)
-            if isinstance(titulos_map, dict):
-                titulos_por_url_total.update({u: t for u, t in titulos_map.items() if u not in titulos_por_url_total})
-
-    print(f"\n[Principal] FASE 1 Recolección Bruta Finalizada. Se obtuvieron {len(urls_recolectadas_bruto)} URLs en total.")
-    send_progress_update(current_search_item=f"FASE 1 completada. Se encontraron {len(urls_recolectadas_bruto)} URLs de publicaciones.")
-
-    print("\n[Principal] Iniciando chequeo de duplicados contra la base de datos...")
-    send_progress_update(current_search_item="Chequeando publicaciones existentes en la base de datos...")
     existing_publications_titles = []
+    paginas_precargadas = {url_base_con_filtros: (urls_primera_pagina, titulos_primera_pagina)} if urls_primera_pagina else {}
 
-    if urls_recolectadas_bruto:
-        # URLs que ya existen en la BD
-        urls_existentes = set(Propiedad.objects.filter(url__in=list(urls_recolectadas_bruto)).values_list('url', flat=True))
-        cant_propiedades_omitidas = len(urls_existentes)
-
-        # Inicialmente, visitaremos las URLs que no están en la BD
-        urls_a_visitar_final = set(urls_recolectadas_bruto) - set(urls_existentes)
-
-        # Si hay URLs existentes y keywords, usar el nuevo sistema de verificación
-        if urls_existentes and keywords_con_variantes:
-            print(f"🔍 [NUEVO SISTEMA] Procesando {len(urls_existentes)} propiedades existentes con nuevo sistema keywords")
-            
-            # Procesar keywords de la búsqueda actual
-            keywords_procesadas = procesar_keywords(' '.join(keywords_con_variantes))
-            palabras_clave_busqueda = []
-            
-            for keyword_data in keywords_procesadas:
-                palabra_clave = get_or_create_palabra_clave(keyword_data['texto'])
-                palabras_clave_busqueda.append(palabra_clave)
-            
-            # Cargar propiedades existentes
-            existing_properties_qs = Propiedad.objects.filter(url__in=urls_existentes)
-            
-            # Procesar cada propiedad existente
-            for prop in existing_properties_qs:
-                try:
-                    # Usar el nuevo sistema para verificar keywords
-                    resultados_keywords = procesar_propiedad_existente(prop, palabras_clave_busqueda)
-                    
-                    # Verificar si todas las keywords coinciden
-                    todas_encontradas = all(resultados_keywords.values())
-                    
-                    # Agregar todas las propiedades existentes con su estado de coincidencia
-                    existing_publications_titles.append({
-                        'title': prop.titulo or 'Sin título',
-                        'url': prop.url,
-                        'coincide': todas_encontradas
-                    })
-                    
-                    # Crear ResultadoBusqueda si se proporciona la búsqueda
-                    if busqueda:
-                        from core.search_manager import guardar_resultado_busqueda_con_keywords
-                        # Usar función que evalúa automáticamente las keywords
-                        guardar_resultado_busqueda_con_keywords(busqueda, prop)
-                    
-                    if todas_encontradas:
-                        print(f"✅ [NUEVO SISTEMA] Coincide: {prop.titulo or prop.url}")
-                    else:
-                        print(f"❌ [NUEVO SISTEMA] No coincide: {prop.titulo or prop.url}")
-                        
-                except Exception as e:
-                    print(f"❌ [ERROR NUEVO SISTEMA] Error procesando {prop.url}: {str(e)}")
-                    # Fallback al sistema anterior
-                    coincide_propiedad = buscar_en_contenido_almacenado(prop, keyword_groups)
-                    existing_publications_titles.append({
-                        'title': prop.titulo or 'Sin título',
-                        'url': prop.url,
-                        'coincide': coincide_propiedad
-                    })
-                    
-                    # Crear ResultadoBusqueda si se proporciona la búsqueda
-                    if busqueda:
-                        from core.search_manager import guardar_resultado_busqueda_con_keywords
-                        # Crear manualmente con el resultado del fallback
-                        resultado, created = ResultadoBusqueda.objects.update_or_create(
-                            busqueda=busqueda,
-                            propiedad=prop,
-                            defaults={
-                                'coincide': coincide_propiedad,
-                                'last_seen_at': timezone.now(),
-                            }
-                        )
-
-        # URLs que no están en la BD son candidatas para scraping (mantener solo URLs nuevas)
-        urls_a_visitar_final = set(urls_recolectadas_bruto) - set(urls_existentes)
-
-        # NOTE: no se contempla el caso "urls_existentes y NO keywords_con_variantes" según la especificación
-
-        # Logs internos y mensaje de estado simplificado para el usuario
-        print(f"🆕  [DEDUP] URLs nuevas a procesar: {len(urls_a_visitar_final)}")
-        print(f"🗃️  [DEDUP] Coincidentes existentes tras análisis: {len(existing_publications_titles)}")
-        # Para el usuario, solo informar cuántas existentes hay
-        send_progress_update(current_search_item=f"🗃️ {cant_propiedades_omitidas} URLs existentes analizadas en la base de datos")
-    else:
-        print("❌ [RECOLECCIÓN] No se obtuvieron URLs")
-        send_progress_update(current_search_item="No se encontraron URLs para procesar.")
+    def recolectar(url_pagina):
+        if url_pagina in paginas_precargadas:
+            return paginas_precargadas.pop(url_pagina)
+        return recolectar_urls_de_pagina(url_pagina, API_KEY, ubicacion_param, USE_THREADS and bool(API_KEY))
 
     # Atajo: si NO hay keywords, no necesitamos FASE 2 (no hay nada que validar en detalle).
     # Devolvemos directamente los links recolectados en FASE 1 como "resultados encontrados".
-    if not keywords_con_variantes:
+    # Los predicados con filtro en la URL ya los aplicó MercadoLibre; los pendientes requieren el detalle.
+    if not keywords_con_variantes and not predicados:
+        print(f"\n--- FASE 1: Se intentarán recolectar {len(paginas_de_resultados)} páginas (modo: {modo}, workers: {workers_fase1 if USE_THREADS else 1}) ---")
+        send_progress_update(current_search_item=f"FASE 1: Recolectando URLs de {len(paginas_de_resultados)} páginas ({modo})...")
+        urls_recolectadas_bruto = set()
+        if USE_THREADS:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers_fase1) as executor:
+                mapa_futuros = {executor.submit(recolectar, url): url for url in paginas_de_resultados}
+                for futuro in concurrent.futures.as_completed(mapa_futuros):
+                    urls_nuevas, titulos_map = futuro.result()
+                    urls_recolectadas_bruto.update(urls_nuevas)
+                    # Merge títulos por URL
+                    if isinstance(titulos_map, dict):
+                        titulos_por_url_total.update({u: t for u, t in titulos_map.items() if u not in titulos_por_url_total})
+        else:
+            for url in paginas_de_resultados:
+                urls_nuevas, titulos_map = recolectar(url)
+                urls_recolectadas_bruto.update(urls_nuevas)
+                if isinstance(titulos_map, dict):
+                    titulos_por_url_total.update({u: t for u, t in titulos_map.items() if u not in titulos_por_url_total})
+        cronometro.marcar('fase1')
+
+        print(f"\n[Principal] FASE 1 Recolección Bruta Finalizada. Se obtuvieron {len(urls_recolectadas_bruto)} URLs en total.")
+        send_progress_update(current_search_item=f"FASE 1 completada. Se encontraron {len(urls_recolectadas_bruto)} URLs de publicaciones.")
+        if not urls_recolectadas_bruto:
+            print("❌ [RECOLECCIÓN] No se obtuvieron URLs")
+            send_progress_update(current_search_item="No se encontraron URLs para procesar.")
+
         print("\n⏭️  [ATAJO] Sin keywords: omitiendo FASE 2 y devolviendo enlaces de FASE 1")
         send_progress_update(current_search_item="Sin keywords: devolviendo enlaces de FASE 1 (sin scrapeo de detalle)")
 
@@ -425,27 +426,16 @@ def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas:
         
         # Crear ResultadoBusqueda para todas las URLs si se proporciona búsqueda
         if busqueda:
-            for url in urls_recolectadas_bruto:
-                # Buscar o crear la propiedad
-                propiedad, created = Propiedad.objects.get_or_create(
-                    url=url,
-                    defaults={
-                        'plataforma': Plataforma.objects.get_or_create(nombre='MercadoLibre')[0],
-                        'titulo': titulos_por_url_total.get(url) or 'Publicación',
-                        'descripcion': '',
-                        'metadata': {}
-                    }
-                )
-                
-                # Crear ResultadoBusqueda (sin keywords, todas coinciden)
-                resultado_busqueda, created = ResultadoBusqueda.objects.update_or_create(
-                    busqueda=busqueda,
-                    propiedad=propiedad,
-                    defaults={
-                        'coincide': True,  # Sin keywords, todas coinciden
-                        'last_seen_at': timezone.now(),
-                    }
-                )
+            # Propiedades faltantes en un bulk_create y resultados en un bulk upsert
+            ids_por_url = crear_propiedades_basicas(
+                {url: titulos_por_url_total.get(url) or 'Publicación' for url in urls_recolectadas_bruto},
+                Plataforma.objects.get_or_create(nombre='MercadoLibre')[0]
+            )
+            with EscritorResultados(max_pendientes=len(ids_por_url) + 1) as escritor:
+                for propiedad_id in ids_por_url.values():
+                    # Crear ResultadoBusqueda (sin keywords, todas coinciden)
+                    escritor.agregar(busqueda, propiedad_id, True)
+            cronometro.marcar('db')
 
         # Para la UI actual: mostrar todo bajo 'nuevas' y no poblar 'existentes'
         all_matched_properties = {
@@ -462,136 +452,104 @@ def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas:
         # Retornar lista simple de resultados para flujos sin WebSocket (HTTP fallback/tests)
         return matched_publications_titles
 
-    if urls_a_visitar_final:
-        print(f"\n--- FASE 2: Procesamiento de propiedades nuevas con sistema keywords ({len(urls_a_visitar_final)} URLs)... ---")
-        send_progress_update(current_search_item=f"FASE 2: Procesando {len(urls_a_visitar_final)} publicaciones nuevas...")
-        
-        # Obtener plataforma MercadoLibre
-        try:
-            plataforma_ml = Plataforma.objects.get(nombre='MercadoLibre')
-        except Plataforma.DoesNotExist:
-            plataforma_ml = Plataforma.objects.create(
-                nombre='MercadoLibre',
-                url='https://www.mercadolibre.com.uy'
-            )
-        
-        # Procesar keywords de la búsqueda actual
-        if keywords_con_variantes:
-            keywords_procesadas = procesar_keywords(' '.join(keywords_con_variantes))
-            palabras_clave_busqueda = []
-            
-            for keyword_data in keywords_procesadas:
-                palabra_clave = get_or_create_palabra_clave(keyword_data['texto'])
-                palabras_clave_busqueda.append(palabra_clave)
-        else:
-            palabras_clave_busqueda = []
-        
-        urls_lista = list(urls_a_visitar_final)
-        
-        # Procesar con ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=workers_fase2) as executor:
+    # Con keywords: FASE 1 -> dedup -> FASE 2 en streaming. Cada página alimenta la dedup y los
+    # detalles apenas se descarga, así la primera coincidencia llega sin esperar todo el crawl.
+    print(f"\n--- FASE 1 + FASE 2 en streaming: hasta {len(paginas_de_resultados)} páginas (modo: {modo}) ---")
+    send_progress_update(current_search_item=f"Recolectando {len(paginas_de_resultados)} páginas y procesando publicaciones a medida que aparecen...")
+
+    # Obtener plataforma MercadoLibre
+    try:
+        plataforma_ml = Plataforma.objects.get(nombre='MercadoLibre')
+    except Plataforma.DoesNotExist:
+        plataforma_ml = Plataforma.objects.create(
+            nombre='MercadoLibre',
+            url='https://www.mercadolibre.com.uy'
+        )
+
+    # Procesar keywords de la búsqueda actual
+    keywords_procesadas = procesar_keywords(' '.join(keywords_con_variantes))
+    palabras_clave_busqueda = [get_or_create_palabra_clave(keyword_data['texto']) for keyword_data in keywords_procesadas]
+
+    def filtrar(urls, titulos):
+        """Dedup de un lote contra la BD: las existentes se evalúan acá, las nuevas van a FASE 2."""
+        nonlocal cant_propiedades_omitidas
+        with metricas.fase('dedup'):
+            titulos_por_url_total.update({u: t for u, t in titulos.items() if u not in titulos_por_url_total})
+            propiedades_existentes = list(Propiedad.objects.filter(url__in=urls))
+            urls_existentes = {prop.url for prop in propiedades_existentes}
+            if propiedades_existentes:
+                cant_propiedades_omitidas += len(urls_existentes)
+                existing_publications_titles.extend(_analizar_existentes(
+                    propiedades_existentes, palabras_clave_busqueda, keyword_groups, busqueda, predicados=predicados
+                ))
+        return [u for u in urls if u not in urls_existentes]
+
+    pipeline = PipelineStreaming(paginas_de_resultados, recolectar, filtrar)
+    # Motor asyncio: descarga/parseo concurrente; este hilo es el único que escribe en BD
+    motor = MotorFase2(
+        max_por_host=workers_fase2,
+        api_key=API_KEY,
+        use_scrapingbee=USE_THREADS and bool(API_KEY),
+        salida=pipeline.eventos,
+    )
+    print(f"⚡ [FASE2] Motor asyncio: hasta {motor.max_por_host} requests en vuelo por host, {motor.workers_parseo} workers de parseo")
+
+    escritor = EscritorResultados()
+    # Los detalles se guardan en lotes (una transacción y dos bulk upserts por lote, no por URL)
+    ingesta = IngestaPropiedades(plataforma_ml, palabras_clave_busqueda, filtros=filters)
+    procesadas = 0
+
+    def publicar(guardadas):
+        """Evalúa y reporta las propiedades de un lote recién guardado."""
+        nonlocal nuevas_propiedades_guardadas, procesadas
+        for propiedad, resultados_keywords in guardadas:
+            procesadas += 1
+            # Verificar si todas las keywords coinciden y la metadata cumple los predicados
+            coincide = all(resultados_keywords.values()) and cumple_todos(predicados, propiedad.metadata)
+            titulo_propiedad = propiedad.titulo or 'Sin título'
             
-            def procesar_propiedad_wrapper(url):
-                """Wrapper para procesar cada URL con el nuevo sistema"""
-                try:
-                    if palabras_clave_busqueda:
-                        # Usar el nuevo sistema para propiedades con keywords
-                        propiedad, resultados_keywords = procesar_propiedad_nueva(
-                            url, plataforma_ml, palabras_clave_busqueda
-                        )
-                        
-                        # Verificar si todas las keywords coinciden
-                        todas_encontradas = all(resultados_keywords.values())
-                        
-                        return {
-                            'success': True,
-                            'propiedad': propiedad,
-                            'coincide': todas_encontradas,
-                            'resultados_keywords': resultados_keywords
-                        }
-                    else:
-                        # Sin keywords, usar el sistema original de scraping
-                        datos_propiedad = scrape_detalle_con_requests(url, None, False)
-                        
-                        if datos_propiedad:
-                            # Crear propiedad directamente
-                            propiedad = Propiedad.objects.create(
-                                url=url,
-                                plataforma=plataforma_ml,
-                                titulo=datos_propiedad.get('titulo', ''),
-                                descripcion=datos_propiedad.get('descripcion', ''),
-                                metadata=datos_propiedad.get('caracteristicas', {})
-                            )
-                            
-                            return {
-                                'success': True,
-                                'propiedad': propiedad,
-                                'coincide': True,  # Sin keywords, siempre coincide
-                                'resultados_keywords': {}
-                            }
-                        else:
-                            return {'success': False, 'error': 'No se pudieron obtener datos'}
-                            
-                except Exception as e:
-                    return {'success': False, 'error': str(e)}
+            # Guardar TODAS las propiedades (coincidentes y no coincidentes)
+            nuevas_propiedades_guardadas += 1
+            matched_publications_titles.append({
+                'title': titulo_propiedad,
+                'url': propiedad.url,
+                'coincide': coincide
+            })
             
-            # Enviar tareas al pool
-            mapa_futuros = {executor.submit(procesar_propiedad_wrapper, url): url for url in urls_lista}
+            # Crear ResultadoBusqueda si se proporciona la búsqueda (se escriben en lote)
+            if busqueda:
+                escritor.agregar(busqueda, propiedad, coincide)
             
-            # Procesar resultados
-            for i, futuro in enumerate(concurrent.futures.as_completed(mapa_futuros)):
-                url_original = mapa_futuros[futuro]
-                
-                try:
-                    resultado = futuro.result()
-                    
-                    if resultado['success']:
-                        propiedad = resultado['propiedad']
-                        coincide = resultado['coincide']
-                        
-                        titulo_propiedad = propiedad.titulo or 'Sin título'
-                        
-                        # Guardar TODAS las propiedades (coincidentes y no coincidentes)
-                        nuevas_propiedades_guardadas += 1
-                        matched_publications_titles.append({
-                            'title': titulo_propiedad,
-                            'url': propiedad.url,
-                            'coincide': coincide
-                        })
-                        
-                        # Crear ResultadoBusqueda si se proporciona la búsqueda
-                        if busqueda:
-                            resultado_busqueda, created = ResultadoBusqueda.objects.update_or_create(
-                                busqueda=busqueda,
-                                propiedad=propiedad,
-                                defaults={
-                                    'coincide': coincide,
-                                    'last_seen_at': timezone.now(),
-                                }
-                            )
-                        
-                        if coincide:
-                            print(f"✅ [NUEVO SISTEMA] ({i+1}/{len(urls_lista)}) Coincide: {titulo_propiedad}")
-                            send_progress_update(
-                                current_search_item=f"({i+1}/{len(urls_lista)}) ✅ Coincide: {titulo_propiedad}",
-                                matched_publications=matched_publications_titles
-                            )
-                        else:
-                            print(f"❌ [NUEVO SISTEMA] ({i+1}/{len(urls_lista)}) No coincide: {titulo_propiedad}")
-                            send_progress_update(
-                                current_search_item=f"({i+1}/{len(urls_lista)}) ❌ No coincide: {titulo_propiedad}"
-                            )
-                    else:
-                        print(f"⚠️ [ERROR] ({i+1}/{len(urls_lista)}) Error procesando {url_original}: {resultado['error']}")
-                        send_progress_update(
-                            current_search_item=f"({i+1}/{len(urls_lista)}) ⚠️ Error procesando URL"
-                        )
-                        
-                except Exception as exc:
-                    print(f'❌ [EXCEPCIÓN] URL {url_original[:100]}... generó excepción: {exc}')
-                    send_progress_update(
-                        current_search_item=f"({i+1}/{len(urls_lista)}) ❌ Excepción procesando URL"
-                    )
+            if coincide:
+                print(f"✅ [NUEVO SISTEMA] ({procesadas}/{pipeline.urls_a_scrapear}) Coincide: {titulo_propiedad}")
+                send_progress_update(
+                    current_search_item=f"({procesadas}/{pipeline.urls_a_scrapear}) ✅ Coincide: {titulo_propiedad}",
+                    matched_publications=matched_publications_titles
+                )
+            else:
+                print(f"❌ [NUEVO SISTEMA] ({procesadas}/{pipeline.urls_a_scrapear}) No coincide: {titulo_propiedad}")
+                send_progress_update(
+                    current_search_item=f"({procesadas}/{pipeline.urls_a_scrapear}) ❌ No coincide: {titulo_propiedad}"
+                )
+
+    for url_original, detalles in pipeline.ejecutar(motor):
+        with metricas.fase('db'):
+            guardadas = ingesta.agregar(url_original, detalles)
+        publicar(guardadas)
+    with metricas.fase('db'):
+        publicar(ingesta.volcar())
+        escritor.volcar()
+    cronometro.marcar('fase2')
+
+    print(f"\n[Principal] Pipeline finalizado: {pipeline.paginas_procesadas} páginas, {pipeline.urls_recolectadas} URLs, "
+          f"{cant_propiedades_omitidas} existentes, {pipeline.urls_a_scrapear} nuevas")
+    if not pipeline.urls_recolectadas:
+        print("❌ [RECOLECCIÓN] No se obtuvieron URLs")
+        send_progress_update(current_search_item="No se encontraron URLs para procesar.")
+    else:
+        print(f"🗃️  [DEDUP] Coincidentes existentes tras análisis: {len(existing_publications_titles)}")
+        send_progress_update(current_search_item=f"🗃️ {cant_propiedades_omitidas} URLs existentes analizadas en la base de datos")
+
     print(f"✅ [COMPLETADO] {nuevas_propiedades_guardadas} nuevas propiedades guardadas")
     
     # Filtrar solo las propiedades que coinciden (coincide: True) para mostrar en la UI
@@ -616,17 +574,25 @@ def run_scraper_mercadolibre(filters: dict, keywords: list = None, max_paginas:
     return combined_for_ui
 
 
-def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int = 3, workers_fase1: int = 1, workers_fase2: int = 1, busqueda: 'Busqueda' = None):
+def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int = 3, workers_fase1: int = 1, workers_fase2: int = None, busqueda: 'Busqueda' = None):
     """
     Función específica de scraping para InfoCasas.
     Adaptada del patrón de MercadoLibre pero con las especificidades de InfoCasas.
     """
     print(f"🏠 [INFOCASAS] Iniciando scraping - Filtros: {len(filters)} | Keywords: {len(keywords) if keywords else 0}")
     matched_publications_titles: List[dict] = []
+    cronometro = metricas.Cronometro()
 
+    predicados, keywords = compilar_keywords(keywords)
+    filters = aplicar_a_filtros(predicados, filters, 'infocasas')
+    # Las URLs nuevas de InfoCasas no se scrapean (no hay metadata contra la cual evaluar): las frases
+    # que su URL no garantiza vuelven a ser keywords de texto, igual para nuevas y existentes
+    keywords = keywords + [p.frase for p in pendientes_tras_filtros(predicados, filters, 'infocasas')]
     keywords_filtradas = procesar_keywords(' '.join(keywords)) if keywords else []
     keyword_groups = build_keyword_groups(keywords_filtradas)
     keywords_con_variantes = extraer_variantes_keywords(keywords_filtradas)
+    # Sin keywords no hay nada que evaluar: los predicados que quedaron los aplicó la URL
+    usar_atajo = not keywords_con_variantes
     print(f"🔍 [INFOCASAS] Keywords filtradas: {keywords_filtradas}")
 
     USE_THREADS = False
@@ -653,9 +619,11 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
         print(f"❌ [URL BUILD IC] Error construyendo URL: {e}")
         send_progress_update(final_message=f"❌ Error construyendo URL InfoCasas: {e}")
         return []
+    cronometro.marcar('url_build')
 
     send_progress_update(current_search_item="🔍 Extrayendo total de resultados de InfoCasas...")
-    total_ic = extraer_total_resultados_infocasas(
+    # Una sola descarga de la primera página: da el total y las URLs de la página 1 de FASE 1
+    total_ic, urls_primera_pagina, titulos_primera_pagina = primera_pagina_infocasas(
         url_base_con_filtros,
         api_key=API_KEY,
         use_scrapingbee=USE_THREADS and bool(API_KEY)
@@ -667,6 +635,7 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
     else:
         print("[InfoCasas] No se pudo extraer el total")
         send_progress_update(current_search_item="❌ No se pudo obtener el total de InfoCasas")
+    cronometro.marcar('total')
 
     # Definir páginas a procesar (InfoCasas usa numeración de páginas)
     if isinstance(total_ic, int) and total_ic > 0:
@@ -690,11 +659,17 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
     send_progress_update(current_search_item=f"FASE 1 IC: Recolectando URLs de {len(paginas_de_resultados)} páginas...")
     
     urls_recolectadas_bruto = set()
+    paginas_precargadas = {url_base_con_filtros: (urls_primera_pagina, titulos_primera_pagina)} if urls_primera_pagina else {}
+
+    def recolectar(url_pagina):
+        if url_pagina in paginas_precargadas:
+            return paginas_precargadas.pop(url_pagina)
+        return recolectar_urls_infocasas_de_pagina(url_pagina, API_KEY, USE_THREADS and bool(API_KEY))
     
     if USE_THREADS:
         with concurrent.futures.ThreadPoolExecutor(max_workers=workers_fase1) as executor:
             mapa_futuros = {
-                executor.submit(recolectar_urls_infocasas_de_pagina, url, API_KEY, True): url 
+                executor.submit(recolectar, url): url 
                 for url in paginas_de_resultados
             }
             for futuro in concurrent.futures.as_completed(mapa_futuros):
@@ -704,10 +679,11 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
                     titulos_por_url_total.update({u: t for u, t in titulos_map.items() if u not in titulos_por_url_total})
     else:
         for url in paginas_de_resultados:
-            urls_nuevas, titulos_map = recolectar_urls_infocasas_de_pagina(url, API_KEY, False)
+            urls_nuevas, titulos_map = recolectar(url)
             urls_recolectadas_bruto.update(urls_nuevas)
             if isinstance(titulos_map, dict):
                 titulos_por_url_total.update({u: t for u, t in titulos_map.items() if u not in titulos_por_url_total})
+    cronometro.marcar('fase1')
 
     print(f"\n[InfoCasas] FASE 1 Finalizada. Se obtuvieron {len(urls_recolectadas_bruto)} URLs.")
     send_progress_update(current_search_item=f"FASE 1 IC completada. {len(urls_recolectadas_bruto)} URLs encontradas.")
@@ -733,8 +709,8 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
         cant_propiedades_omitidas = len(urls_existentes)
         urls_a_visitar_final = set(urls_recolectadas_bruto) - set(urls_existentes)
 
-        # Procesar propiedades existentes si hay keywords
-        if urls_existentes and keywords_con_variantes:
+        # Procesar propiedades existentes si hay keywords que evaluar
+        if urls_existentes and not usar_atajo:
             print(f"🔍 [IC EXISTENTES] Procesando {len(urls_existentes)} propiedades existentes")
             
             keywords_procesadas = procesar_keywords(' '.join(keywords_con_variantes))
@@ -749,45 +725,9 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
                 plataforma=plataforma_ic
             )
             
-            for prop in existing_properties_qs:
-                try:
-                    resultados_keywords = procesar_propiedad_existente(prop, palabras_clave_busqueda)
-                    todas_encontradas = all(resultados_keywords.values())
-                    
-                    existing_publications_titles.append({
-                        'title': prop.titulo or 'Sin título',
-                        'url': prop.url,
-                        'coincide': todas_encontradas
-                    })
-                    
-                    if busqueda:
-                        from core.search_manager import guardar_resultado_busqueda_con_keywords
-                        guardar_resultado_busqueda_con_keywords(busqueda, prop)
-                    
-                    if todas_encontradas:
-                        print(f"✅ [IC EXISTENTE] Coincide: {prop.titulo or prop.url}")
-                    else:
-                        print(f"❌ [IC EXISTENTE] No coincide: {prop.titulo or prop.url}")
-                        
-                except Exception as e:
-                    print(f"❌ [ERROR IC] Error procesando {prop.url}: {str(e)}")
-                    # Fallback
-                    coincide_propiedad = buscar_en_contenido_almacenado(prop, keyword_groups)
-                    existing_publications_titles.append({
-                        'title': prop.titulo or 'Sin título',
-                        'url': prop.url,
-                        'coincide': coincide_propiedad
-                    })
-                    
-                    if busqueda:
-                        resultado, created = ResultadoBusqueda.objects.update_or_create(
-                            busqueda=busqueda,
-                            propiedad=prop,
-                            defaults={
-                                'coincide': coincide_propiedad,
-                                'last_seen_at': timezone.now(),
-                            }
-                        )
+            existing_publications_titles.extend(_analizar_existentes(
+                existing_properties_qs, palabras_clave_busqueda, keyword_groups, busqueda, etiqueta='IC EXISTENTE'
+            ))
 
         print(f"🆕 [IC DEDUP] URLs nuevas a procesar: {len(urls_a_visitar_final)}")
         print(f"🗃️ [IC DEDUP] URLs existentes analizadas: {len(existing_publications_titles)}")
@@ -796,9 +736,10 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
     else:
         print("❌ [IC RECOLECCIÓN] No se obtuvieron URLs")
         send_progress_update(current_search_item="No se encontraron URLs de InfoCasas")
+    cronometro.marcar('dedup')
 
     # Si no hay keywords, devolver directamente los enlaces
-    if not keywords_con_variantes:
+    if usar_atajo:
         print("\n⏭️ [IC ATAJO] Sin keywords: devolviendo enlaces de FASE 1")
         send_progress_update(current_search_item="IC sin keywords: devolviendo enlaces directamente")
 
@@ -822,25 +763,15 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
                     url='https://www.infocasas.com.uy'
                 )
             
-            for url in urls_recolectadas_bruto:
-                propiedad, created = Propiedad.objects.get_or_create(
-                    url=url,
-                    defaults={
-                        'plataforma': plataforma_ic,
-                        'titulo': titulos_por_url_total.get(url) or extraer_titulo_de_url_infocasas(url),
-                        'descripcion': '',
-                        'metadata': {}
-                    }
-                )
-                
-                resultado_busqueda, created = ResultadoBusqueda.objects.update_or_create(
-                    busqueda=busqueda,
-                    propiedad=propiedad,
-                    defaults={
-                        'coincide': True,
-                        'last_seen_at': timezone.now(),
-                    }
-                )
+            ids_por_url = crear_propiedades_basicas(
+                {url: titulos_por_url_total.get(url) or extraer_titulo_de_url_infocasas(url)
+                 for url in urls_recolectadas_bruto},
+                plataforma_ic
+            )
+            with EscritorResultados(max_pendientes=len(ids_por_url) + 1) as escritor:
+                for propiedad_id in ids_por_url.values():
+                    escritor.agregar(busqueda, propiedad_id, True)
+            cronometro.marcar('db')
 
         print(f"📊 [IC RESUMEN] URLs finales: {len(matched_publications_titles)}")
         return matched_publications_titles
@@ -866,6 +797,7 @@ def run_scraper_infocasas(filters: dict, keywords: list = None, max_paginas: int
                 current_search_item=f"IC ({i}/{len(urls_a_visitar_final)}) ✅ Agregado: {titulo}",
                 matched_publications=matched_publications_titles
             )
+    cronometro.marcar('fase2')
 
     print(f"✅ [IC COMPLETADO] {len(urls_a_visitar_final)} propiedades agregadas al resultado")
     
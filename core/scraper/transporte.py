@@ -0,0 +1,187 @@
+"""Capa de transporte de `fetcher`: red real, grabación o reproducción de un corpus.
+
+Modos (`SCRAPER_TRANSPORTE` o `configurar(modo=...)`):
+    live    -> request real (comportamiento normal)
+    record  -> request real y se guarda la respuesta en el corpus
+    replay  -> no toca la red; responde desde el corpus con latencia simulada
+
+Un corpus es un directorio versionado:
+    <corpus>/manifest.json             {"formato": 1, "version": ..., "creado": ...}
+    <corpus>/respuestas/<clave>.json   url, status, headers, segundos, bytes
+    <corpus>/respuestas/<clave>.body   cuerpo crudo
+
+La clave es la misma de la caché HTTP (`cache.clave_de`), así que una URL vía
+ScrapingBee y la misma URL pedida directo no se confunden y el `api_key` no
+queda grabado. En replay, una URL que no está en el corpus lanza
+`RespuestaNoGrabada` (subclase de `ConnectionError`), y los extractores la
+tratan igual que una caída de red.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from . import cache as http_cache
+from .constants import TRANSPORTE_MODO, CORPUS_DIR, REPLAY_LATENCIA
+
+
+MODOS = ('live', 'record', 'replay')
+FORMATO_CORPUS = 1
+_HEADERS_GRABADOS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After', 'Location')
+
+_lock = threading.Lock()
+_config = {}
+
+
+class RespuestaNoGrabada(requests.exceptions.ConnectionError):
+    """La URL pedida en modo replay no existe en el corpus."""
+
+
+def _parsear_latencia(valor):
+    if valor in (None, ''):
+        return 0.0
+    if str(valor).lower() == 'grabada':
+        return 'grabada'
+    return float(valor)
+
+
+def configurar(modo: str = None, corpus: str = None, latencia_ms=None, version: str = None):
+    """Cambia el modo en tiempo de ejecución (lo usa `manage.py benchmark_scraper`)."""
+    with _lock:
+        if modo is not None:
+            if modo not in MODOS:
+                raise ValueError(f"Modo de transporte inválido: {modo} (opciones: {', '.join(MODOS)})")
+            _config['modo'] = modo
+        if corpus is not None:
+            _config['corpus'] = corpus
+        if latencia_ms is not None:
+            _config['latencia'] = _parsear_latencia(latencia_ms)
+        modo_actual = _config.get('modo', TRANSPORTE_MODO)
+        corpus_actual = _config.get('corpus', CORPUS_DIR)
+    if modo_actual == 'record':
+        abrir_corpus(corpus_actual, crear=True, version=version)
+    elif modo_actual == 'replay':
+        abrir_corpus(corpus_actual)
+
+
+def reiniciar():
+    with _lock:
+        _config.clear()
+
+
+def modo() -> str:
+    return _config.get('modo', TRANSPORTE_MODO)
+
+
+def corpus() -> str:
+    return _config.get('corpus', CORPUS_DIR)
+
+
+def _latencia():
+    if 'latencia' in _config:
+        return _config['latencia']
+    return _parsear_latencia(REPLAY_LATENCIA)
+
+
+def abrir_corpus(directorio: str, crear: bool = False, version: str = None) -> dict:
+    """Lee (o crea) el manifest del corpus y valida el formato."""
+    ruta_manifest = os.path.join(directorio, 'manifest.json')
+    if os.path.exists(ruta_manifest):
+        with open(ruta_manifest, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('formato') != FORMATO_CORPUS:
+            raise ValueError(f"Corpus {directorio} tiene formato {manifest.get('formato')}, se esperaba {FORMATO_CORPUS}")
+        return manifest
+    if not crear:
+        raise FileNotFoundError(f"No existe el corpus {directorio} (grabarlo con SCRAPER_TRANSPORTE=record)")
+    os.makedirs(os.path.join(directorio, 'respuestas'), exist_ok=True)
+    manifest = {
+        'formato': FORMATO_CORPUS,
+        'version': version or os.path.basename(os.path.normpath(directorio)),
+        'creado': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(ruta_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def info_corpus(directorio: str = None) -> dict:
+    directorio = directorio or corpus()
+    manifest = abrir_corpus(directorio)
+    carpeta = os.path.join(directorio, 'respuestas')
+    metas = [n for n in os.listdir(carpeta) if n.endswith('.json')] if os.path.isdir(carpeta) else []
+    return dict(manifest, respuestas=len(metas), directorio=directorio)
+
+
+def _rutas(clave: str):
+    base = os.path.join(corpus(), 'respuestas', clave)
+    return base + '.json', base + '.body'
+
+
+def _escribir_atomico(ruta: str, datos: bytes):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(ruta))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(datos)
+    os.replace(tmp, ruta)
+
+
+def _grabar(url, params, response, segundos):
+    clave = http_cache.clave_de(url, params)
+    ruta_meta, ruta_cuerpo = _rutas(clave)
+    if not os.path.exists(os.path.join(corpus(), 'manifest.json')):
+        abrir_corpus(corpus(), crear=True)
+    meta = {
+        'url': http_cache.normalizar_url(url, params),
+        'status': response.status_code,
+        'headers': {h: response.headers[h] for h in _HEADERS_GRABADOS if h in response.headers},
+        'segundos': round(segundos, 4),
+        'bytes': len(response.content or b''),
+    }
+    _escribir_atomico(ruta_cuerpo, response.content or b'')
+    _escribir_atomico(ruta_meta, json.dumps(meta, ensure_ascii=False, indent=1).encode('utf-8'))
+
+
+def _reproducir(url, params) -> requests.Response:
+    clave = http_cache.clave_de(url, params)
+    ruta_meta, ruta_cuerpo = _rutas(clave)
+    try:
+        with open(ruta_meta, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(ruta_cuerpo, 'rb') as f:
+            contenido = f.read()
+    except FileNotFoundError:
+        raise RespuestaNoGrabada(f"[REPLAY] URL no grabada en el corpus: {http_cache.normalizar_url(url, params)}")
+
+    latencia = _latencia()
+    espera = meta.get('segundos', 0.0) if latencia == 'grabada' else latencia / 1000.0
+    if espera > 0:
+        time.sleep(espera)
+
+    response = requests.Response()
+    response.status_code = meta['status']
+    response.url = meta['url']
+    response.headers = CaseInsensitiveDict(meta.get('headers') or {})
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = contenido
+    return response
+
+
+def get(sesion: requests.Session, url, params=None, **kwargs) -> requests.Response:
+    """GET según el modo activo. Mismos argumentos que `Session.get`."""
+    modo_actual = modo()
+    if modo_actual == 'replay':
+        return _reproducir(url, params)
+    inicio = time.perf_counter()
+    response = sesion.get(url, params=params, **kwargs)
+    if modo_actual == 'record':
+        try:
+            _grabar(url, params, response, time.perf_counter() - inicio)
+        except Exception as e:
+            print(f"⚠️ [RECORD] No se pudo grabar {url}: {e}")
+    return response
@@ -0,0 +1,97 @@
+"""Similitud por trigramas para el matching difuso de keywords.
+
+Reemplaza la heurística `v[:-2] in texto`: una variante coincide de forma
+difusa si alguna palabra del texto tiene similitud de trigramas >= umbral con
+ella (Jaccard sobre trigramas con el mismo relleno que `pg_trgm`: dos espacios
+antes y uno después de cada palabra). Cubre plurales/género y errores de tipeo:
+
+    dormitorio / dormitorios   0.77
+    luminoso / luminosa        0.64
+    garaje / garage            0.40
+
+Los trigramas de cada palabra se calculan una vez (`trigramas` está cacheada);
+`IndiceTrigramas` indexa un vocabulario por trigrama para encontrar las
+palabras similares sin compararlas todas.
+"""
+from collections import Counter
+from functools import lru_cache
+
+from .constants import UMBRAL_TRIGRAMAS
+
+
+@lru_cache(maxsize=65536)
+def trigramas(palabra: str) -> frozenset:
+    """Trigramas de una palabra ya normalizada, con relleno estilo pg_trgm."""
+    if not palabra:
+        return frozenset()
+    p = f'  {palabra} '
+    return frozenset(p[i:i + 3] for i in range(len(p) - 2))
+
+
+def similitud(a: str, b: str) -> float:
+    ta, tb = trigramas(a), trigramas(b)
+    if not ta or not tb:
+        return 0.0
+    comunes = len(ta & tb)
+    return comunes / (len(ta) + len(tb) - comunes)
+
+
+def _largo_compatible(ta, tb, umbral) -> bool:
+    # Jaccard <= min/max: si los tamaños difieren demasiado no puede alcanzar el umbral
+    menor, mayor = sorted((len(ta), len(tb)))
+    return mayor and menor >= umbral * mayor
+
+
+def palabra_similar_en(palabra: str, tokens, umbral: float = UMBRAL_TRIGRAMAS) -> bool:
+    """True si algún token tiene similitud >= umbral con la palabra."""
+    tp = trigramas(palabra)
+    for token in tokens:
+        if token == palabra:
+            return True
+        tt = trigramas(token)
+        if not _largo_compatible(tp, tt, umbral):
+            continue
+        comunes = len(tp & tt)
+        if comunes / (len(tp) + len(tt) - comunes) >= umbral:
+            return True
+    return False
+
+
+def variante_similar_en(variante_normalizada: str, tokens, umbral: float = UMBRAL_TRIGRAMAS) -> bool:
+    """Variante de una o más palabras: cada palabra debe tener un token similar en el texto."""
+    palabras = variante_normalizada.split()
+    return bool(palabras) and all(palabra_similar_en(p, tokens, umbral) for p in palabras)
+
+
+class IndiceTrigramas:
+    """Trigrama -> palabras del vocabulario que lo contienen."""
+
+    def __init__(self, vocabulario=()):
+        self._por_trigrama = {}
+        for palabra in vocabulario:
+            self.agregar(palabra)
+
+    def agregar(self, palabra):
+        for t in trigramas(palabra):
+            self._por_trigrama.setdefault(t, set()).add(palabra)
+
+    def quitar(self, palabra):
+        for t in trigramas(palabra):
+            palabras = self._por_trigrama.get(t)
+            if palabras is not None:
+                palabras.discard(palabra)
+                if not palabras:
+                    del self._por_trigrama[t]
+
+    def similares(self, palabra: str, umbral: float = UMBRAL_TRIGRAMAS) -> list:
+        """Palabras del vocabulario con similitud >= umbral (sólo mira las que comparten trigramas)."""
+        tp = trigramas(palabra)
+        if not tp:
+            return []
+        comunes = Counter()
+        for t in tp:
+            comunes.update(self._por_trigrama.get(t, ()))
+        return [
+            candidata for candidata, n in comunes.items()
+            if n / (len(tp) + len(trigramas(candidata)) - n) >= umbral
+        ]
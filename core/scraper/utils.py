@@ -1,6 +1,17 @@
+import re
 import unicodedata
 
 
+def normalizar_texto(texto: str) -> str:
+    """Normaliza texto para búsquedas"""
+    if not texto:
+        return ""
+    texto = unicodedata.normalize('NFD', texto.lower())
+    texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
+    texto = re.sub(r'[^\w\s]', '', texto)
+    return texto.strip()
+
+
 def stemming_basico(palabra: str) -> str:
     try:
         palabra = str(palabra)
@@ -14,6 +25,23 @@ def stemming_basico(palabra: str) -> str:
     return palabra
 
 
+def raiz_keyword(variante, stemming: bool = True, truncar: bool = True) -> str:
+    """Patrón más corto con el que el matcher da por presente a la variante.
+
+    La variante, su stem y `v[:-2]` son prefijos unos de otros, así que buscar
+    sólo el más corto como substring equivale a buscar los tres.
+    """
+    v = normalizar_texto(str(variante))
+    if not v:
+        return ""
+    patrones = [v]
+    if stemming and stemming_basico(v):
+        patrones.append(stemming_basico(v))
+    if truncar and len(v) > 4:
+        patrones.append(v[:-2])
+    return min(patrones, key=len)
+
+
 def extraer_variantes_keywords(keywords_filtradas):
     variantes = []
     if not keywords_filtradas:
@@ -10,19 +10,24 @@ Reemplaza el sistema anterior basado en archivos JSON.
 import uuid
 import json
 import re
-import unicodedata
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Set, Tuple
 from django.db import transaction
 from django.utils import timezone
 from django.db.models import Q, Count
 from .models import (
+    calcular_hash_texto, COLUMNAS_METADATA,
     Busqueda, PalabraClave, BusquedaPalabraClave, PalabraClavePropiedad,
     Usuario, Plataforma, Propiedad, ResultadoBusqueda, Inmobiliaria
 )
-from .scraper.utils import stemming_basico
+from .scraper.utils import normalizar_texto
+from .scraper.matcher import matcher_para_grupos
+from .scraper.predicados import parsear_numero
+from .scraper import fetcher
 from .limits import puede_realizar_accion
+from . import cache_palabras, indice_invertido
+from .escritor_resultados import EscritorResultados
+from .historial_precios import EscritorPrecios, registrar_precio
 
 # ================================
 # FUNCIONES PRINCIPALES DE BÚSQUEDA
@@ -209,6 +214,11 @@ def get_or_create_palabra_clave(texto: str, idioma: str = 'es') -> PalabraClave:
     """Obtiene o crea una palabra clave con sinónimos"""
     texto_normalizado = normalizar_texto(texto)
     
+    # Caché en proceso: las keywords ya vistas no van a la BD
+    palabra_clave = cache_palabras.obtener(texto_normalizado)
+    if palabra_clave is not None:
+        return palabra_clave
+    
     # Buscar palabra clave existente
     palabra_clave, created = PalabraClave.objects.get_or_create(
         texto=texto_normalizado,
@@ -221,6 +231,7 @@ def get_or_create_palabra_clave(texto: str, idioma: str = 'es') -> PalabraClave:
         palabra_clave.set_sinonimos(sinonimos)
         palabra_clave.save()
     
+    cache_palabras.recordar(palabra_clave)
     return palabra_clave
 
 def procesar_keywords(texto_busqueda: str) -> List[Dict[str, Any]]:
@@ -242,15 +253,6 @@ def procesar_keywords(texto_busqueda: str) -> List[Dict[str, Any]]:
 # PROCESAMIENTO DE TEXTO
 # ================================
 
-def normalizar_texto(texto: str) -> str:
-    """Normaliza texto para búsquedas"""
-    if not texto:
-        return ""
-    texto = unicodedata.normalize('NFD', texto.lower())
-    texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
-    texto = re.sub(r'[^\w\s]', '', texto)
-    return texto.strip()
-
 def extraer_palabras(texto: str) -> List[str]:
     """Extrae palabras relevantes del texto de búsqueda"""
     if not texto:
@@ -318,30 +320,30 @@ def buscar_coincidencias(busqueda_id: str, propiedades: List[Dict]) -> List[Dict
         busqueda = Busqueda.objects.get(id=busqueda_id)
         palabras_clave = busqueda.busquedapalabraclave_set.select_related('palabra_clave').all()
         
-        resultados = []
-        for prop_data in propiedades:
-            coincidencias = verificar_coincidencia(palabras_clave, prop_data)
-            if coincidencias['coincide']:
-                # Crear o actualizar propiedad en BD
-                propiedad = crear_o_actualizar_propiedad(prop_data)
-                
-                # Guardar resultado
-                resultado, created = ResultadoBusqueda.objects.get_or_create(
-                    busqueda=busqueda,
-                    propiedad=propiedad,
-                    defaults={
-                        'coincide': True,
-                        'metadata': coincidencias
-                    }
-                )
-                
-                resultados.append({
-                    'propiedad': prop_data,
-                    'coincidencias': coincidencias,
-                    'resultado_id': resultado.id
-                })
+        coincidentes = []
+        with EscritorResultados() as escritor:
+            for prop_data in propiedades:
+                coincidencias = verificar_coincidencia(palabras_clave, prop_data)
+                if coincidencias['coincide']:
+                    # Crear o actualizar propiedad en BD
+                    propiedad = crear_o_actualizar_propiedad(prop_data)
+                    escritor.agregar(busqueda, propiedad, True, metadata=coincidencias)
+                    coincidentes.append((propiedad.id, prop_data, coincidencias))
         
-        return resultados
+        # Ids de los resultados recién escritos, en una query
+        ids_resultado = dict(
+            ResultadoBusqueda.objects.filter(
+                busqueda=busqueda, propiedad_id__in=[prop_id for prop_id, _, _ in coincidentes]
+            ).values_list('propiedad_id', 'id')
+        )
+        return [
+            {
+                'propiedad': prop_data,
+                'coincidencias': coincidencias,
+                'resultado_id': ids_resultado.get(prop_id)
+            }
+            for prop_id, prop_data, coincidencias in coincidentes
+        ]
     
     except Busqueda.DoesNotExist:
         return []
@@ -349,24 +351,16 @@ def buscar_coincidencias(busqueda_id: str, propiedades: List[Dict]) -> List[Dict
 def verificar_coincidencia(palabras_clave_rel, propiedad_data: Dict) -> Dict:
     """Verifica coincidencia con lógica de grupos (OR dentro de sinónimos, AND entre palabras)."""
     texto_propiedad = f"{propiedad_data.get('titulo', '')} {propiedad_data.get('descripcion', '')}"
-    texto_normalizado = normalizar_texto(texto_propiedad)
 
     coincidencias_encontradas = []
-    total_palabras = len(palabras_clave_rel)
+    palabras_clave = [rel.palabra_clave for rel in palabras_clave_rel]
+    total_palabras = len(palabras_clave)
 
+    matcher = matcher_para_grupos(
+        [[pc.texto] + (pc.sinonimos_list or []) for pc in palabras_clave], stemming=False
+    )
     grupos_ok = []
-    for rel in palabras_clave_rel:
-        palabra_clave = rel.palabra_clave
-        variantes = [palabra_clave.texto] + (palabra_clave.sinonimos_list or [])
-        variantes_norm = [normalizar_texto(v) for v in variantes]
-        encontrada = None
-        for v, v_norm in zip(variantes, variantes_norm):
-            if v_norm in texto_normalizado:
-                encontrada = v
-                break
-            if len(v_norm) > 4 and v_norm[:-2] in texto_normalizado:
-                encontrada = v
-                break
+    for palabra_clave, encontrada in zip(palabras_clave, matcher.evaluar(texto_propiedad)):
         grupos_ok.append(bool(encontrada))
         if encontrada:
             coincidencias_encontradas.append({
@@ -423,6 +417,10 @@ def crear_o_actualizar_propiedad(prop_data: Dict) -> Propiedad:
         }
     )
 
+    # El precio que se va a pisar queda en la serie de precios
+    if not created:
+        registrar_precio(propiedad, prop_data)
+    
     # Siempre vincular plataforma y actualizar metadata/descripcion
     propiedad.plataforma = plataforma
     if 'descripcion' in prop_data:
@@ -527,34 +525,14 @@ def save_results(search_id: str, results: List[Dict]) -> bool:
     """Guarda resultados de búsqueda en la base de datos (compatibilidad)"""
     try:
         busqueda = Busqueda.objects.get(id=search_id)        
-        for result_data in results:
-            # Crear o actualizar propiedad
-            propiedad = crear_o_actualizar_propiedad(result_data)
-            
-            # Crear resultado si no existe
-            # Usar el campo coincide del resultado si está disponible, sino True por defecto
-            coincide_valor = result_data.get('coincide', True)
-            
-            resultado, created = ResultadoBusqueda.objects.get_or_create(
-                busqueda=busqueda,
-                propiedad=propiedad,
-                defaults={
-                    'coincide': coincide_valor,
-                    'metadata': result_data,
-                    'seen_count': 1,
-                    'last_seen_at': timezone.now()
-                }
-            )
-            if not created:
-                # Actualizar métricas de visualización y coincidencia
-                try:
-                    ResultadoBusqueda.objects.filter(id=resultado.id).update(
-                        seen_count=(resultado.seen_count or 0) + 1,
-                        last_seen_at=timezone.now(),
-                        coincide=coincide_valor  # Actualizar coincidencia también
-                    )
-                except Exception:
-                    pass
+        with EscritorResultados() as escritor:
+            for result_data in results:
+                # Crear o actualizar propiedad
+                propiedad = crear_o_actualizar_propiedad(result_data)
+                
+                # Usar el campo coincide del resultado si está disponible, sino True por defecto;
+                # seen_count/last_seen_at/coincide de los existentes se actualizan en el volcado
+                escritor.agregar(busqueda, propiedad, result_data.get('coincide', True), metadata=result_data)
         
         return True
         
@@ -633,59 +611,16 @@ def verificar_keywords_en_propiedad(propiedad: Propiedad, palabras_clave: List[P
     Returns:
         Dict con palabra_clave.texto como key y bool como value indicando si fue encontrada
     """
-    # Construir texto completo de la propiedad
-    titulo = propiedad.titulo or ''
-    descripcion = propiedad.descripcion or ''
-    caracteristicas = ''
-    
-    # Extraer características del metadata si existe
-    if propiedad.metadata and isinstance(propiedad.metadata, dict):
-        # Intentar usar el nuevo formato primero
-        if 'caracteristicas_texto' in propiedad.metadata:
-            caracteristicas = propiedad.metadata.get('caracteristicas_texto', '')
-        elif 'caracteristicas_dict' in propiedad.metadata:
-            # Si solo hay dict, convertir a texto
-            carac_dict = propiedad.metadata.get('caracteristicas_dict', {})
-            caracteristicas = ' '.join(f"{k}: {v}" for k, v in carac_dict.items())
-        else:
-            # Formato legacy: buscar en toda la metadata
-            caracteristicas = propiedad.metadata.get('caracteristicas', '')
-        
-        if isinstance(caracteristicas, dict):
-            # Si caracteristicas es un dict, extraer todos los valores
-            caracteristicas = ' '.join(str(v) for v in caracteristicas.values())
-    
-    texto_total = f"{titulo} {descripcion} {caracteristicas}".lower()
-    texto_normalizado = normalizar_texto(texto_total)
+    # Texto normalizado persistido en la propiedad (se recalcula sólo si falta, p. ej. antes del backfill)
+    texto_normalizado = propiedad.texto_busqueda or propiedad.calcular_texto_busqueda()
     
     resultados = {}
     
-    for palabra_clave in palabras_clave:
-        encontrada = False
-        
-        # Crear lista de variantes a buscar (palabra + sinónimos)
-        variantes = [palabra_clave.texto] + palabra_clave.sinonimos_list
-        
-        # Buscar cada variante en el texto
-        for variante in variantes:
-            variante_norm = normalizar_texto(variante)
-            
-            # Búsqueda exacta
-            if variante_norm in texto_normalizado:
-                encontrada = True
-                break
-            
-            # Búsqueda con stemming básico
-            variante_stem = stemming_basico(variante_norm)
-            if variante_stem and variante_stem in texto_normalizado:
-                encontrada = True
-                break
-            
-            # Búsqueda parcial para palabras largas (>4 caracteres)
-            if len(variante_norm) > 4 and variante_norm[:-2] in texto_normalizado:
-                encontrada = True
-                break
-        
+    # Un grupo por palabra clave (palabra + sinónimos): exacta, stemming básico y raíz aproximada
+    matcher = matcher_para_grupos([[pc.texto] + pc.sinonimos_list for pc in palabras_clave])
+    
+    for palabra_clave, variante in zip(palabras_clave, matcher.evaluar(texto_normalizado, normalizado=True)):
+        encontrada = variante is not None
         resultados[palabra_clave.texto] = encontrada
         
         # Log para debugging
@@ -721,7 +656,7 @@ def actualizar_relaciones_keywords(propiedad: Propiedad, palabras_clave: List[Pa
             relacion, created = PalabraClavePropiedad.objects.update_or_create(
                 palabra_clave=palabra_clave,
                 propiedad=propiedad,
-                defaults={'encontrada': encontrada}
+                defaults={'encontrada': encontrada, 'hash_texto': propiedad.hash_texto}
             )
             
             resultados_finales[palabra_clave.texto] = encontrada
@@ -776,7 +711,7 @@ def verificar_coincidencias_keywords(busqueda: Busqueda, propiedad: Propiedad) -
 def procesar_propiedad_existente(propiedad: Propiedad, palabras_clave: List[PalabraClave]) -> Dict[str, bool]:
     """
     Procesa una propiedad existente en BD verificando relaciones keywords existentes.
-    Solo busca keywords que no tienen relación previa con la propiedad.
+    Solo busca keywords sin relación previa con la propiedad o con el veredicto desactualizado.
     
     Args:
         propiedad: Instancia de Propiedad existente
@@ -786,31 +721,97 @@ def procesar_propiedad_existente(propiedad: Propiedad, palabras_clave: List[Pala
         Dict con resultados finales de todas las keywords
     """
     print(f"[PROCESANDO] Propiedad existente: {propiedad.titulo or propiedad.url}")
+    return procesar_propiedades_existentes([propiedad], palabras_clave).get(propiedad.id, {})
+
+
+def _cargar_relaciones_keywords(propiedad_ids, palabra_clave_ids,
+                                hashes: Optional[Dict[int, str]] = None) -> Dict[Tuple[int, int], bool]:
+    """
+    Todas las relaciones (propiedad_id, palabra_clave_id) -> encontrada del conjunto, en una query.
+    Con `hashes` (propiedad_id -> hash_texto actual) se omiten los veredictos calculados contra
+    otra versión del texto, para que quien llama los trate como faltantes.
+    """
+    if not propiedad_ids or not palabra_clave_ids:
+        return {}
+    filas = PalabraClavePropiedad.objects.filter(
+        propiedad_id__in=list(propiedad_ids),
+        palabra_clave_id__in=list(palabra_clave_ids)
+    ).values_list('propiedad_id', 'palabra_clave_id', 'encontrada', 'hash_texto')
+    return {
+        (prop_id, pc_id): encontrada
+        for prop_id, pc_id, encontrada, hash_texto in filas
+        if hashes is None or hashes.get(prop_id) == hash_texto
+    }
+
+
+def procesar_propiedades_existentes(propiedades, palabras_clave: List[PalabraClave]) -> Dict[int, Dict[str, bool]]:
+    """
+    Versión en lote de `procesar_propiedad_existente`: carga todas las relaciones keyword-propiedad
+    del conjunto en una query, evalúa en memoria sólo los pares que faltan o cuyo veredicto es de
+    otra versión del texto (hash_texto distinto) y los escribe con un único bulk upsert.
     
-    resultados_finales = {}
-    palabras_sin_relacion = []
+    Args:
+        propiedades: Iterable de Propiedad existentes
+        palabras_clave: Lista de PalabraClave de la búsqueda actual
     
-    # Verificar qué keywords ya tienen relación
-    for palabra_clave in palabras_clave:
-        try:
-            relacion = PalabraClavePropiedad.objects.get(
-                palabra_clave=palabra_clave,
-                propiedad=propiedad
-            )
-            # Ya existe relación, usar el valor almacenado
-            resultados_finales[palabra_clave.texto] = relacion.encontrada
-            print(f"[RELACIÓN EXISTENTE] {palabra_clave.texto}: {relacion.encontrada}")
-        except PalabraClavePropiedad.DoesNotExist:
-            # No existe relación, necesita ser procesada
-            palabras_sin_relacion.append(palabra_clave)
+    Returns:
+        Dict propiedad.id -> {palabra_clave.texto: encontrada}
+    """
+    propiedades = list(propiedades)
+    if not propiedades:
+        return {}
     
-    # Procesar keywords sin relación previa
-    if palabras_sin_relacion:
-        print(f"[PROCESANDO] {len(palabras_sin_relacion)} keywords sin relación previa")
-        resultados_nuevos = actualizar_relaciones_keywords(propiedad, palabras_sin_relacion)
-        resultados_finales.update(resultados_nuevos)
+    relaciones = _cargar_relaciones_keywords(
+        [p.id for p in propiedades], [pc.id for pc in palabras_clave],
+        hashes={p.id: p.hash_texto for p in propiedades}
+    )
+    grupos = [[pc.texto] + pc.sinonimos_list for pc in palabras_clave]
+    matcher = matcher_para_grupos(grupos)
+    
+    # Con índice invertido activo, las faltantes salen de intersecciones de postings en vez de recorrer textos
+    cubiertos, por_grupo = set(), []
+    if any(clave not in relaciones for p in propiedades for clave in ((p.id, pc.id) for pc in palabras_clave)):
+        consulta = indice_invertido.consultar(
+            grupos, [p.id for p in propiedades], {p.id: p.texto_busqueda for p in propiedades if p.texto_busqueda}
+        )
+        if consulta:
+            cubiertos, por_grupo = consulta
     
-    return resultados_finales
+    resultados = {}
+    nuevas = []
+    for propiedad in propiedades:
+        variantes = None
+        resultados_prop = {}
+        for i, palabra_clave in enumerate(palabras_clave):
+            clave = (propiedad.id, palabra_clave.id)
+            if clave not in relaciones:
+                if propiedad.id in cubiertos:
+                    relaciones[clave] = propiedad.id in por_grupo[i]
+                else:
+                    # Sin relación previa: evaluar una sola vez el texto de la propiedad para todas las faltantes
+                    if variantes is None:
+                        texto = propiedad.texto_busqueda or propiedad.calcular_texto_busqueda()
+                        variantes = matcher.evaluar(texto, normalizado=True)
+                    relaciones[clave] = variantes[i] is not None
+                nuevas.append(PalabraClavePropiedad(
+                    palabra_clave=palabra_clave,
+                    propiedad=propiedad,
+                    encontrada=relaciones[clave],
+                    hash_texto=propiedad.hash_texto
+                ))
+            resultados_prop[palabra_clave.texto] = relaciones[clave]
+        resultados[propiedad.id] = resultados_prop
+    
+    if nuevas:
+        # Upsert: los pares desactualizados ya existen, y otra búsqueda concurrente pudo crear los faltantes
+        PalabraClavePropiedad.objects.bulk_create(
+            nuevas, batch_size=500, update_conflicts=True,
+            unique_fields=['palabra_clave', 'propiedad'], update_fields=['encontrada', 'hash_texto', 'updated_at']
+        )
+    
+    print(f"[RELACIONES] {len(propiedades)} propiedades existentes: {len(nuevas)} relaciones nuevas o recalculadas, "
+          f"{len(propiedades) * len(palabras_clave) - len(nuevas)} reutilizadas")
+    return resultados
 
 
 def procesar_propiedad_nueva(url: str, plataforma: Plataforma, palabras_clave: List[PalabraClave]) -> Tuple[Propiedad, Dict[str, bool]]:
@@ -833,74 +834,32 @@ def procesar_propiedad_nueva(url: str, plataforma: Plataforma, palabras_clave: L
     try:
         # Scrapear detalles de la propiedad
         detalles = scrape_detalle_con_requests(url)
-        
-        if not detalles:
-            print(f"[ERROR] No se pudieron obtener detalles para {url}")
-            # Crear propiedad básica sin detalles
-            with transaction.atomic():
-                propiedad = Propiedad.objects.create(
-                    url=url,
-                    plataforma=plataforma,
-                    titulo="",
-                    descripcion="",
-                    metadata={}
-                )
-                
-                # Marcar todas las keywords como no encontradas
-                resultados = {palabra.texto: False for palabra in palabras_clave}
-                actualizar_relaciones_keywords(propiedad, palabras_clave, resultados)
-                
-                return propiedad, resultados
-        
-        # Crear propiedad con detalles scrapeados
-        with transaction.atomic():
-            # Construir metadata completo con todas las características
-            metadata_completo = {
-                'caracteristicas_dict': detalles.get('caracteristicas_dict', {}),
-                'caracteristicas_texto': detalles.get('caracteristicas_texto', ''),
-                'precio_moneda': detalles.get('precio_moneda', ''),
-                'precio_valor': detalles.get('precio_valor', 0),
-                'url_imagen': detalles.get('url_imagen', ''),
-                'tipo_inmueble': detalles.get('tipo_inmueble', ''),
-                'condicion': detalles.get('condicion', ''),
-                # Características estructurales
-                'dormitorios_min': detalles.get('dormitorios_min'),
-                'dormitorios_max': detalles.get('dormitorios_max'),
-                'banos_min': detalles.get('banos_min'),
-                'banos_max': detalles.get('banos_max'),
-                'superficie_total_min': detalles.get('superficie_total_min'),
-                'superficie_total_max': detalles.get('superficie_total_max'),
-                'superficie_cubierta_min': detalles.get('superficie_cubierta_min'),
-                'superficie_cubierta_max': detalles.get('superficie_cubierta_max'),
-                'cocheras_min': detalles.get('cocheras_min'),
-                'cocheras_max': detalles.get('cocheras_max'),
-                'antiguedad': detalles.get('antiguedad'),
-                # Características booleanas
-                'es_amoblado': detalles.get('es_amoblado', False),
-                'admite_mascotas': detalles.get('admite_mascotas', False),
-                'tiene_piscina': detalles.get('tiene_piscina', False),
-                'tiene_terraza': detalles.get('tiene_terraza', False),
-                'tiene_jardin': detalles.get('tiene_jardin', False),
-            }
-            
-            propiedad = Propiedad.objects.create(
-                url=url,
-                plataforma=plataforma,
-                titulo=detalles.get('titulo', ''),
-                descripcion=detalles.get('descripcion', ''),
-                metadata=metadata_completo
-            )
-            
-            print(f"[CREADA] Propiedad: {propiedad.titulo or propiedad.url}")
-            
-            # Procesar keywords en la nueva propiedad
-            resultados = actualizar_relaciones_keywords(propiedad, palabras_clave)
-            
-            return propiedad, resultados
-            
     except Exception as e:
         print(f"[ERROR] Error procesando propiedad nueva {url}: {str(e)}")
-        # Crear propiedad básica en caso de error
+        detalles = None
+    
+    return guardar_propiedad_nueva(url, plataforma, palabras_clave, detalles)
+
+
+def guardar_propiedad_nueva(url: str, plataforma: Plataforma, palabras_clave: List[PalabraClave],
+                            detalles: Optional[Dict[str, Any]]) -> Tuple[Propiedad, Dict[str, bool]]:
+    """
+    Persiste una propiedad nueva a partir de detalles ya scrapeados y crea sus relaciones keywords.
+    Separada de `procesar_propiedad_nueva` para que el motor de FASE 2 descargue/parsee en
+    paralelo y un único hilo escriba en BD.
+    
+    Args:
+        url: URL de la propiedad
+        plataforma: Instancia de Plataforma
+        palabras_clave: Lista de PalabraClave de la búsqueda
+        detalles: Dict devuelto por el parser de detalle, o None si no se pudo obtener
+    
+    Returns:
+        Tuple con (Propiedad creada, Dict con resultados keywords)
+    """
+    if not detalles:
+        print(f"[ERROR] No se pudieron obtener detalles para {url}")
+        # Crear propiedad básica sin detalles
         with transaction.atomic():
             propiedad = Propiedad.objects.create(
                 url=url,
@@ -915,6 +874,192 @@ def procesar_propiedad_nueva(url: str, plataforma: Plataforma, palabras_clave: L
             actualizar_relaciones_keywords(propiedad, palabras_clave, resultados)
             
             return propiedad, resultados
+    
+    # Crear propiedad con detalles scrapeados
+    with transaction.atomic():
+        propiedad = Propiedad.objects.create(
+            url=url,
+            plataforma=plataforma,
+            titulo=detalles.get('titulo', ''),
+            descripcion=detalles.get('descripcion', ''),
+            metadata=_metadata_desde_detalles(detalles)
+        )
+        
+        print(f"[CREADA] Propiedad: {propiedad.titulo or propiedad.url}")
+        
+        # Procesar keywords en la nueva propiedad
+        resultados = actualizar_relaciones_keywords(propiedad, palabras_clave)
+        
+        return propiedad, resultados
+
+
+def _metadata_desde_detalles(detalles: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata completa de una propiedad a partir de los detalles scrapeados."""
+    return {
+            'caracteristicas_dict': detalles.get('caracteristicas_dict', {}),
+            'caracteristicas_texto': detalles.get('caracteristicas_texto', ''),
+            'precio_moneda': detalles.get('precio_moneda', ''),
+            'precio_valor': detalles.get('precio_valor', 0),
+            'url_imagen': detalles.get('url_imagen', ''),
+            'tipo_inmueble': detalles.get('tipo_inmueble', ''),
+            'condicion': detalles.get('condicion', ''),
+            # Filtros de la búsqueda que la encontró (la plataforma ya los aplicó)
+            'operacion': detalles.get('operacion', ''),
+            'departamento': detalles.get('departamento', ''),
+            # Características estructurales
+            'dormitorios_min': detalles.get('dormitorios_min'),
+            'dormitorios_max': detalles.get('dormitorios_max'),
+            'banos_min': detalles.get('banos_min'),
+            'banos_max': detalles.get('banos_max'),
+            'superficie_total_min': detalles.get('superficie_total_min'),
+            'superficie_total_max': detalles.get('superficie_total_max'),
+            'superficie_cubierta_min': detalles.get('superficie_cubierta_min'),
+            'superficie_cubierta_max': detalles.get('superficie_cubierta_max'),
+            'cocheras_min': detalles.get('cocheras_min'),
+            'cocheras_max': detalles.get('cocheras_max'),
+            'antiguedad': detalles.get('antiguedad'),
+            'gastos_comunes_valor': parsear_numero(detalles.get('gastos_comunes')),
+            # Características booleanas
+            'es_amoblado': detalles.get('es_amoblado', False),
+            'admite_mascotas': detalles.get('admite_mascotas', False),
+            'tiene_piscina': detalles.get('tiene_piscina', False),
+            'tiene_terraza': detalles.get('tiene_terraza', False),
+            'tiene_jardin': detalles.get('tiene_jardin', False),
+        }
+
+
+def crear_propiedades_basicas(titulos_por_url: Dict[str, str], plataforma: Plataforma) -> Dict[str, int]:
+    """
+    Alta en lote de propiedades sin detalle (atajo sin keywords de FASE 1): una query para
+    las URLs existentes, un bulk_create de las que faltan y una para leer sus ids.
+    Las existentes no se modifican, como con `get_or_create`.
+    
+    Args:
+        titulos_por_url: Dict url -> título de la tarjeta de resultados
+        plataforma: Instancia de Plataforma
+    
+    Returns:
+        Dict url -> id de Propiedad, para todas las URLs recibidas
+    """
+    urls = list(titulos_por_url)
+    ids = {}
+    for i in range(0, len(urls), 500):
+        ids.update(Propiedad.objects.filter(url__in=urls[i:i + 500]).values_list('url', 'id'))
+    faltantes = [url for url in urls if url not in ids]
+    if not faltantes:
+        return ids
+    
+    with transaction.atomic():
+        propiedades = []
+        for url in faltantes:
+            propiedad = Propiedad(
+                url=url, plataforma=plataforma, titulo=titulos_por_url[url], descripcion='', metadata={}
+            )
+            # bulk_create no pasa por save(): texto y hash de búsqueda se calculan acá
+            propiedad.texto_busqueda = propiedad.calcular_texto_busqueda()
+            propiedad.hash_texto = calcular_hash_texto(propiedad.texto_busqueda)
+            propiedades.append(propiedad)
+        # ignore_conflicts: si otra búsqueda la creó entre la lectura y acá, se conserva la suya
+        Propiedad.objects.bulk_create(propiedades, batch_size=500, ignore_conflicts=True)
+        nuevas = {}
+        for i in range(0, len(faltantes), 500):
+            nuevas.update(Propiedad.objects.filter(url__in=faltantes[i:i + 500]).values_list('url', 'id'))
+        for propiedad in propiedades:
+            if propiedad.url in nuevas:
+                indice_invertido.registrar_cambio(nuevas[propiedad.url], '', propiedad.texto_busqueda)
+    
+    print(f"[CREADAS] {len(faltantes)} propiedades básicas en lote ({len(ids)} ya existían)")
+    ids.update(nuevas)
+    return ids
+
+
+def guardar_propiedades_nuevas(items, plataforma: Plataforma,
+                               palabras_clave: List[PalabraClave]) -> List[Tuple[Propiedad, Dict[str, bool]]]:
+    """
+    Versión en lote de `guardar_propiedad_nueva`: una transacción para todo el lote, las
+    propiedades con un bulk upsert por URL y sus relaciones keywords con
+    `procesar_propiedades_existentes` (otro bulk upsert).
+    
+    Args:
+        items: Lista de (url, detalles o None) ya scrapeados
+        plataforma: Instancia de Plataforma
+        palabras_clave: Lista de PalabraClave de la búsqueda
+    
+    Returns:
+        Lista de (Propiedad, Dict con resultados keywords), en el orden de `items`
+    """
+    # Una URL repetida en el lote se queda con sus últimos detalles
+    por_url = dict(items)
+    if not por_url:
+        return []
+    
+    with transaction.atomic():
+        anteriores = {
+            url: (prop_id, texto)
+            for url, prop_id, texto in Propiedad.objects.filter(url__in=list(por_url)).values_list(
+                'url', 'id', 'texto_busqueda'
+            )
+        }
+        textos_anteriores = {url: texto for url, (_id, texto) in anteriores.items()}
+        propiedades, fallidas = [], []
+        for url, detalles in por_url.items():
+            if not detalles:
+                print(f"[ERROR] No se pudieron obtener detalles para {url}")
+                detalles = {}
+            propiedad = Propiedad(
+                url=url,
+                plataforma=plataforma,
+                titulo=detalles.get('titulo', ''),
+                descripcion=detalles.get('descripcion', ''),
+                metadata=_metadata_desde_detalles(detalles) if detalles else {}
+            )
+            # bulk_create no pasa por save(): texto y hash de búsqueda se calculan acá
+            propiedad.texto_busqueda = propiedad.calcular_texto_busqueda()
+            propiedad.hash_texto = calcular_hash_texto(propiedad.texto_busqueda)
+            propiedad.sincronizar_columnas()
+            (propiedades if detalles else fallidas).append(propiedad)
+        
+        # Las que ya existían: el precio que el upsert va a pisar queda antes en la serie de precios
+        precios = EscritorPrecios()
+        for url, (prop_id, _texto) in anteriores.items():
+            if por_url[url]:
+                precios.agregar(prop_id, por_url[url].get('precio_valor'), por_url[url].get('precio_moneda', ''))
+        precios.volcar()
+        
+        # Upsert por URL: otra búsqueda concurrente pudo guardar la misma propiedad entre la dedup y acá
+        if propiedades:
+            Propiedad.objects.bulk_create(
+                propiedades, batch_size=500, update_conflicts=True, unique_fields=['url'],
+                update_fields=['titulo', 'descripcion', 'metadata', 'texto_busqueda', 'hash_texto', 'plataforma',
+                               'updated_at', *COLUMNAS_METADATA]
+            )
+        # Sin detalles sólo se crean: una fila vacía nunca pisa una propiedad existente
+        if fallidas:
+            Propiedad.objects.bulk_create(fallidas, batch_size=500, ignore_conflicts=True)
+        guardadas = {
+            url: (prop_id, hash_texto)
+            for url, prop_id, hash_texto in Propiedad.objects.filter(url__in=list(por_url)).values_list(
+                'url', 'id', 'hash_texto'
+            )
+        }
+        for propiedad in propiedades + fallidas:
+            propiedad.id = guardadas[propiedad.url][0]
+        # Las fallidas que ya existían (o que otra búsqueda guardó recién) se evalúan con su contenido real
+        conservadas = [p.id for p in fallidas if guardadas[p.url][1] != p.hash_texto]
+        if conservadas:
+            reales = {p.id: p for p in Propiedad.objects.filter(id__in=conservadas)}
+            fallidas = [reales.get(p.id, p) for p in fallidas]
+        for propiedad in propiedades + [p for p in fallidas if p.url not in anteriores]:
+            indice_invertido.registrar_cambio(
+                propiedad.id, textos_anteriores.get(propiedad.url, ''), propiedad.texto_busqueda
+            )
+        
+        propiedades += fallidas
+        resultados = procesar_propiedades_existentes(propiedades, palabras_clave)
+    
+    print(f"[CREADAS] {len(propiedades)} propiedades en lote ({len(textos_anteriores)} ya existían)")
+    por_id = {p.url: p for p in propiedades}
+    return [(por_id[url], resultados.get(por_id[url].id, {})) for url in por_url]
 
 
 def guardar_resultado_busqueda_con_keywords(busqueda: Busqueda, propiedad: Propiedad) -> ResultadoBusqueda:
@@ -931,24 +1076,101 @@ def guardar_resultado_busqueda_con_keywords(busqueda: Busqueda, propiedad: Propi
     # Verificar si todas las keywords de la búsqueda coinciden
     coincide = verificar_coincidencias_keywords(busqueda, propiedad)
     
-    # Crear o actualizar el resultado
-    resultado, created = ResultadoBusqueda.objects.update_or_create(
-        busqueda=busqueda,
-        propiedad=propiedad,
-        defaults={
-            'coincide': coincide,
-            'last_seen_at': timezone.now(),
-        }
+    # Crear o actualizar el resultado (seen_count se incrementa en SQL si ya existía)
+    with EscritorResultados() as escritor:
+        escritor.agregar(busqueda, propiedad, coincide)
+    
+    estado = "coincide" if coincide else "no coincide"
+    print(f"[RESULTADO] guardado: {busqueda.nombre_busqueda or 'Búsqueda'} - {propiedad.titulo or propiedad.url} ({estado})")
+
+
+def guardar_resultados_busqueda_con_keywords(busqueda: Busqueda, propiedades,
+                                             descartadas: Optional[Set[int]] = None) -> Dict[int, bool]:
+    """
+    Versión en lote de `guardar_resultado_busqueda_con_keywords`: decide `coincide` con las
+    relaciones de todas las propiedades (una query) y hace upsert de los ResultadoBusqueda
+    con `EscritorResultados`.
+    
+    Args:
+        busqueda: Instancia de Busqueda
+        propiedades: Iterable de Propiedad
+        descartadas: Ids que no coinciden aunque tengan todas las keywords (p. ej. no cumplen
+            los predicados numéricos de la búsqueda)
+    
+    Returns:
+        Dict propiedad.id -> coincide
+    """
+    propiedades = list(propiedades)
+    if not propiedades:
+        return {}
+    
+    prop_ids = [p.id for p in propiedades]
+    keyword_ids = list(
+        BusquedaPalabraClave.objects.filter(busqueda=busqueda).values_list('palabra_clave_id', flat=True)
     )
+    relaciones = _cargar_relaciones_keywords(prop_ids, keyword_ids)
+    # Sin keywords específicas la propiedad coincide; una relación faltante cuenta como no encontrada
+    coincidencias = {
+        prop_id: all(relaciones.get((prop_id, pc_id), False) for pc_id in keyword_ids)
+        and not (descartadas and prop_id in descartadas)
+        for prop_id in prop_ids
+    }
     
-    # Incrementar contador si ya existía
-    if not created:
-        resultado.seen_count += 1
-        resultado.save()
+    with EscritorResultados(max_pendientes=len(prop_ids) + 1) as escritor:
+        for prop_id, coincide in coincidencias.items():
+            escritor.agregar(busqueda, prop_id, coincide)
     
-    accion = "creado" if created else "actualizado"
-    estado = "coincide" if coincide else "no coincide"
-    print(f"[RESULTADO] {accion}: {busqueda.nombre_busqueda or 'Búsqueda'} - {propiedad.titulo or propiedad.url} ({estado})")
+    print(f"[RESULTADOS] {busqueda.nombre_busqueda or 'Búsqueda'}: {len(coincidencias)} guardados, "
+          f"{sum(coincidencias.values())} coinciden")
+    return coincidencias
+
+
+def reevaluar_busqueda(busqueda_id: str, progress_callback=None) -> Dict[str, Any]:
+    """
+    Reevalúa las keywords de una búsqueda sobre todas sus propiedades ya guardadas, sin scrapear.
+    Las relaciones keyword-propiedad se recalculan en lote (ver core/evaluacion_lote.py) y
+    `coincide` de los ResultadoBusqueda se actualiza con un único UPDATE.
+    
+    Args:
+        busqueda_id: ID de la búsqueda
+        progress_callback: Función opcional para reportar progreso
+    
+    Returns:
+        Dict con estadísticas de la reevaluación
+    """
+    from .evaluacion_lote import reevaluar_palabras_clave
+    
+    busqueda = Busqueda.objects.get(id=busqueda_id)
+    palabras_clave = [
+        rel.palabra_clave for rel in busqueda.busquedapalabraclave_set.select_related('palabra_clave')
+    ]
+    propiedades = Propiedad.objects.filter(resultadobusqueda__busqueda=busqueda)
+    stats = reevaluar_palabras_clave(
+        palabras_clave, propiedades, sobrescribir=True, progress_callback=progress_callback
+    )
+    
+    resultados = ResultadoBusqueda.objects.filter(busqueda=busqueda)
+    if palabras_clave:
+        # Coinciden las propiedades con TODAS las keywords de la búsqueda encontradas
+        coincidentes = (
+            PalabraClavePropiedad.objects.filter(
+                propiedad__resultadobusqueda__busqueda=busqueda,
+                palabra_clave__in=palabras_clave,
+                encontrada=True
+            )
+            .values('propiedad_id')
+            .annotate(encontradas=Count('palabra_clave_id', distinct=True))
+            .filter(encontradas=len(palabras_clave))
+            .values('propiedad_id')
+        )
+        stats['coinciden'] = resultados.filter(propiedad_id__in=coincidentes).update(coincide=True)
+        resultados.exclude(propiedad_id__in=coincidentes).update(coincide=False)
+    else:
+        stats['coinciden'] = resultados.update(coincide=True)
+    
+    print(f"[REEVALUACIÓN] {busqueda.nombre_busqueda or 'Búsqueda'}: {stats['propiedades']} propiedades, "
+          f"{stats['coinciden']} coinciden")
+    return stats
 
 
 # ================================
@@ -1289,53 +1511,44 @@ def _actualizar_propiedades_existentes(urls_mantenidas: Set[str], busqueda, prog
     if progress_callback:
         progress_callback(f"Actualizando {len(urls_mantenidas)} propiedades existentes...")
     
-    propiedades_actualizadas = []
-    
     # Obtener propiedades existentes
-    propiedades_existentes = Propiedad.objects.filter(url__in=urls_mantenidas)
+    propiedades_existentes = list(Propiedad.objects.filter(url__in=urls_mantenidas))
     
-    for i, propiedad in enumerate(propiedades_existentes):
-        if progress_callback and i % 10 == 0:
-            progress_callback(f"Actualizando propiedad {i+1}/{len(propiedades_existentes)}")
-        
-        try:
-            # Scraping ligero para actualizar precio
-            from .scraper.extractors import scrape_detalle_con_requests
-            datos_actualizados = scrape_detalle_con_requests(propiedad.url)
+    # Los precios se agregan a la serie de cada propiedad (sólo si cambiaron), en lote
+    with EscritorPrecios() as precios:
+        for i, propiedad in enumerate(propiedades_existentes):
+            if progress_callback and i % 10 == 0:
+                progress_callback(f"Actualizando propiedad {i+1}/{len(propiedades_existentes)}")
             
-            if datos_actualizados:
-                # Actualizar solo precio y metadatos relevantes
-                precio_anterior = propiedad.metadata.get('precio_valor') if propiedad.metadata else None
-                precio_nuevo = datos_actualizados.get('precio_valor')
+            try:
+                # Scraping ligero para actualizar precio
+                from .scraper.extractors import scrape_detalle_con_requests
+                datos_actualizados = scrape_detalle_con_requests(propiedad.url)
                 
-                if precio_nuevo and precio_nuevo != precio_anterior:
-                    # Actualizar metadata con nuevo precio
-                    metadata_actualizada = propiedad.metadata.copy() if propiedad.metadata else {}
-                    metadata_actualizada.update({
-                        'precio_valor': precio_nuevo,
-                        'precio_moneda': datos_actualizados.get('precio_moneda', ''),
-                        'ultima_actualizacion_precio': timezone.now().isoformat()
-                    })
-                    propiedad.metadata = metadata_actualizada
-                    propiedad.save()
+                if datos_actualizados:
+                    precios.agregar(
+                        propiedad, datos_actualizados.get('precio_valor'), datos_actualizados.get('precio_moneda', '')
+                    )
                     
-                    propiedades_actualizadas.append({
-                        'url': propiedad.url,
-                        'titulo': propiedad.titulo,
-                        'precio_anterior': precio_anterior,
-                        'precio_nuevo': precio_nuevo
-                    })
-                
-                # Actualizar last_seen_at en ResultadoBusqueda
-                ResultadoBusqueda.objects.filter(
-                    busqueda=busqueda,
-                    propiedad=propiedad
-                ).update(last_seen_at=timezone.now())
-                
-        except Exception as e:
-            print(f"Error actualizando propiedad {propiedad.url}: {e}")
+                    # Actualizar last_seen_at en ResultadoBusqueda
+                    ResultadoBusqueda.objects.filter(
+                        busqueda=busqueda,
+                        propiedad=propiedad
+                    ).update(last_seen_at=timezone.now())
+                    
+            except Exception as e:
+                print(f"Error actualizando propiedad {propiedad.url}: {e}")
     
-    return propiedades_actualizadas
+    por_id = {propiedad.id: propiedad for propiedad in propiedades_existentes}
+    return [
+        {
+            'url': por_id[cambio['propiedad_id']].url,
+            'titulo': por_id[cambio['propiedad_id']].titulo,
+            'precio_anterior': cambio['precio_anterior'],
+            'precio_nuevo': cambio['precio_nuevo']
+        }
+        for cambio in precios.cambios
+    ]
 
 
 def _verificar_existencia_propiedad(url: str) -> bool:
@@ -1343,7 +1556,7 @@ def _verificar_existencia_propiedad(url: str) -> bool:
     Verifica si una propiedad aún existe en la plataforma mediante HTTP request
     """
     try:
-        response = requests.get(url, timeout=10, allow_redirects=True)
+        response = fetcher.fetch(url, timeout=10)
         
         # Considerar que existe si:
         # - Status 200
@@ -1407,7 +1620,8 @@ def _guardar_propiedad_desde_datos(datos: Dict, url: str) -> Propiedad:
     )
     
     if not created:
-        # Actualizar datos existentes
+        # Actualizar datos existentes (el precio que se pisa queda en la serie de precios)
+        registrar_precio(propiedad, datos)
         propiedad.titulo = datos.get('titulo', propiedad.titulo)
         propiedad.descripcion = datos.get('descripcion', propiedad.descripcion)
         propiedad.metadata = datos
@@ -1421,26 +1635,12 @@ def _verificar_coincidencia_keywords(propiedad: Propiedad, keywords: List[str])
     if not keywords:
         return True
     
-    # Texto a analizar (título + descripción + características)
-    texto_analizar = []
-    
-    if propiedad.titulo:
-        texto_analizar.append(propiedad.titulo.lower())
-    
-    if propiedad.descripcion:
-        texto_analizar.append(propiedad.descripcion.lower())
-    
-    # Agregar características desde metadata
-    if propiedad.metadata:
-        caracteristicas = propiedad.metadata.get('caracteristicas_texto', '')
-        if caracteristicas:
-            texto_analizar.append(caracteristicas.lower())
-    
-    texto_completo = ' '.join(texto_analizar)
+    # Texto a analizar (título + descripción + características), ya normalizado en la propiedad
+    texto_completo = propiedad.texto_busqueda or propiedad.calcular_texto_busqueda()
     
     # Verificar coincidencias
     for keyword in keywords:
-        if keyword.lower() in texto_completo:
+        if normalizar_texto(keyword) in texto_completo:
             return True
     
     return False
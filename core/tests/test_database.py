@@ -15,6 +15,7 @@ from core.models import (
     Inmobiliaria, Usuario, Plataforma, Busqueda, 
     PalabraClave, BusquedaPalabraClave, Propiedad, ResultadoBusqueda
 )
+from core.indice_texto import propiedades_que_coinciden
 from core.search_manager import (
     get_all_searches, get_all_search_history, get_search, save_search, delete_search,
     procesar_keywords, get_or_create_palabra_clave, 
@@ -104,6 +105,45 @@ class TestModelsDatabase(TestCase):
         self.assertIn("apartamento", palabras)
         self.assertIn("garage", palabras)
 
+    def test_propiedad_texto_busqueda(self):
+        """Test texto de búsqueda normalizado mantenido en cada save"""
+        propiedad = Propiedad.objects.create(
+            url="https://test.com/prop-texto",
+            titulo="Casa con Balcón",
+            descripcion="Muy luminosa.",
+            plataforma=self.plataforma,
+            metadata={"caracteristicas_texto": "Garaje: Sí"}
+        )
+        self.assertEqual(propiedad.texto_busqueda, "casa con balcon muy luminosa garaje si")
+
+        propiedad.descripcion = "Con PISCINA"
+        propiedad.save(update_fields=["descripcion"])
+        propiedad.refresh_from_db()
+        self.assertIn("piscina", propiedad.texto_busqueda)
+        self.assertNotIn("luminosa", propiedad.texto_busqueda)
+
+    def test_propiedad_columnas_desde_metadata(self):
+        """Atributos de metadata copiados a columnas tipadas en cada save"""
+        propiedad = Propiedad.objects.create(
+            url="https://test.com/prop-columnas",
+            titulo="Apartamento",
+            plataforma=self.plataforma,
+            metadata={"precio_valor": "150000", "precio_moneda": "usd", "dormitorios_max": 2,
+                      "tiene_piscina": True, "tipo_inmueble": "N/A", "departamento": "Montevideo"}
+        )
+        self.assertEqual(
+            Propiedad.objects.filter(precio_moneda="USD", precio_valor__lte=150000, dormitorios_max__gte=2,
+                                     tiene_piscina=True, departamento="montevideo").get(),
+            propiedad
+        )
+        self.assertEqual(propiedad.tipo_inmueble, "")
+
+        propiedad.metadata = {**propiedad.metadata, "precio_valor": 120000, "dormitorios_max": "N/A"}
+        propiedad.save(update_fields=["metadata"])
+        propiedad.refresh_from_db()
+        self.assertEqual(propiedad.precio_valor, 120000)
+        self.assertIsNone(propiedad.dormitorios_max)
+
 
 class TestSearchManagerDatabase(TestCase):
     """Tests para el search_manager con base de datos"""
@@ -493,3 +533,40 @@ class TestDatabasePerformance(TestCase):
         
         # Performance debe ser aceptable
         self.assertLess(creation_time, 2.0)
+
+
+class TestIndiceTexto(TestCase):
+    """Tests del índice full-text sobre Propiedad.texto_busqueda"""
+    
+    def setUp(self):
+        plataforma = Plataforma.objects.create(nombre="Test", url="https://test.com")
+        self.con_garaje = Propiedad.objects.create(
+            url="https://test.com/1", titulo="Casa con garajes y aire acondicionado", plataforma=plataforma
+        )
+        self.con_cochera = Propiedad.objects.create(
+            url="https://test.com/2", titulo="Apartamento con cochera", plataforma=plataforma
+        )
+        self.sin_nada = Propiedad.objects.create(
+            url="https://test.com/3", titulo="Monoambiente luminoso", plataforma=plataforma
+        )
+    
+    def test_grupos_or_dentro_and_entre(self):
+        """OR dentro del grupo, AND entre grupos, con prefijos de raíz"""
+        grupos = [['garaje', 'cochera']]
+        self.assertEqual(
+            set(propiedades_que_coinciden(grupos).values_list('id', flat=True)),
+            {self.con_garaje.id, self.con_cochera.id}
+        )
+        grupos = [['garaje', 'cochera'], ['aire acondicionado']]
+        self.assertEqual(list(propiedades_que_coinciden(grupos).values_list('id', flat=True)), [self.con_garaje.id])
+        self.assertEqual(propiedades_que_coinciden([]).count(), 3)
+    
+    def test_indice_sigue_actualizaciones(self):
+        """El índice refleja ediciones y borrados de propiedades"""
+        self.sin_nada.descripcion = "Incluye cochera"
+        self.sin_nada.save()
+        self.con_cochera.delete()
+        self.assertEqual(
+            list(propiedades_que_coinciden([['cochera']]).values_list('id', flat=True)),
+            [self.sin_nada.id]
+        )
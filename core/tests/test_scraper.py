@@ -2,8 +2,10 @@
 Tests para el módulo scraper refactorizado
 """
 
-from django.test import TestCase
+from django.test import TestCase, SimpleTestCase
 from unittest.mock import patch, MagicMock, Mock
+import time
+
 import requests
 from core.scraper import (
     run_scraper, scrape_mercadolibre, build_mercadolibre_url,
@@ -115,7 +117,7 @@ class ScraperModularTest(TestCase):
 class ScraperIntegrationTest(TestCase):
     """Tests de integración del scraper"""
     
-    @patch('core.scraper.mercadolibre.requests.get')
+    @patch('core.scraper.fetcher.fetch')
     def test_extraer_total_resultados_success(self, mock_get):
         """Test exitoso de extracción de total de resultados"""
         # Mock de respuesta HTML
@@ -131,7 +133,7 @@ class ScraperIntegrationTest(TestCase):
         total = extraer_total_resultados_mercadolibre('http://test.com')
         self.assertIsInstance(total, int)
         
-    @patch('core.scraper.mercadolibre.requests.get')
+    @patch('core.scraper.fetcher.fetch')
     def test_extraer_total_resultados_failure(self, mock_get):
         """Test de fallo en extracción de total"""
         mock_get.side_effect = requests.RequestException("Network error")
@@ -139,7 +141,7 @@ class ScraperIntegrationTest(TestCase):
         total = extraer_total_resultados_mercadolibre('http://test.com')
         self.assertIsNone(total)
         
-    @patch('core.scraper.mercadolibre.requests.get')
+    @patch('core.scraper.fetcher.fetch')
     def test_scrape_detalle_con_requests_success(self, mock_get):
         """Test exitoso de scraping de detalle"""
         mock_response = Mock()
@@ -162,7 +164,7 @@ class ScraperIntegrationTest(TestCase):
             # Es válido que retorne None si no encuentra los selectores esperados
             self.assertIsNone(datos)
         
-    @patch('core.scraper.mercadolibre.requests.get')
+    @patch('core.scraper.fetcher.fetch')
     def test_scrape_detalle_con_requests_failure(self, mock_get):
         """Test de fallo en scraping de detalle"""
         mock_get.side_effect = requests.RequestException("Network error")
@@ -246,6 +248,58 @@ class ScraperRunIntegrationTest(TestCase):
         self.assertIsInstance(resultado, list)  # Debe retornar alguna lista
 
 
+class ScraperMultiPlataformaTest(SimpleTestCase):
+    """Búsquedas "Todas": las plataformas corren en paralelo y el progreso se une en un stream"""
+
+    def _plataforma_lenta(self, nombre, urls):
+        def _run(*args, **kwargs):
+            from core.scraper.progress import send_progress_update
+            send_progress_update(total_found=len(urls), current_search_item=f"Total {nombre}")
+            time.sleep(0.3)
+            send_progress_update(final_message=f"{nombre} listo", matched_publications=[{'url': u} for u in urls])
+            return [{'title': u, 'url': u} for u in urls]
+        return _run
+
+    @patch('core.scraper.progress.get_channel_layer', return_value=None)
+    def test_todas_en_paralelo_y_consolidado(self, _mock_layer):
+        mensajes = []
+        ml = self._plataforma_lenta('ML', ['https://ml/1', 'https://comun/1'])
+        ic = self._plataforma_lenta('IC', ['https://ic/1', 'https://comun/1'])
+        with patch('core.scraper.run.run_scraper_mercadolibre', side_effect=ml), \
+                patch('core.scraper.run.run_scraper_infocasas', side_effect=ic), \
+                patch('core.scraper.run.PLATAFORMAS_EN_PARALELO', 'true'), \
+                patch('core.scraper.progress.print', side_effect=lambda m: mensajes.append(m), create=True):
+            inicio = time.perf_counter()
+            resultado = run_scraper({'tipo': 'apartamento'}, [], plataforma='todas')
+            duracion = time.perf_counter() - inicio
+
+        self.assertLess(duracion, 0.55)  # ~ la más lenta (0.3s), no la suma (0.6s)
+        self.assertEqual(sorted(r['url'] for r in resultado), ['https://comun/1', 'https://ic/1', 'https://ml/1'])
+        finales = [m for m in mensajes if m.startswith('✅ [FINAL]')]
+        self.assertEqual(len(finales), 1)  # sólo el cierre del orquestador
+        self.assertTrue(any('[MercadoLibre] ML listo' in m for m in mensajes))
+        self.assertTrue(any('[InfoCasas] IC listo' in m for m in mensajes))
+
+    def test_sqlite_no_corre_en_paralelo(self):
+        """En modo 'auto' SQLite (un solo escritor) corre las plataformas una tras otra"""
+        from core.scraper.run import _plataformas_en_paralelo
+        from django.db import connection
+        with patch('core.scraper.run.PLATAFORMAS_EN_PARALELO', 'auto'):
+            self.assertEqual(_plataformas_en_paralelo(), connection.vendor != 'sqlite')
+        with patch('core.scraper.run.PLATAFORMAS_EN_PARALELO', 'false'):
+            self.assertFalse(_plataformas_en_paralelo())
+
+    def test_flujo_combinado_suma_totales(self):
+        from core.scraper.progress import FlujoCombinado
+        flujo = FlujoCombinado()
+        flujo.adaptar('MercadoLibre', 100, None, [{'url': 'a'}], None, None)
+        total, item, coincidencias, final, _ = flujo.adaptar('InfoCasas', 20, 'hola', [{'url': 'b'}], None, None)
+        self.assertEqual(total, 120)
+        self.assertEqual(item, '[InfoCasas] hola')
+        self.assertEqual([c['url'] for c in coincidencias], ['a', 'b'])
+        self.assertIsNone(final)
+
+
 class ScraperUtilsTest(TestCase):
     """Tests para utilidades del scraper"""
     
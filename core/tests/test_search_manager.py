@@ -11,8 +11,11 @@ from core.models import Busqueda, PalabraClave, Propiedad, ResultadoBusqueda, Us
 from core.search_manager import (
     get_all_searches, get_all_search_history, get_search, save_search, delete_search,
     procesar_keywords, get_or_create_palabra_clave, buscar_coincidencias,
-    create_search, update_search, load_results, save_results, get_search_stats
+    create_search, update_search, load_results, save_results, get_search_stats,
+    procesar_propiedades_existentes, guardar_resultados_busqueda_con_keywords, reevaluar_busqueda
 )
+from core.models import BusquedaPalabraClave, PalabraClavePropiedad
+from core import cache_palabras
 
 
 class SearchManagerCoreTest(TestCase):
@@ -175,7 +178,24 @@ class SearchManagerKeywordsTest(TestCase):
         # Segunda llamada - obtener existente
         palabra2 = get_or_create_palabra_clave('garaje')
         self.assertEqual(palabra1.id, palabra2.id)
-        
+
+    def test_cache_palabras_clave(self):
+        """Test caché en proceso: keywords ya vistas sin queries, invalidada al guardar"""
+        self.addCleanup(cache_palabras.limpiar)
+        # La caché sólo se llena al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            procesar_keywords("apartamento garaje")
+
+        with self.assertNumQueries(0):
+            resultado = procesar_keywords("Apartamento con GARAJE")
+        self.assertEqual([item['texto'] for item in resultado], ['apartamento', 'garaje'])
+
+        palabra = get_or_create_palabra_clave('garaje')
+        palabra.set_sinonimos(['cochera'])
+        palabra.save()
+        self.assertIsNone(cache_palabras.obtener('garaje'))
+        self.assertEqual(get_or_create_palabra_clave('garaje').sinonimos_list, ['cochera'])
+
     def test_buscar_coincidencias(self):
         """Test de búsqueda de coincidencias"""
         # Crear búsqueda primero
@@ -333,6 +353,298 @@ class SearchManagerResultsTest(TestCase):
         self.assertGreaterEqual(stats['total_properties'], 1)
 
 
+class SearchManagerRelacionesLoteTest(TestCase):
+    """Tests de la resolución en lote de relaciones keyword-propiedad"""
+    
+    def setUp(self):
+        self.plataforma = Plataforma.objects.create(nombre="Test Platform", url="http://test.com")
+        self.busqueda = Busqueda.objects.create(nombre_busqueda="Lote", texto_original="garaje piscina")
+        self.palabras = [
+            PalabraClave.objects.create(texto="garaje"),
+            PalabraClave.objects.create(texto="piscina"),
+        ]
+        for palabra in self.palabras:
+            BusquedaPalabraClave.objects.create(busqueda=self.busqueda, palabra_clave=palabra)
+        self.propiedades = [
+            Propiedad.objects.create(
+                url=f"http://test.com/p{i}",
+                titulo="Casa con garaje y piscina" if i % 2 == 0 else "Casa con garaje",
+                plataforma=self.plataforma
+            )
+            for i in range(10)
+        ]
+    
+    def test_relaciones_y_resultados_en_lote(self):
+        """Pocas queries para todo el conjunto, y la segunda pasada reutiliza las relaciones"""
+        with self.assertNumQueries(2):
+            resultados = procesar_propiedades_existentes(self.propiedades, self.palabras)
+        self.assertEqual(PalabraClavePropiedad.objects.count(), 20)
+        self.assertEqual(resultados[self.propiedades[0].id], {'garaje': True, 'piscina': True})
+        self.assertEqual(resultados[self.propiedades[1].id], {'garaje': True, 'piscina': False})
+        
+        with self.assertNumQueries(1):
+            procesar_propiedades_existentes(self.propiedades, self.palabras)
+        
+        coincidencias = guardar_resultados_busqueda_con_keywords(self.busqueda, self.propiedades)
+        self.assertEqual(sum(coincidencias.values()), 5)
+        self.assertEqual(ResultadoBusqueda.objects.filter(busqueda=self.busqueda, coincide=True).count(), 5)
+        
+        guardar_resultados_busqueda_con_keywords(self.busqueda, self.propiedades)
+        self.assertEqual(ResultadoBusqueda.objects.filter(busqueda=self.busqueda).count(), 10)
+        self.assertTrue(all(rb.seen_count == 1 for rb in ResultadoBusqueda.objects.filter(busqueda=self.busqueda)))
+    
+    def test_veredictos_desactualizados(self):
+        """Sólo se recalculan los veredictos de propiedades cuyo texto cambió"""
+        from core.evaluacion_lote import recalcular_desactualizadas
+        procesar_propiedades_existentes(self.propiedades, self.palabras)
+        cambiada = self.propiedades[1]
+        cambiada.titulo = "Casa con garaje y piscina"
+        cambiada.save()
+        self.assertEqual(PalabraClavePropiedad.desactualizadas().count(), 2)
+        
+        with self.assertNumQueries(2):
+            resultados = procesar_propiedades_existentes(self.propiedades, self.palabras)
+        self.assertEqual(resultados[cambiada.id], {'garaje': True, 'piscina': True})
+        self.assertEqual(PalabraClavePropiedad.desactualizadas().count(), 0)
+        self.assertEqual(PalabraClavePropiedad.objects.count(), 20)
+        
+        # Cambio que no pasa por save(): lo corrige la pasada de fondo
+        otra = self.propiedades[3]
+        Propiedad.objects.filter(id=otra.id).update(texto_busqueda='casa con piscina', hash_texto='otro')
+        stats = recalcular_desactualizadas()
+        self.assertEqual(stats, {'palabras': 2, 'actualizadas': 2})
+        self.assertFalse(PalabraClavePropiedad.objects.get(palabra_clave=self.palabras[0], propiedad=otra).encontrada)
+        self.assertFalse(PalabraClavePropiedad.desactualizadas().exists())
+    
+    def test_predicados_en_sql(self):
+        """Frases numéricas evaluadas en la BD sobre la metadata, y excluidas del coincide"""
+        from core.scraper.predicados import compilar_keywords, ids_que_cumplen
+        for i, propiedad in enumerate(self.propiedades):
+            propiedad.metadata = {'cocheras_min': i % 3, 'cocheras_max': i % 3, 'gastos_comunes_valor': 1000 * i}
+            propiedad.save()
+        predicados, restantes = compilar_keywords(['garage para 2 autos', 'gastos comunes menores a 5.000 pesos'])
+        self.assertEqual(restantes, [])
+        ids = [p.id for p in self.propiedades]
+        with self.assertNumQueries(1):
+            cumplen = ids_que_cumplen(predicados, ids)
+        self.assertEqual(cumplen, {self.propiedades[2].id, self.propiedades[5].id})
+        
+        procesar_propiedades_existentes(self.propiedades, self.palabras)
+        coincidencias = guardar_resultados_busqueda_con_keywords(
+            self.busqueda, self.propiedades, descartadas=set(ids) - cumplen
+        )
+        # Sólo la 2 tiene garaje y piscina (pares) y además cumple los predicados
+        self.assertEqual([pid for pid, c in coincidencias.items() if c], [self.propiedades[2].id])
+    
+    def test_reevaluar_busqueda(self):
+        """Reevaluación en lote: relaciones sobrescritas y coincide recalculado"""
+        for propiedad in self.propiedades:
+            ResultadoBusqueda.objects.create(busqueda=self.busqueda, propiedad=propiedad, coincide=False)
+        # Relación desactualizada que la reevaluación debe corregir
+        PalabraClavePropiedad.objects.create(
+            palabra_clave=self.palabras[1], propiedad=self.propiedades[0], encontrada=False
+        )
+        
+        stats = reevaluar_busqueda(str(self.busqueda.id))
+        
+        self.assertEqual(stats['propiedades'], 10)
+        self.assertEqual(stats['actualizadas'], 1)
+        self.assertEqual(stats['por_palabra'], {'garaje': 10, 'piscina': 5})
+        self.assertEqual(stats['coinciden'], 5)
+        self.assertEqual(ResultadoBusqueda.objects.filter(busqueda=self.busqueda, coincide=True).count(), 5)
+        self.assertTrue(PalabraClavePropiedad.objects.get(
+            palabra_clave=self.palabras[1], propiedad=self.propiedades[0]
+        ).encontrada)
+
+
+class EscritorResultadosTest(TestCase):
+    """Escritura en lote de ResultadoBusqueda"""
+    
+    def setUp(self):
+        self.plataforma = Plataforma.objects.create(nombre="Test Platform", url="http://test.com")
+        self.busqueda = Busqueda.objects.create(nombre_busqueda="Escritor", texto_original="casa")
+        self.propiedades = [
+            Propiedad.objects.create(url=f"http://test.com/e{i}", titulo=f"Casa {i}", plataforma=self.plataforma)
+            for i in range(100)
+        ]
+    
+    def test_volcado_en_pocas_sentencias(self):
+        """100 resultados nuevos y luego los mismos existentes: pocas sentencias, seen_count sumado en SQL"""
+        from core.escritor_resultados import EscritorResultados
+        escritor = EscritorResultados(max_pendientes=1000, max_segundos=60)
+        for propiedad in self.propiedades:
+            escritor.agregar(self.busqueda, propiedad, True)
+        with self.assertNumQueries(4):  # SAVEPOINT + UPDATE de existentes + upsert + RELEASE
+            self.assertEqual(escritor.volcar(), 100)
+        self.assertEqual(ResultadoBusqueda.objects.filter(busqueda=self.busqueda, seen_count=0).count(), 100)
+        
+        with EscritorResultados() as escritor:
+            for i, propiedad in enumerate(self.propiedades):
+                escritor.agregar(self.busqueda, propiedad, i % 2 == 0)
+        resultados = ResultadoBusqueda.objects.filter(busqueda=self.busqueda)
+        self.assertEqual(resultados.count(), 100)
+        self.assertEqual(resultados.filter(coincide=True).count(), 50)
+        self.assertTrue(all(r.seen_count == 1 and r.last_seen_at for r in resultados))
+    
+    def test_volcado_por_tamano(self):
+        from core.escritor_resultados import EscritorResultados
+        escritor = EscritorResultados(max_pendientes=40, max_segundos=60)
+        for propiedad in self.propiedades:
+            escritor.agregar(self.busqueda, propiedad, True)
+        self.assertEqual(escritor.escritos, 80)
+        self.assertEqual(len(escritor), 20)
+        escritor.volcar()
+        self.assertEqual(ResultadoBusqueda.objects.filter(busqueda=self.busqueda).count(), 100)
+
+
+class IngestaPropiedadesTest(TestCase):
+    """Ingesta en lote de propiedades nuevas de FASE 2"""
+    
+    def setUp(self):
+        self.plataforma = Plataforma.objects.create(nombre="Test Platform", url="http://test.com")
+        self.palabras = [get_or_create_palabra_clave('garaje'), get_or_create_palabra_clave('terraza')]
+    
+    def test_lote_en_pocas_sentencias(self):
+        """30 propiedades con sus relaciones keywords: las sentencias no crecen con el lote"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from core.ingesta import IngestaPropiedades
+        ingesta = IngestaPropiedades(self.plataforma, self.palabras, max_pendientes=1000, max_segundos=60)
+        for i in range(30):
+            detalles = {'titulo': f'Casa {i}', 'descripcion': 'con garaje' if i % 2 else 'con terraza'}
+            self.assertEqual(ingesta.agregar(f"http://test.com/n{i}", detalles), [])
+        ingesta.agregar("http://test.com/sin-detalle", None)
+        with CaptureQueriesContext(connection) as consultas:
+            guardadas = ingesta.volcar()
+        self.assertLessEqual(len(consultas), 10)
+        self.assertEqual(len(guardadas), 31)
+        self.assertEqual(Propiedad.objects.filter(url__startswith="http://test.com/").count(), 31)
+        self.assertEqual(PalabraClavePropiedad.objects.count(), 62)
+        propiedad, resultados = guardadas[1]
+        self.assertEqual(resultados, {'garaje': True, 'terraza': False})
+        self.assertEqual(propiedad.hash_texto, Propiedad.objects.get(pk=propiedad.pk).hash_texto)
+        self.assertEqual(guardadas[-1][1], {'garaje': False, 'terraza': False})
+    
+    def test_propiedades_basicas_sin_keywords(self):
+        """Atajo sin keywords: lectura de existentes, un bulk_create y lectura de ids"""
+        from core.search_manager import crear_propiedades_basicas
+        existente = Propiedad.objects.create(url="http://test.com/b0", titulo="Original", plataforma=self.plataforma)
+        # 30 filas x 29 columnas entran en un solo INSERT con el límite de 999 parámetros de SQLite
+        titulos = {f"http://test.com/b{i}": f"Tarjeta {i}" for i in range(30)}
+        with self.assertNumQueries(5):  # existentes + SAVEPOINT + INSERT + ids + RELEASE
+            ids = crear_propiedades_basicas(titulos, self.plataforma)
+        self.assertEqual(set(ids), set(titulos))
+        self.assertEqual(ids["http://test.com/b0"], existente.pk)
+        self.assertEqual(Propiedad.objects.get(pk=existente.pk).titulo, "Original")
+        self.assertEqual(Propiedad.objects.get(url="http://test.com/b7").texto_busqueda, "tarjeta 7")
+        with self.assertNumQueries(1):
+            self.assertEqual(crear_propiedades_basicas(titulos, self.plataforma), ids)
+    
+    def test_sin_detalles_no_pisa_existente(self):
+        """Un detalle fallido sobre una URL existente no borra su contenido ni sus veredictos"""
+        from core.search_manager import guardar_propiedades_nuevas
+        existente = Propiedad.objects.create(
+            url="http://test.com/buena", titulo="Casa con garaje", plataforma=self.plataforma,
+            metadata={'precio_valor': 100000, 'precio_moneda': 'USD', 'caracteristicas_texto': 'terraza'}
+        )
+        procesar_propiedades_existentes([existente], self.palabras)
+        guardadas = guardar_propiedades_nuevas(
+            [("http://test.com/buena", None), ("http://test.com/nueva", None)], self.plataforma, self.palabras
+        )
+        propiedad, resultados = guardadas[0]
+        self.assertEqual(propiedad.pk, existente.pk)
+        self.assertEqual(resultados, {'garaje': True, 'terraza': True})
+        intacta = Propiedad.objects.get(pk=existente.pk)
+        self.assertEqual(intacta.titulo, "Casa con garaje")
+        self.assertEqual(intacta.precio_valor, 100000)
+        self.assertEqual(intacta.hash_texto, existente.hash_texto)
+        self.assertEqual(
+            PalabraClavePropiedad.objects.filter(propiedad=existente, encontrada=True).count(), 2
+        )
+        self.assertEqual(guardadas[1][1], {'garaje': False, 'terraza': False})
+    
+    def test_conflicto_de_url_es_upsert(self):
+        from core.search_manager import guardar_propiedades_nuevas
+        existente = Propiedad.objects.create(url="http://test.com/dup", titulo="Vieja", plataforma=self.plataforma)
+        guardadas = guardar_propiedades_nuevas(
+            [("http://test.com/dup", {'titulo': 'Nueva con garaje y terraza'})], self.plataforma, self.palabras
+        )
+        propiedad, resultados = guardadas[0]
+        self.assertEqual(propiedad.pk, existente.pk)
+        self.assertEqual(Propiedad.objects.get(pk=existente.pk).titulo, 'Nueva con garaje y terraza')
+        self.assertTrue(all(resultados.values()))
+
+
+class HistorialPreciosTest(TestCase):
+    """Serie de precios por propiedad y bajas de precio de una búsqueda"""
+    
+    def setUp(self):
+        self.plataforma = Plataforma.objects.create(nombre="Test Platform", url="http://test.com")
+        self.busqueda = Busqueda.objects.create(nombre_busqueda="Precios", texto_original="casa")
+        self.propiedades = [
+            Propiedad.objects.create(
+                url=f"http://test.com/p{i}", titulo=f"Casa {i}", plataforma=self.plataforma,
+                metadata={'precio_valor': 100000, 'precio_moneda': 'USD'}
+            )
+            for i in range(20)
+        ]
+        for propiedad in self.propiedades:
+            ResultadoBusqueda.objects.create(busqueda=self.busqueda, propiedad=propiedad, coincide=True)
+    
+    def test_solo_agrega_cambios(self):
+        from core.historial_precios import EscritorPrecios
+        from core.models import ObservacionPrecio
+        with EscritorPrecios() as precios:
+            for i, propiedad in enumerate(self.propiedades):
+                precios.agregar(propiedad, 90000 if i < 5 else 100000, 'USD')
+        # Primera observación (precio guardado) para todas y una más para las 5 que bajaron
+        self.assertEqual(ObservacionPrecio.objects.count(), 25)
+        self.assertEqual(len(precios.cambios), 5)
+        self.assertEqual(Propiedad.objects.filter(precio_valor=90000).count(), 5)
+        bajada = Propiedad.objects.get(pk=self.propiedades[0].pk)
+        self.assertEqual(bajada.metadata['precio_valor'], 90000)
+        self.assertIn('ultima_actualizacion_precio', bajada.metadata)
+        self.assertGreater(bajada.updated_at, self.propiedades[0].updated_at)
+        
+        escritor = EscritorPrecios()
+        for propiedad in self.propiedades:
+            escritor.agregar(propiedad, Propiedad.objects.get(pk=propiedad.pk).precio_valor, 'USD')
+        with self.assertNumQueries(1):  # Sin cambios: sólo la lectura de los últimos precios
+            self.assertEqual(escritor.volcar(), [])
+        self.assertEqual(ObservacionPrecio.objects.count(), 25)
+    
+    def test_caminos_que_pisan_metadata(self):
+        """El upsert de la ingesta y los guardados con metadata completa también alimentan la serie"""
+        from core.models import ObservacionPrecio
+        from core.search_manager import guardar_propiedades_nuevas
+        propiedad = self.propiedades[0]
+        guardar_propiedades_nuevas(
+            [(propiedad.url, {'titulo': 'Casa 0', 'precio_valor': 90000, 'precio_moneda': 'USD'})], self.plataforma, []
+        )
+        serie = list(ObservacionPrecio.objects.filter(propiedad=propiedad).order_by('observado_at', 'id')
+                     .values_list('valor', flat=True))
+        self.assertEqual(serie, [100000, 90000])
+        self.assertEqual(Propiedad.objects.get(pk=propiedad.pk).precio_valor, 90000)
+    
+    def test_bajas_de_precio(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from core.historial_precios import EscritorPrecios, bajas_de_precio
+        ahora = timezone.now()
+        Propiedad.objects.filter(pk=self.propiedades[0].pk).update(created_at=ahora - timedelta(days=30))
+        with EscritorPrecios() as precios:
+            precios.agregar(self.propiedades[0], 95000, 'USD', observado_at=ahora - timedelta(days=20))
+            precios.agregar(self.propiedades[1], 110000, 'USD')
+        with EscritorPrecios() as precios:
+            precios.agregar(self.propiedades[0], 80000, 'USD')
+            precios.agregar(self.propiedades[2], 99000, 'USD')
+        with self.assertNumQueries(2):
+            bajas = bajas_de_precio(self.busqueda, dias=7)
+        self.assertEqual([b['propiedad_id'] for b in bajas], [self.propiedades[0].pk, self.propiedades[2].pk])
+        self.assertEqual(bajas[0]['precio_anterior'], 95000)
+        self.assertEqual(bajas[0]['precio_actual'], 80000)
+
+
 class SearchManagerCompatibilityTest(TestCase):
     """Tests para funciones de compatibilidad"""
     
@@ -315,47 +315,21 @@ def http_search_fallback(request):
 
         # Ejecutar scraper con los filtros y keywords procesados
         from .scraper import run_scraper
-        resultados_scraper = run_scraper(filtros_final, keywords, max_paginas=2, workers_fase1=1, workers_fase2=1, busqueda=busqueda_instance, plataforma=plataforma) or []
+        resultados_scraper = run_scraper(filtros_final, keywords, max_paginas=2, workers_fase1=1, busqueda=busqueda_instance, plataforma=plataforma) or []
         # Obtener resultados de la base de datos
         from .models import Propiedad
         propiedades = Propiedad.objects.order_by('-id')[:50]  # Últimas 50 para buscar coincidencias
 
         resultados = []
+        # Keywords puede venir como lista de dicts; extraer 'texto' y 'sinonimos'
+        from core.scraper import build_keyword_groups
+        from core.scraper.matcher import matcher_para_grupos
+        # AND entre grupos, OR dentro del grupo (igual que en scraper); se compila una vez para todas las propiedades
+        matcher = matcher_para_grupos(build_keyword_groups(keywords)) if keywords else None
         for prop in propiedades:
             if keywords:  # Si hay keywords, filtrar por ellas
-                import unicodedata
-                def normalizar(texto):
-                    return unicodedata.normalize('NFKD', str(texto)).encode('ASCII', 'ignore').decode('ASCII').lower()
-
                 meta = prop.metadata or {}
-                caracteristicas_txt = meta.get('caracteristicas', '') or meta.get('caracteristicas_texto', '') or ''
-                texto_propiedad = f"{prop.titulo or ''} {prop.descripcion or ''} {caracteristicas_txt}".lower()
-                texto_norm = normalizar(texto_propiedad)
-                # Keywords puede venir como lista de dicts; extraer 'texto' y 'sinonimos'
-                from core.scraper import build_keyword_groups, stemming_basico
-                keyword_groups = build_keyword_groups(keywords)
-
-                # AND entre grupos, OR dentro del grupo (igual que en scraper)
-                if keyword_groups:
-                    grupos_ok = []
-                    for grupo in keyword_groups:
-                        variantes_norm = [normalizar(v) for v in grupo]
-                        any_match = False
-                        for v in variantes_norm:
-                            if v in texto_norm:
-                                any_match = True
-                                break
-                            v_stem = stemming_basico(v)
-                            if v_stem and v_stem in texto_norm:
-                                any_match = True
-                                break
-                            if len(v) > 4 and v[:-2] in texto_norm:
-                                any_match = True
-                                break
-                        grupos_ok.append(any_match)
-                    coincide_kw = all(grupos_ok)
-                else:
-                    coincide_kw = True
+                coincide_kw = matcher.coincide(prop.texto_busqueda or prop.calcular_texto_busqueda(), normalizado=True)
 
                 if coincide_kw:
                     resultados.append({
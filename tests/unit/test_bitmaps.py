@@ -0,0 +1,37 @@
+import random
+import unittest
+
+from core.scraper.bitmaps import bits, evaluar_en_lote
+from core.scraper.matcher import matcher_para_grupos
+from core.scraper.utils import normalizar_texto
+
+
+class TestEvaluacionLote(unittest.TestCase):
+    def test_equivale_al_matcher(self):
+        rnd = random.Random(5)
+        vocabulario = ['piscina', 'pileta', 'garaje', 'cochera', 'parrillero', 'terraza', 'jardín',
+                       'luminoso', 'luminosidad', 'amueblado', 'vista al mar', 'estufa', 'ascensor']
+        textos = [
+            normalizar_texto(' '.join(rnd.choice(vocabulario + ['con', 'y', 'amueblada', 'terrazas'])
+                                      for _ in range(rnd.randint(0, 15))))
+            for _ in range(150)
+        ]
+        for _ in range(100):
+            grupos = [rnd.sample(vocabulario, rnd.randint(1, 3)) for _ in range(rnd.randint(1, 3))]
+            matcher = matcher_para_grupos(grupos)
+            matriz = evaluar_en_lote(textos, grupos)
+            with self.subTest(grupos=grupos):
+                self.assertEqual(bits(matriz['coinciden'], len(textos)),
+                                 [matcher.coincide(t, normalizado=True) for t in textos])
+                for i, bitmap in enumerate(matriz['grupos']):
+                    self.assertEqual(bits(bitmap, len(textos)),
+                                     [v[i] is not None for v in (matcher.evaluar(t, normalizado=True) for t in textos)])
+
+    def test_sin_grupos_y_sin_textos(self):
+        matriz = evaluar_en_lote(['casa', 'apto'], [])
+        self.assertEqual(bits(matriz['coinciden'], 2), [True, True])
+        self.assertEqual(evaluar_en_lote([], [['casa']])['coinciden'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, Mock
+
+from core.scraper import cache as http_cache
+from core.scraper import fetcher, rate_limit
+
+
+def _respuesta(status=200, contenido=b'', headers=None):
+    r = Mock()
+    r.status_code = status
+    r.content = contenido
+    r.headers = headers or {}
+    return r
+
+
+class TestCacheHTTP(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch('core.scraper.cache.HTTP_CACHE_DIR', self.tmp.name)
+        self.patcher.start()
+        fetcher.reset_stats()
+        rate_limit.reiniciar()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_normalizar_url(self):
+        a = http_cache.normalizar_url('HTTPS://WWW.Infocasas.com.uy/casa?b=2&a=1#foto')
+        b = http_cache.normalizar_url('https://www.infocasas.com.uy/casa', {'a': '1', 'b': '2'})
+        self.assertEqual(a, b)
+        con_key = http_cache.clave_de('https://app.scrapingbee.com/api/v1/', {'api_key': 'x', 'url': 'https://a.com/1'})
+        otra_key = http_cache.clave_de('https://app.scrapingbee.com/api/v1/', {'api_key': 'y', 'url': 'https://a.com/1'})
+        self.assertEqual(con_key, otra_key)
+
+    def test_fresca_no_toca_la_red(self):
+        url = 'https://www.infocasas.com.uy/casa-1'
+        with patch('requests.Session.get', return_value=_respuesta(contenido=b'<html>v1</html>')) as mock_get:
+            fetcher.fetch(url, cache='detalle')
+            r = fetcher.fetch(url, cache='detalle')
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(r.desde_cache)
+        self.assertEqual(r.content, b'<html>v1</html>')
+
+    def test_vencida_se_revalida_con_etag(self):
+        url = 'https://www.infocasas.com.uy/casa-2'
+        with patch('requests.Session.get', return_value=_respuesta(contenido=b'<html>v1</html>', headers={'ETag': '"abc"'})):
+            fetcher.fetch(url, cache='detalle')
+        with patch.dict('core.scraper.cache.HTTP_CACHE_TTL', {'detalle': 0}):
+            with patch('requests.Session.get', return_value=_respuesta(status=304)) as mock_get:
+                r = fetcher.fetch(url, cache='detalle')
+        self.assertEqual(mock_get.call_args.kwargs['headers']['If-None-Match'], '"abc"')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.content, b'<html>v1</html>')
+        self.assertEqual(fetcher.get_stats()['www.infocasas.com.uy']['revalidadas'], 1)
+
+    def test_desalojo_lru_y_cuerpos_compartidos(self):
+        http_cache.guardar('https://a.com/1', None, 'detalle', b'x' * 1000)
+        http_cache.guardar('https://a.com/2', None, 'detalle', b'x' * 1000)  # mismo cuerpo
+        http_cache.guardar('https://a.com/3', None, 'detalle', b'y' * 1000)
+        self.assertEqual(http_cache.estadisticas()['bytes_en_disco'], 2000)
+        http_cache.obtener('https://a.com/1')  # ahora es la más reciente
+        http_cache.desalojar(max_bytes=1500)
+        self.assertIsNotNone(http_cache.obtener('https://a.com/1'))
+        self.assertIsNone(http_cache.obtener('https://a.com/3'))
+        cuerpos = [f for _, _, fs in os.walk(os.path.join(self.tmp.name, 'cuerpos')) for f in fs]
+        self.assertEqual(len(cuerpos), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import unittest
+from unittest.mock import patch, Mock
+
+from bs4 import BeautifulSoup
+
+from core.scraper import estado_embebido
+from core.scraper.extractors import _arbol_lxml, _parse_propiedad_lxml, parsear_detalle_mercadolibre, recolectar_urls_de_pagina
+
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+ESTADO = os.path.join(AQUI, 'fixtures', 'estado')
+VOLCADO_LISTADO = os.path.join(os.path.dirname(os.path.dirname(AQUI)), 'debug_requests.html')
+
+
+def _leer(ruta):
+    with open(ruta, 'rb') as f:
+        return f.read()
+
+
+def _urls_por_css(contenido):
+    urls = set()
+    for item in BeautifulSoup(contenido, 'lxml').find_all('li', class_='ui-search-layout__item'):
+        link = item.find('a', class_='poly-component__title') or item.find('a', class_='ui-search-link')
+        urls.add(link['href'].split('#')[0])
+    return urls
+
+
+class TestEstadoEmbebido(unittest.TestCase):
+    def test_listado_desde_estado(self):
+        contenido = _leer(os.path.join(ESTADO, 'ml_listado.html'))
+        self.assertEqual(estado_embebido.total_mercadolibre(contenido), 1234)
+        urls, titulos = estado_embebido.items_mercadolibre(contenido)
+        self.assertEqual(urls, _urls_por_css(contenido))
+        self.assertEqual(titulos['https://apartamento.mercadolibre.com.uy/MLU-222-apto-con-terraza-_JM'], 'Apto Con Terraza')
+
+    @unittest.skipUnless(os.path.exists(VOLCADO_LISTADO), 'sin volcado real de listado')
+    def test_volcado_real_coincide_con_css(self):
+        contenido = _leer(VOLCADO_LISTADO)
+        urls, titulos = estado_embebido.items_mercadolibre(contenido)
+        self.assertEqual(urls, _urls_por_css(contenido))
+        self.assertEqual(len(titulos), len(urls))
+        self.assertEqual(estado_embebido.total_mercadolibre(contenido), 57779)
+
+    def test_detalle_desde_estado_coincide_con_dom(self):
+        contenido = _leer(os.path.join(ESTADO, 'ml_detalle.html'))
+        desde_json = estado_embebido.detalle_mercadolibre(contenido, 'u')
+        desde_dom = _parse_propiedad_lxml(_arbol_lxml(contenido), 'u')
+        self.assertIsNotNone(desde_json)
+        self.assertEqual(desde_json, desde_dom)
+        self.assertEqual((desde_json['precio_moneda'], desde_json['precio_valor']), ('U$S', 189000))
+        self.assertEqual(desde_json['antiguedad'], 0)
+        self.assertTrue(desde_json['tiene_terraza'])
+
+    def test_sin_estado_vuelve_al_dom(self):
+        # ml_casa tiene __PRELOADED_STATE__ pero sin ficha técnica ni JSON-LD
+        contenido = _leer(os.path.join(AQUI, 'fixtures', 'detalles', 'ml_casa.html'))
+        self.assertIsNone(estado_embebido.detalle_mercadolibre(contenido, 'u'))
+        self.assertEqual(parsear_detalle_mercadolibre(contenido, 'u')['precio_valor'], 385000)
+        self.assertIsNone(estado_embebido.items_mercadolibre(contenido))
+        self.assertIsNone(estado_embebido.extraer_estado(b'<html></html>'))
+
+    def test_recolector_usa_estado_sin_dom(self):
+        contenido = _leer(os.path.join(ESTADO, 'ml_listado.html'))
+        respuesta = Mock(status_code=200, text=contenido.decode('utf-8'))
+        with patch('core.scraper.extractors.fetcher.fetch', return_value=respuesta), \
+                patch('core.scraper.extractors.BeautifulSoup', side_effect=AssertionError('no debe parsear el DOM')):
+            urls, titulos = recolectar_urls_de_pagina('https://listado.mercadolibre.com.uy/x')
+        self.assertEqual(len(urls), 2)
+        self.assertEqual(len(titulos), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
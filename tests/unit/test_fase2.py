@@ -0,0 +1,52 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from core.scraper.fase2 import MotorFase2
+
+
+class TestMotorFase2(unittest.TestCase):
+    def test_respeta_limite_por_host_y_devuelve_todo(self):
+        en_vuelo = {}
+        maximo = {}
+        lock = threading.Lock()
+
+        def descarga_falsa(url, api_key=None, use_scrapingbee=False):
+            host = url.split('/')[2]
+            with lock:
+                en_vuelo[host] = en_vuelo.get(host, 0) + 1
+                maximo[host] = max(maximo.get(host, 0), en_vuelo[host])
+            time.sleep(0.02)
+            with lock:
+                en_vuelo[host] -= 1
+            return url.encode()
+
+        urls = [f'https://a.com/{i}' for i in range(10)] + [f'https://b.com/{i}' for i in range(10)]
+        with patch('core.scraper.fase2.descargar_detalle', side_effect=descarga_falsa):
+            motor = MotorFase2(max_por_host=3, parser=lambda contenido, url: {'titulo': contenido.decode()})
+            resultados = dict(motor.ejecutar(urls))
+
+        self.assertEqual(set(resultados), set(urls))
+        self.assertEqual(resultados['https://a.com/0'], {'titulo': 'https://a.com/0'})
+        self.assertLessEqual(maximo['a.com'], 3)
+        self.assertLessEqual(maximo['b.com'], 3)
+        self.assertEqual(motor.completadas, 20)
+
+    def test_errores_se_entregan_como_none(self):
+        def descarga_falsa(url, api_key=None, use_scrapingbee=False):
+            if url.endswith('/mal'):
+                raise OSError('sin red')
+            return b'ok'
+
+        with patch('core.scraper.fase2.descargar_detalle', side_effect=descarga_falsa):
+            motor = MotorFase2(max_por_host=2, parser=lambda contenido, url: {'ok': True})
+            resultados = dict(motor.ejecutar(['https://a.com/bien', 'https://a.com/mal']))
+
+        self.assertEqual(resultados['https://a.com/bien'], {'ok': True})
+        self.assertIsNone(resultados['https://a.com/mal'])
+        self.assertEqual(motor.fallidas, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
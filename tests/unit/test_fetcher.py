@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from core.scraper import fetcher, rate_limit
+from core.scraper.constants import HEADERS
+
+
+def _respuesta(status=200, contenido=b'<html></html>'):
+    r = Mock()
+    r.status_code = status
+    r.content = contenido
+    r.headers = {}
+    return r
+
+
+class TestFetcher(unittest.TestCase):
+    def setUp(self):
+        fetcher.cerrar_sesiones()
+        fetcher.reset_stats()
+        rate_limit.reiniciar()
+
+    def test_una_sesion_por_host(self):
+        s1 = fetcher.get_session('listado.mercadolibre.com.uy')
+        s2 = fetcher.get_session('listado.mercadolibre.com.uy')
+        s3 = fetcher.get_session('www.infocasas.com.uy')
+        self.assertIs(s1, s2)
+        self.assertIsNot(s1, s3)
+        self.assertEqual(s1.headers['User-Agent'], HEADERS['User-Agent'])
+
+    def test_fetch_registra_tiempo_y_bytes(self):
+        with patch('requests.Session.get', return_value=_respuesta(contenido=b'x' * 2048)) as mock_get:
+            r1 = fetcher.fetch('https://www.infocasas.com.uy/a')
+            fetcher.fetch('https://www.infocasas.com.uy/b')
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(r1.fetch_bytes, 2048)
+        stats = fetcher.get_stats()['www.infocasas.com.uy']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['bytes'], 4096)
+        self.assertEqual(stats['errores'], 0)
+
+    def test_fetch_cuenta_errores_http_y_excepciones(self):
+        with patch('requests.Session.get', return_value=_respuesta(status=503)):
+            fetcher.fetch('https://www.mercadolibre.com.uy/')
+        with patch('requests.Session.get', side_effect=OSError('sin red')):
+            with self.assertRaises(OSError):
+                fetcher.fetch('https://www.mercadolibre.com.uy/')
+        stats = fetcher.get_stats()['www.mercadolibre.com.uy']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['errores'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import random
+import tempfile
+import unittest
+
+from core.indice_invertido import IndiceInvertido
+from core.scraper.matcher import matcher_para_grupos
+from core.scraper.utils import normalizar_texto
+
+VOCABULARIO = ['piscina', 'pileta', 'garaje', 'garage', 'cochera', 'parrillero', 'barbacoa', 'terraza',
+               'jardín', 'luminoso', 'amueblado', 'vista al mar', 'aire acondicionado', 'estufa', 'ascensor']
+
+
+def _corpus(rnd, n):
+    extra = ['con', 'y', 'amplio', 'luminosa', 'terrazas', 'cocheras', 'acondicionado', 'aire']
+    return {
+        i: normalizar_texto(' '.join(rnd.choice(VOCABULARIO + extra) for _ in range(rnd.randint(0, 20))))
+        for i in range(1, n + 1)
+    }
+
+
+class TestIndiceInvertido(unittest.TestCase):
+    def _indice(self, textos):
+        indice = IndiceInvertido()
+        for prop_id, texto in textos.items():
+            indice.actualizar(prop_id, '', texto)
+        return indice
+
+    def test_equivale_al_matcher(self):
+        rnd = random.Random(11)
+        textos = _corpus(rnd, 300)
+        indice = self._indice(textos)
+        for _ in range(100):
+            grupos = [rnd.sample(VOCABULARIO, rnd.randint(1, 3)) for _ in range(rnd.randint(1, 3))]
+            matcher = matcher_para_grupos(grupos)
+            esperado = {i for i, t in textos.items() if matcher.coincide(t, normalizado=True)}
+            with self.subTest(grupos=grupos):
+                self.assertEqual(indice.ids_que_coinciden(grupos, textos), esperado)
+
+    def test_actualizacion_incremental(self):
+        indice = self._indice({1: 'casa con piscina', 2: 'apto con garaje'})
+        indice.actualizar(1, 'casa con piscina', 'casa con cochera')
+        indice.quitar(2, 'apto con garaje')
+        indice.actualizar(3, '', 'monoambiente con garajes')
+        self.assertEqual(indice.ids_que_coinciden([['piscina']]), set())
+        self.assertEqual(indice.ids_que_coinciden([['garaje', 'cochera']]), {1, 3})
+        indice.quitar_ids({3})
+        self.assertEqual(indice.ids_que_coinciden([['garaje']]), set())
+        self.assertEqual(indice.ids, {1})
+
+    def test_guardar_y_cargar(self):
+        textos = _corpus(random.Random(3), 50)
+        indice = self._indice(textos)
+        indice.marca = '2026-01-01T00:00:00+00:00'
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'indice.bin')
+            indice.guardar(ruta)
+            cargado = IndiceInvertido.cargar(ruta)
+        self.assertEqual(cargado.ids, indice.ids)
+        self.assertEqual(cargado.marca, indice.marca)
+        self.assertEqual(cargado.ids_que_coinciden([['garaje'], ['piscina', 'pileta']]),
+                         indice.ids_que_coinciden([['garaje'], ['piscina', 'pileta']]))
+
+
+if __name__ == '__main__':
+    unittest.main()
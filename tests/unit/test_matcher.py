@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from core.scraper.matcher import MatcherKeywords, matcher_para_grupos
+from core.scraper.utils import normalizar_texto, stemming_basico
+
+
+def _referencia(grupos, texto, stemming=True, truncar=True):
+    """El matching de siempre: `in` por variante, stem y raíz aproximada."""
+    texto_norm = normalizar_texto(texto)
+    resultado = []
+    for grupo in grupos:
+        encontrada = None
+        for variante in grupo:
+            v = normalizar_texto(variante)
+            if not v:
+                continue
+            if (v in texto_norm
+                    or (stemming and stemming_basico(v) in texto_norm)
+                    or (truncar and len(v) > 4 and v[:-2] in texto_norm)):
+                encontrada = variante
+                break
+        resultado.append(encontrada)
+    return resultado
+
+
+class TestMatcherKeywords(unittest.TestCase):
+    def test_variantes_stem_y_truncado(self):
+        matcher = MatcherKeywords([['piscina', 'pileta'], ['garaje', 'cochera'], ['luminoso'], ['balcón']])
+        texto = 'Casa con PILETA climatizada, cocheras y muy luminosa. Balcon al frente.'
+        self.assertEqual(matcher.evaluar(texto), ['pileta', 'cochera', 'luminoso', 'balcón'])
+        self.assertTrue(matcher.coincide(texto))
+        self.assertEqual(matcher.evaluar('Apartamento interior'), [None, None, None, None])
+
+    def test_flags_por_sitio(self):
+        # "terrazas" sólo aparece truncado ("terraz") en el texto
+        texto = 'amplia terrazita'
+        self.assertEqual(MatcherKeywords([['terrazas']]).evaluar(texto), ['terrazas'])
+        self.assertEqual(MatcherKeywords([['terrazas']], truncar=False).evaluar(texto), [None])
+        # "amueblado" sólo por stem ("amuebl")
+        self.assertEqual(MatcherKeywords([['amueblado']], truncar=False).evaluar('se entrega amueblada'), ['amueblado'])
+        self.assertEqual(MatcherKeywords([['amueblado']], stemming=False, truncar=False).evaluar('se entrega amueblada'), [None])
+
+    def test_primera_variante_en_orden_del_grupo(self):
+        matcher = MatcherKeywords([['apartamento', 'apto', 'depto']])
+        self.assertEqual(matcher.evaluar('depto y apto'), ['apto'])
+
+    def test_equivale_a_la_referencia(self):
+        rnd = random.Random(7)
+        vocabulario = ['piscina', 'pileta', 'garaje', 'garage', 'cochera', 'parrillero', 'barbacoa', 'terraza',
+                       'jardín', 'luminoso', 'amueblado', 'vista', 'mar', 'estufa', 'calefacción', 'ascensor']
+        for _ in range(200):
+            grupos = [rnd.sample(vocabulario, rnd.randint(1, 3)) for _ in range(rnd.randint(1, 4))]
+            texto = ' '.join(rnd.choice(vocabulario + ['con', 'y', 'amplio', 'luminosa', 'terrazas'])
+                             for _ in range(rnd.randint(0, 30)))
+            for stemming in (True, False):
+                for truncar in (True, False):
+                    with self.subTest(grupos=grupos, texto=texto, stemming=stemming, truncar=truncar):
+                        self.assertEqual(MatcherKeywords(grupos, stemming, truncar).evaluar(texto),
+                                         _referencia(grupos, texto, stemming, truncar))
+
+    def test_sin_grupos_y_cache(self):
+        self.assertEqual(MatcherKeywords([]).evaluar('cualquier cosa'), [])
+        self.assertTrue(MatcherKeywords([]).coincide('cualquier cosa'))
+        self.assertIs(matcher_para_grupos([['a1', 'b2']]), matcher_para_grupos([('a1', 'b2')]))
+        self.assertIsNot(matcher_para_grupos([['a1']]), matcher_para_grupos([['a1']], truncar=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import glob
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+
+from core.scraper.extractors import (
+    _arbol_lxml, _parse_propiedad_html, _parse_propiedad_lxml,
+    _parse_propiedad_infocasas_html, _parse_propiedad_infocasas_lxml,
+)
+
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(os.path.dirname(AQUI))
+FIXTURES = sorted(glob.glob(os.path.join(AQUI, 'fixtures', 'detalles', '*.html')))
+# Volcados reales de páginas de listado que hay en la raíz del repo (no son detalles: ejercitan los "no encontrado")
+VOLCADOS = [p for p in (os.path.join(REPO, 'debug_requests.html'), os.path.join(REPO, 'debug_infocasas_html.html'))
+            if os.path.exists(p)]
+
+
+class TestParserLxmlParidad(unittest.TestCase):
+    """El parser lxml debe devolver exactamente el mismo dict que el de BeautifulSoup."""
+
+    def _comparar(self, ruta):
+        with open(ruta, 'rb') as f:
+            contenido = f.read()
+        url = 'https://example.com/' + os.path.basename(ruta)
+        soup = BeautifulSoup(contenido, 'lxml')
+        raiz = _arbol_lxml(contenido)
+        self.assertEqual(_parse_propiedad_lxml(raiz, url), _parse_propiedad_html(soup, url))
+        self.assertEqual(_parse_propiedad_infocasas_lxml(raiz, url), _parse_propiedad_infocasas_html(soup, url))
+
+    def test_paridad_en_fixtures(self):
+        self.assertTrue(FIXTURES)
+        for ruta in FIXTURES + VOLCADOS:
+            with self.subTest(fixture=os.path.basename(ruta)):
+                self._comparar(ruta)
+
+    def test_fixture_mercadolibre_extrae_campos(self):
+        with open(os.path.join(AQUI, 'fixtures', 'detalles', 'ml_casa.html'), 'rb') as f:
+            datos = _parse_propiedad_lxml(_arbol_lxml(f.read()), 'u')
+        self.assertEqual(datos['titulo'], 'Casa En Venta 3 Dormitorios Con Piscina & Barbacoa')
+        self.assertEqual((datos['precio_moneda'], datos['precio_valor']), ('U$S', 385000))
+        self.assertEqual(datos['dormitorios_min'], 3)
+        self.assertTrue(datos['tiene_piscina'])
+        self.assertEqual(datos['caracteristicas_dict']['orientación'], 'Norte')
+
+    def test_contenido_vacio(self):
+        self.assertIsNone(_parse_propiedad_lxml(_arbol_lxml(b''), 'u'))
+        self.assertEqual(_parse_propiedad_infocasas_lxml(_arbol_lxml(b''), 'u')['titulo'], 'N/A')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from core.scraper.fase2 import MotorFase2
+from core.scraper.pipeline import PipelineStreaming
+
+
+def _paginas(n, por_pagina=5):
+    return {f'https://listado/{p}': {f'https://a.com/{p}-{i}' for i in range(por_pagina)} for p in range(n)}
+
+
+class TestPipelineStreaming(unittest.TestCase):
+    def _motor(self, pipeline, demora_detalle=0.0):
+        def descarga_falsa(url, api_key=None, use_scrapingbee=False):
+            time.sleep(demora_detalle)
+            return url.encode()
+        self._patch = patch('core.scraper.fase2.descargar_detalle', side_effect=descarga_falsa)
+        self._patch.start()
+        self.addCleanup(self._patch.stop)
+        return MotorFase2(max_por_host=2, parser=lambda contenido, url: {'titulo': contenido.decode()},
+                          salida=pipeline.eventos)
+
+    def test_primer_detalle_llega_antes_de_terminar_fase1(self):
+        paginas = _paginas(5)
+        recolectadas = []
+
+        def recolectar(url):
+            time.sleep(0.05)
+            recolectadas.append(url)
+            return paginas[url], {}
+
+        pipeline = PipelineStreaming(list(paginas), recolectar, lambda urls, titulos: urls)
+        resultados = pipeline.ejecutar(self._motor(pipeline))
+        url, datos = next(resultados)
+        self.assertLess(len(recolectadas), len(paginas))
+        self.assertEqual(datos, {'titulo': url})
+        restantes = dict(resultados)
+        self.assertEqual(len(restantes) + 1, 25)
+        self.assertEqual(pipeline.paginas_procesadas, 5)
+
+    def test_dedup_por_lotes_y_urls_repetidas(self):
+        paginas = {'https://listado/0': {'https://a.com/1', 'https://a.com/2', 'https://a.com/3'},
+                   'https://listado/1': {'https://a.com/3', 'https://a.com/4'}}
+        lotes = []
+
+        def filtrar(urls, titulos):
+            lotes.append(list(urls))
+            return [u for u in urls if u != 'https://a.com/2']  # "ya existe en la BD"
+
+        pipeline = PipelineStreaming(list(paginas), lambda u: (paginas[u], {}), filtrar, lote_dedup=2)
+        resultados = dict(pipeline.ejecutar(self._motor(pipeline)))
+        self.assertEqual(set(resultados), {'https://a.com/1', 'https://a.com/3', 'https://a.com/4'})
+        self.assertTrue(all(len(lote) <= 2 for lote in lotes))
+        self.assertEqual(pipeline.urls_recolectadas, 4)  # la /3 repetida no se deduplica dos veces
+
+    def test_contrapresion_frena_fase1(self):
+        paginas = _paginas(8)
+        recolectadas = []
+        lock = threading.Lock()
+
+        def recolectar(url):
+            with lock:
+                recolectadas.append(url)
+            return paginas[url], {}
+
+        pipeline = PipelineStreaming(list(paginas), recolectar, lambda urls, titulos: urls,
+                                     max_en_vuelo=2, paginas_en_cola=1)
+        resultados = pipeline.ejecutar(self._motor(pipeline, demora_detalle=0.05))
+        next(resultados)
+        time.sleep(0.1)
+        # Con la ventana llena, FASE 1 no avanza más allá de la página retenida + una en cola
+        self.assertLessEqual(len(recolectadas), 2)
+        resultados.close()
+
+    def test_sin_paginas(self):
+        pipeline = PipelineStreaming([], lambda u: (set(), {}), lambda urls, titulos: urls)
+        self.assertEqual(list(pipeline.ejecutar(self._motor(pipeline))), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from core.scraper.predicados import (
+    Predicado, aplicar_a_filtros, compilar_frase, compilar_keywords, cubierto_por_filtros, parsear_numero,
+    pendientes_tras_filtros
+)
+
+
+class TestPredicados(unittest.TestCase):
+    def test_parsear_numero(self):
+        self.assertEqual(parsear_numero('$ 5.000'), 5000)
+        self.assertEqual(parsear_numero('1,5'), 1.5)
+        self.assertEqual(parsear_numero('150 mil'), 150000)
+        self.assertIsNone(parsear_numero('m2'))
+        self.assertIsNone(parsear_numero(None))
+
+    def test_compilar_frase(self):
+        casos = {
+            'gastos comunes menores a 5.000 pesos': Predicado('gastos_comunes', 'gastos_comunes_valor', 'lte', 5000),
+            'garage para 2 autos': Predicado('cocheras', 'cocheras_max', 'gte', 2),
+            'más de 80 m2': Predicado('superficie', 'superficie_total_max', 'gte', 80),
+            'hasta U$S 150.000': Predicado('precio', 'precio_valor', 'lte', 150000, 'USD'),
+            'menos de 10 años de antigüedad': Predicado('antiguedad', 'antiguedad', 'lte', 10),
+        }
+        for frase, esperado in casos.items():
+            with self.subTest(frase=frase):
+                self.assertEqual(compilar_frase(frase), esperado)
+        for frase in ['Pocitos Nuevo', 'terraza lavadero', 'a menos de 3 cuadras de la rambla',
+                      'a menos de 100 metros del mar', '2 dormitorios y 2 baños',
+                      'a 5 minutos en auto del centro', 'reciclado hace 5 años', 'capacidad para 3 vehículos']:
+            with self.subTest(frase=frase):
+                self.assertIsNone(compilar_frase(frase))
+
+    def test_compilar_keywords_separa_texto(self):
+        predicados, restantes = compilar_keywords(['Pocitos Nuevo', 'garage para 2 autos', 'cochera para 2 autos'])
+        self.assertEqual(predicados, [Predicado('cocheras', 'cocheras_max', 'gte', 2)])
+        self.assertEqual(restantes, ['Pocitos Nuevo'])
+
+    def test_cumple(self):
+        gastos = compilar_frase('gastos comunes hasta 5000')
+        self.assertTrue(gastos.cumple({'gastos_comunes_valor': 4500}))
+        self.assertFalse(gastos.cumple({'gastos_comunes_valor': 6000}))
+        self.assertFalse(gastos.cumple({}))
+        precio = compilar_frase('hasta usd 100.000')
+        self.assertTrue(precio.cumple({'precio_valor': 90000, 'precio_moneda': 'US$'}))
+        self.assertFalse(precio.cumple({'precio_valor': 90000, 'precio_moneda': '$'}))
+
+    def test_aplicar_a_filtros(self):
+        predicados, _ = compilar_keywords(['garage para 2 autos', 'gastos comunes menores a 5.000', 'hasta usd 100.000'])
+        filtros = aplicar_a_filtros(predicados, {'tipo': 'apartamento', 'precio_max': 90000}, 'mercadolibre')
+        self.assertEqual(filtros, {'tipo': 'apartamento', 'precio_max': 90000, 'cocheras_min': 2, 'moneda': 'USD'})
+        # Gastos comunes no tienen filtro en la URL; el precio lo cubre el filtro más estricto del usuario
+        self.assertEqual(pendientes_tras_filtros(predicados, filtros, 'mercadolibre'), [predicados[1]])
+        self.assertTrue(cubierto_por_filtros(predicados[0], filtros, 'mercadolibre'))
+
+    def test_cobertura_por_plataforma(self):
+        hasta_2, _ = compilar_keywords(['hasta 2 dormitorios'])
+        # MercadoLibre sólo filtra un máximo de dormitorios junto con un mínimo
+        filtros = aplicar_a_filtros(hasta_2, {}, 'mercadolibre')
+        self.assertEqual(filtros, {})
+        self.assertEqual(pendientes_tras_filtros(hasta_2, filtros, 'mercadolibre'), hasta_2)
+        filtros = aplicar_a_filtros(hasta_2, {'dormitorios_min': 1}, 'mercadolibre')
+        self.assertEqual(pendientes_tras_filtros(hasta_2, filtros, 'mercadolibre'), [])
+        # InfoCasas no filtra antigüedad ni cantidad de cocheras
+        predicados, _ = compilar_keywords(['antigüedad menor a 10 años', '3 cocheras', 'mas de 80 m2'])
+        filtros = aplicar_a_filtros(predicados, {}, 'infocasas')
+        self.assertEqual(filtros, {'superficie_total_min': 80})
+        self.assertEqual(pendientes_tras_filtros(predicados, filtros, 'infocasas'), predicados[:2])
+        # Un filtro del usuario más laxo que el predicado no lo cubre
+        precio, _ = compilar_keywords(['hasta usd 100.000'])
+        self.assertFalse(cubierto_por_filtros(precio[0], {'precio_max': 150000}, 'mercadolibre'))
+
+
+if __name__ == '__main__':
+    unittest.main()
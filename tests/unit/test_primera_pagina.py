@@ -0,0 +1,52 @@
+import os
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from core.scraper.infocasas import primera_pagina_infocasas
+from core.scraper.mercadolibre import primera_pagina_mercadolibre
+
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+
+LISTADO_IC = '''
+<div class="search-result-display">Mostrando 1 - 21 de 54 resultados</div>
+<div class="lc-dataWrapper"><a class="lc-data" href="/venta/casa/123"><h2 class="lc-title">Casa con jardín</h2></a></div>
+<div class="lc-dataWrapper"><a class="lc-data" href="https://www.infocasas.com.uy/venta/apto/456"><h2 class="lc-title">Apto al frente</h2></a></div>
+'''
+
+
+class TestPrimeraPagina(unittest.TestCase):
+    def test_mercadolibre_un_solo_get_para_total_y_urls(self):
+        with open(os.path.join(AQUI, 'fixtures', 'estado', 'ml_listado.html'), encoding='utf-8') as f:
+            respuesta = Mock(status_code=200, text=f.read())
+        with patch('core.scraper.fetcher.fetch', return_value=respuesta) as fetch, \
+                patch('core.scraper.mercadolibre.iniciar_driver', side_effect=AssertionError('no debe usar Chrome')):
+            total, urls, titulos = primera_pagina_mercadolibre('https://listado.mercadolibre.com.uy/inmuebles/x_NoIndex_True')
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(fetch.call_args[0][0], 'https://listado.mercadolibre.com.uy/inmuebles/x_NoIndex_True')
+        self.assertEqual(total, 1234)
+        self.assertEqual(len(urls), 2)
+        self.assertEqual(set(titulos), urls)
+
+    def test_infocasas_un_solo_get_para_total_y_urls(self):
+        respuesta = Mock(status_code=200, text=LISTADO_IC)
+        with patch('core.scraper.fetcher.fetch', return_value=respuesta) as fetch:
+            total, urls, titulos = primera_pagina_infocasas('https://www.infocasas.com.uy/venta/montevideo')
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(total, 54)
+        self.assertEqual(urls, {'https://www.infocasas.com.uy/venta/casa/123', 'https://www.infocasas.com.uy/venta/apto/456'})
+        self.assertEqual(titulos['https://www.infocasas.com.uy/venta/casa/123'], 'Casa con jardín')
+
+    def test_sin_conexion_no_levanta_chrome(self):
+        with patch('core.scraper.fetcher.fetch', side_effect=requests.RequestException('sin red')) as fetch, \
+                patch('core.scraper.mercadolibre.iniciar_driver', side_effect=AssertionError('no debe usar Chrome')), \
+                patch('core.scraper.infocasas.iniciar_driver', side_effect=AssertionError('no debe usar Chrome')):
+            self.assertEqual(primera_pagina_mercadolibre('https://listado.mercadolibre.com.uy/x'), (None, set(), {}))
+            self.assertEqual(primera_pagina_infocasas('https://www.infocasas.com.uy/x'), (None, set(), {}))
+        self.assertEqual(fetch.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
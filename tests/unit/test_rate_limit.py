@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+
+from core.scraper import rate_limit
+from core.scraper.constants import RATE_LIMIT_RPS, RATE_LIMIT_RPS_MIN, RATE_LIMIT_RAFAGA
+
+
+HOST = 'www.infocasas.com.uy'
+
+
+class TestRateLimit(unittest.TestCase):
+    def setUp(self):
+        rate_limit.reiniciar()
+
+    def test_rafaga_sin_espera_y_luego_espaciado(self):
+        with patch('core.scraper.rate_limit.time.sleep') as mock_sleep:
+            for _ in range(int(RATE_LIMIT_RAFAGA)):
+                rate_limit.esperar_turno(HOST)
+            mock_sleep.assert_not_called()
+            espera = rate_limit.esperar_turno(HOST)
+        self.assertGreater(espera, 0)
+        self.assertLessEqual(espera, 1.0 / RATE_LIMIT_RPS + 0.01)
+
+    def test_bloqueo_baja_la_tasa_y_se_recupera_gradualmente(self):
+        self.assertTrue(rate_limit.registrar_respuesta(HOST, 429))
+        rps_bloqueado = rate_limit.estado()[HOST]['rps']
+        self.assertLess(rps_bloqueado, RATE_LIMIT_RPS)
+        self.assertGreaterEqual(rps_bloqueado, RATE_LIMIT_RPS_MIN)
+
+        self.assertFalse(rate_limit.registrar_respuesta(HOST, 200, b'<title>Casa en Pocitos</title>'))
+        rps_recuperando = rate_limit.estado()[HOST]['rps']
+        self.assertGreater(rps_recuperando, rps_bloqueado)
+        self.assertLess(rps_recuperando, RATE_LIMIT_RPS)
+        self.assertEqual(rate_limit.estado()[HOST]['bloqueos'], 1)
+
+    def test_retry_after_pausa_el_host(self):
+        rate_limit.registrar_respuesta(HOST, 429, retry_after='30')
+        with patch('core.scraper.rate_limit.time.sleep'):
+            espera = rate_limit.esperar_turno(HOST)
+        self.assertGreater(espera, 29)
+
+    def test_captcha_solo_en_titulo(self):
+        self.assertTrue(rate_limit.es_bloqueo(200, b'<html><title>Verificaci\xc3\xb3n de seguridad - Captcha</title>'))
+        self.assertFalse(rate_limit.es_bloqueo(200, b'<meta name="robots" content="index"><title>Apartamento</title>'))
+        self.assertTrue(rate_limit.es_bloqueo(403, b''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from core.scraper import fetcher, metricas, rate_limit, transporte
+
+
+def _respuesta(status=200, contenido=b'', headers=None):
+    r = Mock()
+    r.status_code = status
+    r.content = contenido
+    r.headers = headers or {}
+    return r
+
+
+class TestTransporte(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.corpus = os.path.join(self.tmp.name, 'v1')
+        fetcher.reset_stats()
+        rate_limit.reiniciar()
+
+    def tearDown(self):
+        transporte.reiniciar()
+        self.tmp.cleanup()
+
+    def test_grabar_y_reproducir_sin_red(self):
+        transporte.configurar(modo='record', corpus=self.corpus, version='prueba')
+        html = '<html><title>Casa</title>ñandú</html>'.encode('utf-8')
+        with patch('requests.Session.get', return_value=_respuesta(
+                contenido=html, headers={'Content-Type': 'text/html; charset=utf-8'})):
+            fetcher.fetch('https://www.infocasas.com.uy/casa-1', cache='detalle')
+        self.assertEqual(transporte.info_corpus(self.corpus)['respuestas'], 1)
+        self.assertEqual(transporte.info_corpus(self.corpus)['version'], 'prueba')
+
+        transporte.configurar(modo='replay', latencia_ms=0)
+        with patch('requests.Session.get', side_effect=AssertionError('no debe tocar la red')):
+            r = fetcher.fetch('https://www.infocasas.com.uy/casa-1', cache='detalle')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.content, html)
+        self.assertIn('ñandú', r.text)
+
+    def test_replay_url_no_grabada_es_error_de_red(self):
+        transporte.configurar(modo='record', corpus=self.corpus)
+        transporte.configurar(modo='replay')
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            fetcher.fetch('https://www.infocasas.com.uy/no-existe')
+        self.assertEqual(fetcher.get_stats()['www.infocasas.com.uy']['errores'], 1)
+
+    def test_replay_sin_corpus_falla_al_configurar(self):
+        with self.assertRaises(FileNotFoundError):
+            transporte.configurar(modo='replay', corpus=os.path.join(self.tmp.name, 'nada'))
+
+    def test_latencia_inyectada(self):
+        transporte.configurar(modo='record', corpus=self.corpus)
+        with patch('requests.Session.get', return_value=_respuesta(contenido=b'x')):
+            fetcher.fetch('https://a.com/1')
+        transporte.configurar(modo='replay', latencia_ms=250)
+        with patch('core.scraper.transporte.time.sleep') as mock_sleep:
+            fetcher.fetch('https://a.com/1')
+        mock_sleep.assert_called_once_with(0.25)
+
+
+class TestMetricas(unittest.TestCase):
+    def setUp(self):
+        metricas.reiniciar()
+
+    def test_cronometro_y_fases_anidadas(self):
+        cronometro = metricas.Cronometro()
+        cronometro.marcar('fase1')
+        with metricas.fase('db'):
+            pass
+        with metricas.fase('db'):
+            pass
+        cronometro.marcar('fase2')
+        datos = metricas.obtener()
+        self.assertEqual(set(datos), {'fase1', 'fase2', 'db'})
+        self.assertEqual(datos['db']['veces'], 2)
+        self.assertGreaterEqual(datos['fase2']['segundos'], datos['db']['segundos'])
+
+
+if __name__ == '__main__':
+    unittest.main()
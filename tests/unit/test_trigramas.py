@@ -0,0 +1,46 @@
+import unittest
+
+from core.scraper.matcher import MatcherKeywords
+from core.scraper.trigramas import IndiceTrigramas, similitud, trigramas, variante_similar_en
+
+
+class TestTrigramas(unittest.TestCase):
+    def test_trigramas_con_relleno_pg_trgm(self):
+        self.assertEqual(trigramas('casa'), {'  c', ' ca', 'cas', 'asa', 'sa '})
+        self.assertEqual(trigramas(''), frozenset())
+
+    def test_similitud(self):
+        self.assertEqual(similitud('garaje', 'garaje'), 1.0)
+        self.assertGreaterEqual(similitud('dormitorio', 'dormitorios'), 0.7)
+        self.assertGreaterEqual(similitud('luminoso', 'luminosa'), 0.6)
+        self.assertAlmostEqual(similitud('garaje', 'garage'), 0.4)
+        self.assertLess(similitud('piscina', 'pileta'), 0.4)
+
+    def test_variante_de_varias_palabras(self):
+        tokens = set('amplia terraza con vistas al mar'.split())
+        self.assertTrue(variante_similar_en('vista al mar', tokens, 0.4))
+        self.assertFalse(variante_similar_en('vista al lago', tokens, 0.4))
+
+    def test_matcher_difuso(self):
+        matcher = MatcherKeywords([['garaje'], ['dormitorio']], truncar=False, difuso=0.4)
+        self.assertTrue(matcher.coincide('casa con garage y 3 dormitorios'))
+        self.assertFalse(matcher.coincide('casa con cochera y 3 dormitorios'))
+        # Umbral por grupo: más estricto en el primero
+        estricto = MatcherKeywords([['garaje'], ['dormitorio']], truncar=False, difuso=[0.8, 0.4])
+        self.assertFalse(estricto.coincide('casa con garage y 3 dormitorios'))
+        self.assertTrue(estricto.coincide('casa con garaje y 3 dormitorio'))
+
+    def test_indice_trigramas(self):
+        indice = IndiceTrigramas(['garage', 'garajes', 'cochera', 'dormitorios'])
+        self.assertEqual(set(indice.similares('garaje', 0.4)), {'garage', 'garajes'})
+        indice.quitar('garage')
+        self.assertEqual(indice.similares('garaje', 0.4), ['garajes'])
+        indice.agregar('garage')
+        self.assertEqual(
+            set(indice.similares('garaje', 0.4)),
+            {p for p in ['garage', 'garajes', 'cochera', 'dormitorios'] if similitud('garaje', p) >= 0.4},
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()